@@ -0,0 +1,267 @@
+import argparse
+import datetime
+import itertools
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import grpc
+import numpy as np
+here = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(here, '..', 'sample'))
+
+import vectordb_pb2
+import vectordb_pb2_grpc
+from vectordb_client import write_request, pack_vector, search_request, stream_write, sparse_vector, hybrid_search_request
+from workload import vectors, keys
+
+# Methods taking one vector per call; the rest are swept over batch sizes too
+SINGLE_METHODS = ("Write", "Read", "Update", "Delete", "Search", "HybridSearch")
+BATCH_METHODS = ("BatchWrite", "StreamWrite", "BatchRead", "BatchSearch", "Scan")
+METHODS = SINGLE_METHODS + BATCH_METHODS
+
+# Methods that modify data run against their own copy of the preloaded table,
+# so overwrites and deletes do not change what the read and search cases see
+MUTATING_METHODS = ("Write", "Update", "Delete", "BatchWrite", "StreamWrite")
+
+# Largest-magnitude coordinates kept in the sparse copy of each preloaded
+# vector that HybridSearch cases query alongside the dense one
+SPARSE_NNZ = 16
+
+# Requests larger than gRPC's default 4 MB message limit are skipped
+MAX_MESSAGE_BYTES = 4 * 1024 * 1024
+
+class Case:
+    """Requests for one (method, dim, batch_size) point, built before timing starts."""
+
+    def __init__(self, stub, method, dim, batch_size, keyspace, table, pool, key_pool, top_k, sparse_pool=None):
+        self.stub = stub
+        self.method = method
+        self.dim = dim
+        self.batch_size = batch_size
+        self.keyspace = keyspace
+        self.table = table
+        self.pool = pool
+        self.key_pool = key_pool
+        self.top_k = top_k
+        self.sparse_pool = sparse_pool
+        self.counter = itertools.count()
+        self.lock = threading.Lock()
+
+    def payload_bytes(self):
+        """Approximate request size, used to skip cases over the message limit."""
+        if self.method in ("BatchWrite", "BatchSearch"):
+            return self.batch_size * (4 * self.dim + 32)
+        return 0
+
+    def _next(self):
+        with self.lock:
+            return next(self.counter)
+
+    def _vectors(self, i, count):
+        start = (i * count) % len(self.pool)
+        return [self.pool[(start + j) % len(self.pool)] for j in range(count)]
+
+    def _keys(self, i, count):
+        start = (i * count) % len(self.key_pool)
+        return [self.key_pool[(start + j) % len(self.key_pool)] for j in range(count)]
+
+    def call(self):
+        """Issue one request; returns the number of vectors it carried."""
+        i = self._next()
+        where = dict(keyspace=self.keyspace, table=self.table)
+        if self.method == "Write":
+            self.stub.Write(write_request(self._keys(i, 1)[0], self._vectors(i, 1)[0], **where))
+        elif self.method == "Read":
+            self.stub.Read(vectordb_pb2.VectorReadRequest(key=self._keys(i, 1)[0], packed=True, **where))
+        elif self.method == "Update":
+            vector_f32, dim = pack_vector(self._vectors(i, 1)[0])
+            self.stub.Update(vectordb_pb2.VectorUpdateRequest(key=self._keys(i, 1)[0], vector_f32=vector_f32,
+                                                              dim=dim, **where))
+        elif self.method == "Delete":
+            self.stub.Delete(vectordb_pb2.VectorDeleteRequest(key=self._keys(i, 1)[0], **where))
+        elif self.method == "Search":
+            self.stub.Search(search_request(self._vectors(i, 1)[0], top_k=self.top_k, **where))
+        elif self.method == "HybridSearch":
+            start = i % len(self.pool)
+            self.stub.HybridSearch(hybrid_search_request(self.pool[start], self.sparse_pool[start], top_k=self.top_k,
+                                                         **where))
+        elif self.method == "BatchWrite":
+            self.stub.BatchWrite(vectordb_pb2.VectorBatchWriteRequest(
+                vectors=[write_request(key, vector) for key, vector in
+                         zip(self._keys(i, self.batch_size), self._vectors(i, self.batch_size))], **where))
+        elif self.method == "StreamWrite":
+            stream_write(self.stub, zip(self._keys(i, self.batch_size), self._vectors(i, self.batch_size)), **where)
+        elif self.method == "BatchRead":
+            self.stub.BatchRead(vectordb_pb2.VectorBatchReadRequest(keys=self._keys(i, self.batch_size),
+                                                                    packed=True, **where))
+        elif self.method == "BatchSearch":
+            queries = np.asarray(self._vectors(i, self.batch_size), dtype='<f4')
+            self.stub.BatchSearch(vectordb_pb2.VectorBatchSearchRequest(
+                queries_f32=queries.tobytes(), dim=self.dim, top_k=self.top_k, **where))
+        elif self.method == "Scan":
+            # Scans the first batch_size rows of the preloaded table, in chunks
+            # sized to about batch_size vectors rather than the server default
+            count = 0
+            chunks = self.stub.Scan(vectordb_pb2.VectorScanRequest(dim=self.dim, max_bytes=4 * self.dim * self.batch_size,
+                                                                   **where))
+            for chunk in chunks:
+                count += len(chunk.keys)
+                if count >= self.batch_size:
+                    chunks.cancel()
+                    break
+            return count
+        return self.batch_size if self.method in BATCH_METHODS else 1
+
+def run_case(case, concurrency, min_time):
+    """Call the case from `concurrency` threads for at least `min_time` seconds.
+
+    Returns None when no call completed.
+    """
+    latencies = []
+    carried = []
+    deadline = time.perf_counter() + min_time
+
+    def worker():
+        local_latencies, local_carried = [], 0
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            local_carried += case.call()
+            local_latencies.append(time.perf_counter() - started)
+        latencies.extend(local_latencies)
+        carried.append(local_carried)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as executor:
+        for future in [executor.submit(worker) for _ in range(concurrency)]:
+            future.result()
+    elapsed = time.perf_counter() - started
+    if not latencies:
+        return None
+    latencies = np.array(latencies) * 1000
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    return {
+        "method": case.method,
+        "dim": case.dim,
+        "batch_size": case.batch_size,
+        "concurrency": concurrency,
+        "calls": len(latencies),
+        "vectors": int(sum(carried)),
+        "seconds": elapsed,
+        "calls_per_s": len(latencies) / elapsed,
+        "vectors_per_s": sum(carried) / elapsed,
+        "p50_ms": p50,
+        "p95_ms": p95,
+        "p99_ms": p99,
+    }
+
+def preload(stub, keyspace, table, key_pool, pool):
+    """Write every key of the pool to `table`, restoring any the previous case deleted or overwrote."""
+    dim = pool.shape[1]
+    stream_write(stub, zip(key_pool, pool), keyspace=keyspace, table=table,
+                 chunk_size=max(1, MAX_MESSAGE_BYTES // (8 * dim + 64)))
+
+def sparse_of(vector):
+    """Keep the SPARSE_NNZ largest-magnitude coordinates of a dense vector as a SparseVector."""
+    indices = np.sort(np.argsort(-np.abs(vector))[:SPARSE_NNZ])
+    return sparse_vector(indices, vector[indices], dim=len(vector))
+
+def start_local_server():
+    """Start the reference server in-process on a free port; returns (server, target)."""
+    sys.path.append(os.path.join(here, '..', 'server'))
+    from vectordb_server import serve
+    with socket.socket() as probe:
+        probe.bind(('localhost', 0))
+        port = probe.getsockname()[1]
+    return serve(port=port), f'localhost:{port}'
+
+def parse_ints(text):
+    return [int(value) for value in text.split(",")]
+
+def case_key(result):
+    return (result["method"], result["dim"], result["batch_size"], result["concurrency"])
+
+def compare(results, baseline_path):
+    """Print vectors/s of each case relative to a previous run."""
+    with open(baseline_path) as file:
+        baseline = {case_key(result): result for result in json.load(file)["results"]}
+    print(f"\nCompared with {baseline_path} (vectors/s, new / old):")
+    for result in results:
+        old = baseline.get(case_key(result))
+        if old and old["vectors_per_s"]:
+            ratio = result["vectors_per_s"] / old["vectors_per_s"]
+            print(f"  {result['method']:<12} dim={result['dim']:<5} batch={result['batch_size']:<6} "
+                  f"conc={result['concurrency']:<4} {ratio:6.2f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmark every VectorDB RPC over dimension, batch size and concurrency.")
+    parser.add_argument('--target', default='localhost:50051', help="Server address (default: localhost:50051)")
+    parser.add_argument('--local', action='store_true', help="Benchmark an in-process reference server instead")
+    parser.add_argument('--methods', default=",".join(METHODS), help="Comma-separated RPCs (default: all)")
+    parser.add_argument('--dims', default="3,128,384,1536", help="Vector dimensions to sweep")
+    parser.add_argument('--batch-sizes', default="1,100,1000,10000", help="Batch sizes for batch RPCs and Scan")
+    parser.add_argument('--concurrency', default="1,8", help="Concurrent callers to sweep")
+    parser.add_argument('--min-time', type=float, default=1.0, help="Seconds per case (default: 1)")
+    parser.add_argument('--preload', type=int, default=10000, help="Vectors written per dimension before timing")
+    parser.add_argument('--top-k', type=int, default=10)
+    parser.add_argument('--keyspace', default="redwing_keyspace")
+    parser.add_argument('--output', default="benchmark_results.json", help="JSON results file")
+    parser.add_argument('--baseline', help="Earlier results file to compare against")
+    args = parser.parse_args()
+    if args.preload < 1:
+        parser.error("--preload must be at least 1: keyed cases cycle through the preloaded keys")
+
+    server, target = start_local_server() if args.local else (None, args.target)
+    stub = vectordb_pb2_grpc.VectorDBStub(grpc.insecure_channel(target, options=[
+        ('grpc.max_receive_message_length', 64 * 1024 * 1024)]))
+
+    methods = args.methods.split(",")
+    results = []
+    rng = np.random.default_rng(0)
+    for dim in parse_ints(args.dims):
+        pool = vectors(args.preload, dim, "clustered", rng=rng)
+        key_pool = keys(args.preload, "bench_")
+        preload(stub, args.keyspace, f"bench_{dim}", key_pool, pool)
+        sparse_pool = None
+        if "HybridSearch" in methods:
+            # Give every preloaded key a sparse vector too, so both sides of the fusion have candidates
+            sparse_pool = [sparse_of(vector) for vector in pool]
+            stream_write(stub, zip(key_pool, sparse_pool), keyspace=args.keyspace, table=f"bench_{dim}")
+        for method in methods:
+            table = f"bench_{dim}_mutations" if method in MUTATING_METHODS else f"bench_{dim}"
+            batch_sizes = parse_ints(args.batch_sizes) if method in BATCH_METHODS else [1]
+            for batch_size, concurrency in itertools.product(batch_sizes, parse_ints(args.concurrency)):
+                case = Case(stub, method, dim, batch_size, args.keyspace, table, pool, key_pool, args.top_k, sparse_pool)
+                if case.payload_bytes() > MAX_MESSAGE_BYTES:
+                    print(f"{method:<12} dim={dim:<5} batch={batch_size:<6} skipped: request over 4 MB")
+                    continue
+                if method in MUTATING_METHODS:
+                    # Restore every key, so deletes and updates of one case do not hit keys an earlier case deleted
+                    preload(stub, args.keyspace, table, key_pool, pool)
+                result = run_case(case, concurrency, args.min_time)
+                if result is None:
+                    print(f"{method:<12} dim={dim:<5} batch={batch_size:<6} conc={concurrency:<4} no calls completed")
+                    continue
+                results.append(result)
+                print(f"{method:<12} dim={dim:<5} batch={batch_size:<6} conc={concurrency:<4} "
+                      f"{result['calls_per_s']:9.0f} calls/s {result['vectors_per_s']:10.0f} vectors/s  "
+                      f"p50 {result['p50_ms']:7.2f} ms  p99 {result['p99_ms']:7.2f} ms")
+
+    with open(args.output, 'w') as file:
+        json.dump({
+            "target": "local reference server" if args.local else target,
+            "started_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "config": vars(args),
+            "results": results,
+        }, file, indent=2)
+    print(f"Wrote {len(results)} results to {args.output}")
+    if args.baseline:
+        compare(results, args.baseline)
+    if server is not None:
+        server.stop(0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import grpc
+import numpy as np
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'sample'))
+
+from vectordb_aio import AsyncVectorDBClient
+from workload import vectors, keys, DISTRIBUTIONS
+
+OPERATIONS = ("write", "batch_write", "read", "search")
+
+# Distinct vectors generated up front and cycled through by the requests
+POOL_SIZE = 10000
+
+def summarize(operation, latencies, elapsed, vectors_per_request):
+    """Throughput and latency percentiles (ms) for one run; NaN latencies are errors."""
+    ok = latencies[~np.isnan(latencies)] * 1000
+    percentiles = np.percentile(ok, [50, 95, 99]) if len(ok) else [float('nan')] * 3
+    return {
+        "operation": operation,
+        "requests": len(latencies),
+        "errors": int(np.isnan(latencies).sum()),
+        "elapsed_s": elapsed,
+        "requests_per_s": len(ok) / elapsed,
+        "vectors_per_s": len(ok) * vectors_per_request / elapsed,
+        "p50_ms": percentiles[0],
+        "p95_ms": percentiles[1],
+        "p99_ms": percentiles[2],
+        "max_ms": float(ok.max()) if len(ok) else float('nan'),
+    }
+
+def request_factory(client, args, pool, key_space):
+    """Return a function issuing request i of the chosen operation."""
+    if args.operation == "write":
+        return lambda i: client.write(f"{args.key_prefix}{i}", pool[i % len(pool)])
+    if args.operation == "batch_write":
+        def batch_write(i):
+            start = i * args.batch_size
+            return client.batch_write(
+                (f"{args.key_prefix}{start + j}", pool[(start + j) % len(pool)]) for j in range(args.batch_size)
+            )
+        return batch_write
+    if args.operation == "read":
+        return lambda i: client.read(key_space[i % len(key_space)])
+    return lambda i: client.search(pool[i % len(pool)], top_k=args.top_k, metric=args.metric)
+
+async def drive(client, issue, requests, rate, concurrency):
+    """Issue `requests` calls and return (latencies, elapsed).
+
+    With a `rate` the calls are started on a fixed schedule (open loop) and
+    latency is measured from the scheduled start, so queueing behind slow
+    calls is counted. Without one, `concurrency` workers each send their
+    next call as soon as the previous one returns (closed loop).
+    """
+    loop = asyncio.get_running_loop()
+    latencies = np.full(requests, np.nan)
+
+    async def one(i, started):
+        try:
+            await issue(i)
+        except grpc.aio.AioRpcError:
+            return
+        latencies[i] = loop.time() - started
+
+    begin = loop.time()
+    if rate:
+        tasks = []
+        for i in range(requests):
+            scheduled = begin + i / rate
+            delay = scheduled - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.ensure_future(one(i, scheduled)))
+        await asyncio.gather(*tasks)
+    else:
+        pending = iter(range(requests))
+
+        async def worker():
+            for i in pending:
+                await one(i, loop.time())
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, loop.time() - begin
+
+async def load_test(args):
+    rng = np.random.default_rng(args.seed)
+    pool = vectors(POOL_SIZE, args.dim, args.distribution, rng=rng)
+    async with AsyncVectorDBClient(args.target, args.keyspace, args.table, max_in_flight=args.concurrency,
+                                   timeout=args.timeout) as client:
+        key_space = []
+        if args.operation in ("read", "search") and args.preload:
+            key_space = keys(args.preload, args.key_prefix)
+            preload = vectors(args.preload, args.dim, args.distribution, rng=rng)
+            started = time.perf_counter()
+            await client.batch_write_many(zip(key_space, preload), batch_size=1000)
+            print(f"Preloaded {args.preload} vectors in {time.perf_counter() - started:.1f}s")
+        issue = request_factory(client, args, pool, key_space)
+        latencies, elapsed = await drive(client, issue, args.requests, args.rate, args.concurrency)
+    vectors_per_request = args.batch_size if args.operation == "batch_write" else 1
+    return summarize(args.operation, latencies, elapsed, vectors_per_request)
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive one VectorDB operation at a target rate or concurrency.")
+    parser.add_argument('operation', choices=OPERATIONS)
+    parser.add_argument('--target', default='localhost:50051', help="Server address (default: localhost:50051)")
+    parser.add_argument('--keyspace', default="redwing_keyspace")
+    parser.add_argument('--table', default="load_test")
+    parser.add_argument('--requests', type=int, default=10000, help="Number of requests to send (default: 10000)")
+    parser.add_argument('--rate', type=float, default=0, help="Target requests per second; 0 runs closed-loop")
+    parser.add_argument('--concurrency', type=int, default=64, help="Maximum requests in flight (default: 64)")
+    parser.add_argument('--dim', type=int, default=384, help="Vector dimension (default: 384)")
+    parser.add_argument('--distribution', choices=DISTRIBUTIONS, default="clustered")
+    parser.add_argument('--batch-size', type=int, default=100, help="Vectors per BatchWrite (default: 100)")
+    parser.add_argument('--top-k', type=int, default=10)
+    parser.add_argument('--metric', default="cosine")
+    parser.add_argument('--preload', type=int, default=10000, help="Vectors written before read/search runs")
+    parser.add_argument('--key-prefix', default="load_")
+    parser.add_argument('--timeout', type=float, default=30, help="Per-request deadline in seconds")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    results = asyncio.run(load_test(args))
+    results["config"] = vars(args)
+    print(f"{results['operation']}: {results['requests']} requests, {results['errors']} errors in {results['elapsed_s']:.2f}s")
+    print(f"  throughput: {results['requests_per_s']:.0f} req/s, {results['vectors_per_s']:.0f} vectors/s")
+    print(f"  latency ms: p50 {results['p50_ms']:.2f}  p95 {results['p95_ms']:.2f}  "
+          f"p99 {results['p99_ms']:.2f}  max {results['max_ms']:.2f}")
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump(results, file, indent=2)
+
+if __name__ == '__main__':
+    main()
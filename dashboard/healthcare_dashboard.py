@@ -3,10 +3,21 @@ import streamlit as st
 sys.path.append('../sample')  # Add the /sample directory to the Python path
 
 from healthcare_semantic_search import process_papers, search_similar_papers, setup_grpc_channel
+from embedding_service import shared_embedding_service
+from semantic_cache import SemanticResultCache
+
+@st.cache_resource
+def query_cache():
+    """One result cache shared by every session of this Streamlit server."""
+    return SemanticResultCache()
 
 def streamlit_app():
     st.title("Healthcare Research Paper Search")
 
+    # Load the embedding model once per server process, before the first search;
+    # concurrent users' queries are then batched into shared model calls
+    shared_embedding_service()
+
     # Setup gRPC channel
     stub = setup_grpc_channel()
 
@@ -16,7 +27,7 @@ def streamlit_app():
     # Button to trigger the search
     if st.button("Search"):
         with st.spinner("Searching for similar papers..."):
-            matches = search_similar_papers(user_query, stub)
+            matches = search_similar_papers(user_query, stub, cache=query_cache())
 
             st.header("Top matching papers for your query:")
             for paper_id, score in matches:
@@ -26,5 +37,9 @@ def streamlit_app():
                 with col2:
                     st.write(f"Score: {score}")
 
+    stats = query_cache().stats()
+    st.sidebar.header("Query cache")
+    st.sidebar.write(f"Hit ratio: {stats['hit_ratio']:.0%} ({stats['semantic_hits']} paraphrase hits, {stats['exact_hits']} exact hits, {stats['misses']} misses)")
+
 if __name__ == "__main__":
     streamlit_app()
@@ -1,8 +1,21 @@
 import sys
+import time
+import grpc
 import streamlit as st
 sys.path.append('../sample')  # Adjust the path as necessary
 
-from network_enhanced_threat_detection import main
+import vectordb_pb2_grpc
+from network_enhanced_threat_detection import generate_log_data
+from streaming_anomaly import StreamingThreatMonitor
+
+# Number of features in each log vector
+FEATURE_LENGTH = 8
+
+@st.cache_resource
+def threat_monitor():
+    """One long-lived detector per Streamlit server; its model and statistics persist across clicks."""
+    channel = grpc.insecure_channel('localhost:50051')
+    return StreamingThreatMonitor(vectordb_pb2_grpc.VectorDBStub(channel), FEATURE_LENGTH)
 
 def display_features(features, title):
     st.subheader(title)
@@ -29,9 +42,18 @@ def streamlit_app():
     
     if st.button("Analyze Log Data"):
         with st.spinner("Analyzing..."):
-            threat_details, normal_mean, anomalous_mean = main(num_entries)
+            # Write a new window of logs, then score only the entries not seen before
+            monitor = threat_monitor()
+            monitor.ingest(generate_log_data(num_entries))
+            seen, start = monitor.detector.count, time.perf_counter()
+            threat_details = monitor.poll()
+            elapsed = time.perf_counter() - start
+            normal_mean = monitor.detector.normal_mean
+            anomalous_mean = monitor.detector.anomalous_mean
 
             st.header("Anomaly Detection Results")
+            st.write(f"Scored {monitor.detector.count - seen} new entries in {elapsed * 1000:.0f} ms; "
+                     f"{monitor.detector.count} entries seen so far.")
             for detail in threat_details:
                 st.subheader(f"Threat Log Entry: {detail['log_id']}")
                 display_features(detail['features'], "Features of this log:")
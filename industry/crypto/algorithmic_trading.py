@@ -1,4 +1,5 @@
 import os
+import sys
 import grpc
 import pandas_gbq
 import vectordb_pb2
@@ -14,6 +15,11 @@ from dotenv import load_dotenv
 import requests
 import hmac
 import hashlib
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'sample'))
+
+from frame_loader import load_frame, frame_keys
+from ingest_pool import parallel_write, PARALLEL_MIN_ROWS
+from vectordb_client import write_request
 
 # Setup basic configuration for logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -27,6 +33,8 @@ COINBASE_PORTFOLIO_ID = os.getenv('COINBASE_PORTFOLIO_ID')
 # Coinbase API URLs
 COINBASE_API_URL = "https://api.coinbase.com/api/v3/brokerage"
 
+VECTORDB_TARGET = 'localhost:50051'
+
 def create_coinbase_signature(timestamp, method, request_path, body=''):
     """
     Creates a signature for a Coinbase API request.
@@ -94,7 +102,7 @@ def address_analysis(df):
     return address_activity
 def setup_grpc_channel():
     logging.info("Setting up gRPC channel.")
-    channel = grpc.insecure_channel('localhost:50051')
+    channel = grpc.insecure_channel(VECTORDB_TARGET)
     return vectordb_pb2_grpc.VectorDBStub(channel)
 
 def fetch_data_from_bigquery():
@@ -253,49 +261,35 @@ def preprocess_and_vectorize(df):
 
     return vectors
 
-def batch_write_data_to_vector_db(vectors, df, stub, batch_size=10): # sets default batch size to 100 as fallback
+def batch_write_data_to_vector_db(vectors, df, stub):
     logging.info("Writing data to the vector database in batches.")
     
     _keyspace = "redwing_keyspace"
     _table = "vectors"
 
-    total_vectors = len(vectors)
-    for start_idx in range(0, total_vectors, batch_size):
-        batch = vectordb_pb2.VectorBatchWriteRequest(keyspace=_keyspace, table=_table)
-        end_idx = min(start_idx + batch_size, total_vectors)
-
-        for i in range(start_idx, end_idx):
-            unique_key = str(df.iloc[i]['nonce']) + '_' + str(df.iloc[i]['from_address'])
-            vector_list = vectors[i].tolist() if isinstance(vectors[i], numpy.ndarray) else list(vectors[i])
-
-            vector_req = vectordb_pb2.VectorWriteRequest(
-                key=unique_key,
-                vector=vector_list
-            )
-            batch.vectors.append(vector_req)
-
-        response = stub.BatchWrite(batch)
-        if response.success:
-            logging.info(f"Batch {start_idx // batch_size + 1} written successfully.")
-        else:
-            logging.error(f"Failed to write batch {start_idx // batch_size + 1}: {response.error_message}")
-
-        # Optional: Print progress
-        print(f"Processed {end_idx} / {total_vectors} vectors")
+    if len(vectors) >= PARALLEL_MIN_ROWS:
+        # Serialize the requests in one process per core and send them over two channels
+        summary = parallel_write(frame_keys(df, "{nonce}_{from_address}"), vectors, VECTORDB_TARGET,
+                                 _keyspace, _table, channels=2)
+    else:
+        # Keys are built from the columns in one pass; batches are sized by serialized bytes
+        summary = load_frame(stub, df, "{nonce}_{from_address}", vectors=vectors, keyspace=_keyspace, table=_table)
+    logging.info(f"Wrote {summary['vectors']} / {len(vectors)} vectors in {summary['batches']} batches "
+                 f"({summary['vectors_per_s']:.0f} vectors/s).")
+    if summary['failed_keys']:
+        logging.error(f"Failed to write {len(summary['failed_keys'])} vectors after retries.")
 
 
 def write_data_to_vector_db(vectors, df, stub):
     logging.info("Writing data to the vector database individually.")
 
-    for i, vector in enumerate(vectors):
-        unique_key = str(df.iloc[i]['nonce']) + '_' + str(df.iloc[i]['from_address'])
-        # Convert vector to list if it's numpy array
-        vector_list = vector.tolist() if isinstance(vector, numpy.ndarray) else list(vector)
-        vector_req = vectordb_pb2.VectorWriteRequest(
+    unique_keys = frame_keys(df, "{nonce}_{from_address}")
+    for unique_key, vector in zip(unique_keys, vectors):
+        vector_req = write_request(
+            unique_key,
+            vector,  # Packed as float32 bytes
             keyspace="redwing_keyspace",
-            table="vectors",
-            key=unique_key,
-            vector=vector_list  # This should be a list of floats
+            table="vectors"
         )
 
         try:
@@ -318,7 +312,7 @@ def main():
         logging.info("Data fetched successfully.")
         
         vectors = preprocess_and_vectorize(df)
-        batch_write_data_to_vector_db(vectors, df, stub, 10)
+        batch_write_data_to_vector_db(vectors, df, stub)
         # Perform analyses
         anomalies = analyze_data(df)
         daily_volume = volume_analysis(df)
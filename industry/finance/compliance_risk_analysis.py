@@ -1,25 +1,38 @@
+import os
+import sys
 import grpc
-import vectordb_pb2
 import vectordb_pb2_grpc
 import pandas as pd
 from sklearn.ensemble import IsolationForest
-from sklearn.feature_extraction.text import TfidfVectorizer
 import csv
 import time
 import logging
+from feature_store import default_store
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'sample'))
+
+from batch_writer import batch_write
+from vectordb_client import sparse_rows
+from frame_loader import frame_keys
+from ingest_pool import parallel_write, PARALLEL_MIN_ROWS
 
 # Setup basic configuration for logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+VECTORDB_TARGET = 'localhost:50051'
+
+# TF-IDF matrices are computed once per complaints file and vectorizer settings,
+# then reused by every stage and memory-mapped from this directory on later runs;
+# default_store creates it on first use
+FEATURE_CACHE_DIR = 'feature_cache'
+
 def setup_grpc_channel():
     logging.info("Setting up gRPC channel.")
-    channel = grpc.insecure_channel('localhost:50051')
+    channel = grpc.insecure_channel(VECTORDB_TARGET)
     return vectordb_pb2_grpc.VectorDBStub(channel)
 
 def complaints_to_vectors(df):
     logging.info("Converting complaint narratives to vectors using TF-IDF.")
-    tfidf = TfidfVectorizer(max_features=100)  # Adjust max_features as needed
-    narrative_vectors = tfidf.fit_transform(df['Consumer complaint narrative'].dropna()).toarray()
+    narrative_vectors = default_store(FEATURE_CACHE_DIR).tfidf(df['Consumer complaint narrative'].dropna(), max_features=100)  # Adjust max_features as needed
     return narrative_vectors
 
 def write_complaints_to_database(df, stub):
@@ -30,23 +43,18 @@ def write_complaints_to_database(df, stub):
     
     _keyspace = "redwing_keyspace"
     _table = "vectors"
-    batch_size = 10  # Adjust batch size as needed
-
-    for i in range(0, len(df_clean), batch_size):
-        batch = vectordb_pb2.VectorBatchWriteRequest(keyspace=_keyspace, table=_table)
-        # Make sure the loop handles the final batch which may be smaller than batch_size
-        for j in range(i, min(i + batch_size, len(df_clean))):
-            vector_list = narrative_vectors[j - i].tolist()  # Adjust index to start from 0 for each batch
-            batch.vectors.append(
-                vectordb_pb2.VectorWriteRequest(
-                    keyspace=_keyspace,
-                    table=_table,                    
-                    key=f"complaint_{df_clean.iloc[j]['Complaint ID']}",
-                    vector=vector_list
-                )
-            )
-        response = stub.BatchWrite(batch)
-        logging.info(f"Batch {i//batch_size + 1} write status: {'Success' if response.success else 'Failure'}")
+
+    complaint_keys = frame_keys(df_clean, "complaint_{Complaint ID}")
+    if len(df_clean) >= PARALLEL_MIN_ROWS:
+        # Serialize the requests in one process per core and send them over two channels
+        summary = parallel_write(complaint_keys, narrative_vectors, VECTORDB_TARGET, _keyspace, _table, channels=2)
+    else:
+        # Batches are sized by serialized bytes and tuned from observed latency
+        summary = batch_write(stub, zip(complaint_keys, sparse_rows(narrative_vectors)), keyspace=_keyspace, table=_table)
+    logging.info(f"Wrote {summary['vectors']} / {len(df_clean)} complaints in {summary['batches']} batches "
+                 f"({summary['vectors_per_s']:.0f} vectors/s).")
+    if summary['failed_keys']:
+        logging.error(f"Failed to write {len(summary['failed_keys'])} complaints after retries.")
 
 def rank_companies_by_complaints(df):
     logging.info("Ranking companies based on the number and severity of complaints.")
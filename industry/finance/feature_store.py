@@ -0,0 +1,100 @@
+import hashlib
+import json
+import logging
+import os
+import numpy as np
+import scipy.sparse
+import sklearn
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+# Stores handed out by default_store, one per cache directory
+_default_stores = {}
+
+def default_store(cache_dir):
+    """The FeatureStore for `cache_dir` shared within the process, created on first use.
+
+    Nothing is written to disk until a script first asks for its store, so
+    importing a script that uses one creates no directory.
+    """
+    if cache_dir not in _default_stores:
+        _default_stores[cache_dir] = FeatureStore(cache_dir)
+    return _default_stores[cache_dir]
+
+class FeatureStore:
+    """Compute-once cache of feature matrices keyed by input content and parameters.
+
+    The key is a SHA-256 over the feature name, its parameters, the
+    scikit-learn version and every input text, so any change to the data or
+    the vectorizer settings yields a new entry. Matrices are kept in memory
+    for the life of the store. With a `cache_dir` they are also saved as
+    .npy files and memory-mapped on later runs, so an unchanged input is
+    never vectorized twice. Sparse matrices are kept in CSR form, saved as
+    one .npy file per component. Returned matrices are read-only.
+    """
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir
+        self.memory = {}
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key(name, texts, params):
+        digest = hashlib.sha256(json.dumps([name, params, sklearn.__version__], sort_keys=True).encode())
+        texts = [str(text) for text in texts]
+        # Lengths keep ["ab", "c"] and ["a", "bc"] apart
+        digest.update(np.array([len(text) for text in texts], dtype=np.int64).tobytes())
+        digest.update("".join(texts).encode('utf-8', 'surrogatepass'))
+        return f"{name}_{digest.hexdigest()[:32]}"
+
+    def _path(self, key, part=None):
+        return os.path.join(self.cache_dir, f"{key}.npy" if part is None else f"{key}.{part}.npy")
+
+    def _save(self, path, array):
+        # Write then rename, so an interrupted run never leaves a truncated file behind
+        temporary = path + ".tmp.npy"
+        np.save(temporary, array)
+        os.replace(temporary, path)
+
+    def _load(self, key):
+        """Memory-map a saved matrix, or return None when it is not in cache_dir."""
+        if os.path.exists(self._path(key)):
+            return np.load(self._path(key), mmap_mode='r')
+        # The shape is saved last, so its presence means every component is complete
+        if os.path.exists(self._path(key, "shape")):
+            data, indices, indptr = (np.load(self._path(key, part), mmap_mode='r')
+                                     for part in ("data", "indices", "indptr"))
+            return scipy.sparse.csr_matrix((data, indices, indptr), shape=tuple(np.load(self._path(key, "shape"))))
+        return None
+
+    def get(self, name, texts, params, compute):
+        """Return the cached matrix for (texts, params), calling compute(texts) on a miss."""
+        texts = list(texts)
+        key = self.key(name, texts, params)
+        if key in self.memory:
+            return self.memory[key]
+        matrix = self._load(key) if self.cache_dir else None
+        if matrix is not None:
+            logging.info(f"Loading cached {name} features for {key} from {self.cache_dir}.")
+        else:
+            matrix = compute(texts)
+            if scipy.sparse.issparse(matrix):
+                matrix = scipy.sparse.csr_matrix(matrix)
+                arrays = [matrix.data, matrix.indices, matrix.indptr]
+            else:
+                matrix = np.asarray(matrix)
+                arrays = [matrix]
+            if self.cache_dir and len(arrays) == 1:
+                self._save(self._path(key), matrix)
+            elif self.cache_dir:
+                for part, array in zip(("data", "indices", "indptr"), arrays):
+                    self._save(self._path(key, part), array)
+                self._save(self._path(key, "shape"), np.array(matrix.shape, dtype=np.int64))
+            for array in arrays:
+                array.setflags(write=False)
+        self.memory[key] = matrix
+        return matrix
+
+    def tfidf(self, texts, **params):
+        """Sparse (CSR) TF-IDF matrix of `texts`; `params` are passed to TfidfVectorizer."""
+        return self.get("tfidf_csr", texts, params, lambda texts: TfidfVectorizer(**params).fit_transform(texts))
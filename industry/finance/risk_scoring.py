@@ -0,0 +1,108 @@
+import bisect
+import multiprocessing
+import numpy as np
+import pandas as pd
+
+# (phrases, weight): the weight is added once when any phrase occurs in the lowercased narrative
+KEYWORD_RULES = [
+    (('discrimination',), 5),
+    (('privacy',), 4),
+    (('deceptive', 'unfair'), 3),
+    (('legal violation', 'ethical violation'), 5),
+    (('financial loss', 'credit damage'), 4),
+    (('frequent complaints',), 3),
+]
+
+# Adjustment for the company's response; responses not listed get DEFAULT_RESPONSE_WEIGHT
+RESPONSE_RULES = {
+    'Closed with explanation': -1,
+    'Closed with non-monetary relief': 0,
+}
+DEFAULT_RESPONSE_WEIGHT = 2
+
+# Narratives lowercased and joined for one scan
+SCORE_CHUNK_SIZE = 50000
+
+# Joins the narratives of a chunk; phrases may not contain it, so no match spans two rows
+SEPARATOR = '\x00'
+
+class RiskScorer:
+    """Scores complaint narratives against keyword rules a chunk at a time.
+
+    The narratives of a chunk are lowercased once and joined into one
+    string. Each distinct phrase of the rule table is then located with
+    str.find, which runs in C, and after a hit the search jumps to the start
+    of the next narrative. So the Python loop runs once per (narrative,
+    phrase) hit rather than once per narrative and phrase. Phrase hits are
+    mapped to rule hits and weighted with NumPy. This gives exactly the
+    scores of testing `phrase in text.lower()` for each phrase, as
+    calculate_risk_score does.
+
+    A single alternation regex was measured to be slower here than CPython's
+    substring search, because the re module has to try every alternative at
+    every position.
+    """
+
+    def __init__(self, keyword_rules=KEYWORD_RULES, response_rules=RESPONSE_RULES,
+                 default_response_weight=DEFAULT_RESPONSE_WEIGHT, chunk_size=SCORE_CHUNK_SIZE):
+        self.keyword_rules = [(tuple(phrases), weight) for phrases, weight in keyword_rules]
+        self.response_rules = dict(response_rules)
+        self.default_response_weight = default_response_weight
+        self.chunk_size = chunk_size
+        self.phrases = sorted({phrase for rule_phrases, _ in self.keyword_rules for phrase in rule_phrases})
+        if any(not phrase or SEPARATOR in phrase for phrase in self.phrases):
+            raise ValueError("keyword phrases must be non-empty and may not contain NUL")
+        self.weights = np.array([weight for _, weight in self.keyword_rules], dtype=np.int64)
+        # (phrases, rules) matrix: which rules each phrase triggers
+        self.phrase_rules = np.array([[phrase in rule_phrases for rule_phrases, _ in self.keyword_rules]
+                                      for phrase in self.phrases], dtype=np.int64).reshape(len(self.phrases), -1)
+
+    def _rule_hits(self, narratives):
+        """(rows, rules) boolean matrix of the keyword rules each narrative triggers."""
+        found = np.zeros((len(narratives), len(self.phrases)), dtype=np.int64)
+        # Non-string narratives (NaN) score no keywords
+        lowered = [text.lower() if isinstance(text, str) else '' for text in narratives]
+        starts = np.cumsum([0] + [len(text) + 1 for text in lowered]).tolist()
+        joined = SEPARATOR.join(lowered)
+        for column, phrase in enumerate(self.phrases):
+            position = joined.find(phrase)
+            while position >= 0:
+                row = bisect.bisect_right(starts, position) - 1
+                found[row, column] = 1
+                position = joined.find(phrase, starts[row + 1])
+        return (found @ self.phrase_rules) > 0
+
+    def keyword_scores(self, narratives):
+        """Keyword part of the score for each narrative."""
+        narratives = list(narratives)
+        scores = np.empty(len(narratives), dtype=np.int64)
+        for start in range(0, len(narratives), self.chunk_size):
+            chunk = narratives[start:start + self.chunk_size]
+            scores[start:start + len(chunk)] = self._rule_hits(chunk) @ self.weights
+        return scores
+
+    def response_scores(self, responses):
+        """Company-response adjustment for each complaint."""
+        mapped = pd.Series(responses, dtype=object).map(self.response_rules)
+        return mapped.fillna(self.default_response_weight).to_numpy(dtype=np.int64)
+
+    def score(self, narratives, responses, processes=None):
+        """Risk score of each (narrative, response) pair as an int64 array.
+
+        With `processes` the narrative chunks are matched in a pool of that
+        many worker processes.
+        """
+        narratives = list(narratives)
+        if processes and processes > 1 and len(narratives) > self.chunk_size:
+            chunks = [narratives[start:start + self.chunk_size] for start in range(0, len(narratives), self.chunk_size)]
+            with multiprocessing.get_context("spawn").Pool(processes) as pool:
+                keyword = np.concatenate(pool.map(self.keyword_scores, chunks))
+        else:
+            keyword = self.keyword_scores(narratives)
+        return keyword + self.response_scores(responses)
+
+def score_complaints(df, scorer=None, processes=None):
+    """Risk score of every row of a complaints DataFrame, aligned with its index."""
+    scorer = scorer or RiskScorer()
+    scores = scorer.score(df['Consumer complaint narrative'], df['Company response to consumer'], processes)
+    return pd.Series(scores, index=df.index)
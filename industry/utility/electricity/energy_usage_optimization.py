@@ -1,113 +1,87 @@
+import os
+import sys
 import grpc
-import vectordb_pb2
 import vectordb_pb2_grpc
 import pandas as pd
 import numpy as np
 from sklearn.ensemble import IsolationForest
-from sklearn.decomposition import PCA
 import csv
 import time
+from rate_projection import RateProjection, RATE_COLUMNS
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..', 'sample'))
+
+from frame_loader import load_frame
+from vectordb_client import batch_search
+
+# Fitted rate projection, reused by later runs on the same data
+PROJECTION_PATH = 'rate_projection.npz'
+
+# Columns copied from each anomalous row into the report
+REPORT_COLUMNS = ['zip', 'eiaid', 'utility_name', 'state', 'service_type', 'ownership'] + RATE_COLUMNS
+
+# (rate column, reason given when it exceeds 1.2x its average)
+RATE_REASONS = [
+    ('comm_rate', "commercial rate significantly higher than average"),
+    ('ind_rate', "industrial rate significantly higher than average"),
+    ('res_rate', "residential rate significantly higher than average"),
+]
 
 def setup_grpc_channel():
     """Setup gRPC channel and create a stub (client)."""
     channel = grpc.insecure_channel('localhost:50051')
     return vectordb_pb2_grpc.VectorDBStub(channel)
 
-def utility_data_to_vectors(df):
-    """Convert utility data into vectors using PCA."""
-    rate_data = df[['comm_rate', 'ind_rate', 'res_rate']]
-    n_samples, n_features = rate_data.shape
-    n_components = min(3, n_features, n_samples)
+def utility_data_to_vectors(df, projection):
+    """Convert utility data into vectors with the shared, already fitted PCA projection."""
+    return projection.transform(df)
 
-    if n_samples > 1:
-        pca = PCA(n_components=n_components)
-        rate_vectors = pca.fit_transform(rate_data.values)
-    else:
-        rate_vectors = rate_data.values
-
-    return rate_vectors
-
-def write_utility_data_to_database(df, stub):
+def write_utility_data_to_database(df, stub, projection):
     """Process utility data and write to the database in batches."""
-    rate_vectors = utility_data_to_vectors(df)
-    batch_size = 150
+    rate_vectors = utility_data_to_vectors(df, projection)
     _keyspace="redwing_keyspace"
     _table="vectors"
-    for i in range(0, len(df), batch_size):
-        batch = vectordb_pb2.VectorBatchWriteRequest()
-        for j in range(i, min(i + batch_size, len(df))):
-            vector_list = rate_vectors[j].tolist()
-            batch.vectors.append(
-                vectordb_pb2.VectorWriteRequest(
-                    keyspace=_keyspace,
-                    table=_table,
-                    key=f"utility_{df.iloc[j]['zip']}",
-                    vector=vector_list
-                )
-            )
-        response = stub.BatchWrite(batch)
-        if response.success:
-            print(f"Successfully wrote batch starting with ZIP {df.iloc[i]['zip']}")
-        else:
-            print(f"Failed to write batch starting with ZIP {df.iloc[i]['zip']}")
-
-# Semantic search in the vector database
-def search_for_anomalies(query_vector, stub):
-    """Search for anomalous utility rates in the database."""
-    search_request = vectordb_pb2.VectorSearchRequest(
-        query=query_vector.tobytes(),
-        top_k=10,  # Modify as needed to retrieve a suitable number of similar rates
-        metric="cosine"
-    )
-    search_response = stub.Search(search_request)
-    return [(match.key, match.score) for match in search_response.matches]
+    # Keys are built from the zip column in one pass; batches are sized by serialized bytes
+    summary = load_frame(stub, df, "utility_{zip}", vectors=rate_vectors, keyspace=_keyspace, table=_table)
+    print(f"Wrote {summary['vectors']} / {len(df)} utility vectors in {summary['batches']} batches "
+          f"({summary['vectors_per_s']:.0f} vectors/s)")
+    if summary['failed_keys']:
+        print(f"Failed to write {len(summary['failed_keys'])} utility vectors, starting with ZIP "
+              f"{summary['failed_keys'][0][len('utility_'):]}")
 
 def detect_anomalies(df):
     """Detect anomalies in the utility data."""
-    rate_data = df[['comm_rate', 'ind_rate', 'res_rate']].values
+    rate_data = df[RATE_COLUMNS].values
     iso_forest = IsolationForest(contamination=0.05)
     iso_forest.fit(rate_data)
     anomalies = iso_forest.predict(rate_data)
     return anomalies
 
-def process_anomalies_for_optimization(df, stub):
-    anomaly_data = []  # List to store data for each anomaly
-
-    # Calculate average rates for comparison
-    avg_comm_rate = df['comm_rate'].mean()
-    avg_ind_rate = df['ind_rate'].mean()
-    avg_res_rate = df['res_rate'].mean()
-
-    for index, row in df[df['anomaly'] == -1].iterrows():  # Loop through anomalous entries
-        anomaly_vector = utility_data_to_vectors(pd.DataFrame([row]))
-        similar_rates = search_for_anomalies(anomaly_vector[0], stub)[:1]  # Assuming you want only the top match
-
-        anomaly_record = {
-            "zip": row['zip'],
-            "eiaid": row['eiaid'],
-            "utility_name": row['utility_name'],
-            "state": row['state'],
-            "service_type": row['service_type'],
-            "ownership": row['ownership'],
-            "comm_rate": row['comm_rate'],
-            "ind_rate": row['ind_rate'],
-            "res_rate": row['res_rate'],
-            "similar_zip": similar_rates[0][0] if similar_rates else None,
-            "similar_data": similar_rates[0][1] if similar_rates else None
-        }
+def process_anomalies_for_optimization(df, stub, projection):
+    anomalies = df[df['anomaly'] == -1]
+    if anomalies.empty:
+        return []
+
+    # Project every anomalous entry in one matrix product, into the space of the
+    # stored vectors, and score them all against the database in a single BatchSearch call.
+    # Each entry's own row is stored too and is always its best match, so ask for two
+    # matches and keep the best other ZIP
+    anomaly_vectors = utility_data_to_vectors(anomalies, projection)
+    all_matches = batch_search(stub, anomaly_vectors, top_k=2, metric="cosine",
+                               keyspace="redwing_keyspace", table="vectors")
+
+    # Flag rates more than 20% above their averages, one column at a time
+    high_rates = np.column_stack([(anomalies[column] > df[column].mean() * 1.2).to_numpy()
+                                  for column, _ in RATE_REASONS])
+
+    anomaly_data = anomalies[REPORT_COLUMNS].to_dict('records')
+    for anomaly_record, matches, high in zip(anomaly_data, all_matches, high_rates):
+        similar_rates = [(key, score) for key, score in matches if key != f"utility_{anomaly_record['zip']}"]
+        anomaly_record["similar_zip"] = similar_rates[0][0] if similar_rates else None
+        anomaly_record["similar_data"] = similar_rates[0][1] if similar_rates else None
 
         # Analyze why the rate is considered anomalous
-        reasons = []
-        if row['comm_rate'] > avg_comm_rate * 1.2:
-            reasons.append("commercial rate significantly higher than average")
-        if row['ind_rate'] > avg_ind_rate * 1.2:
-            reasons.append("industrial rate significantly higher than average")
-        if row['res_rate'] > avg_res_rate * 1.2:
-            reasons.append("residential rate significantly higher than average")
-
-        anomaly_reason = "; ".join(reasons) if reasons else "Rates differ significantly from typical values"
-        anomaly_record["anomaly_reason"] = anomaly_reason
-        anomaly_data.append(anomaly_record)
+        reasons = [reason for (_, reason), is_high in zip(RATE_REASONS, high) if is_high]
+        anomaly_record["anomaly_reason"] = "; ".join(reasons) if reasons else "Rates differ significantly from typical values"
 
     return anomaly_data
 
@@ -120,11 +94,14 @@ def main():
 
     stub = setup_grpc_channel()
 
+    # Fit one projection over both datasets, so all stored and query vectors share its space
+    projection = RateProjection.load_or_fit(PROJECTION_PATH, [iou_df, non_iou_df])
+
     print("Processing IOU data...")
-    write_utility_data_to_database(iou_df, stub)
+    write_utility_data_to_database(iou_df, stub, projection)
 
     print("Processing non-IOU data...")
-    write_utility_data_to_database(non_iou_df, stub)
+    write_utility_data_to_database(non_iou_df, stub, projection)
 
     print("Detecting anomalies in IOU data...")
     iou_df['anomaly'] = detect_anomalies(iou_df)
@@ -133,8 +110,8 @@ def main():
     non_iou_df['anomaly'] = detect_anomalies(non_iou_df)
 
     # Collecting anomaly data
-    iou_anomalies = process_anomalies_for_optimization(iou_df, stub)
-    non_iou_anomalies = process_anomalies_for_optimization(non_iou_df, stub)
+    iou_anomalies = process_anomalies_for_optimization(iou_df, stub, projection)
+    non_iou_anomalies = process_anomalies_for_optimization(non_iou_df, stub, projection)
 
     all_anomalies = iou_anomalies + non_iou_anomalies
 
@@ -0,0 +1,88 @@
+import hashlib
+import json
+import os
+import numpy as np
+import sklearn
+from sklearn.decomposition import IncrementalPCA
+
+# Utility rate columns projected into vectors
+RATE_COLUMNS = ['comm_rate', 'ind_rate', 'res_rate']
+
+# Rows passed to IncrementalPCA.partial_fit at a time
+FIT_CHUNK_ROWS = 10000
+
+def rate_data(frames, columns=RATE_COLUMNS):
+    """Stack the `columns` of every frame into one float64 matrix."""
+    return np.vstack([frame[columns].to_numpy(dtype=np.float64) for frame in frames])
+
+def fingerprint(data, n_components, columns):
+    """SHA-256 over the rate data, the columns, the component count and the scikit-learn version."""
+    digest = hashlib.sha256(json.dumps([list(columns), n_components, sklearn.__version__]).encode())
+    digest.update(np.ascontiguousarray(data).tobytes())
+    return digest.hexdigest()
+
+class RateProjection:
+    """PCA projection of utility rates, fitted once and reused for every vector.
+
+    `fit` runs IncrementalPCA over the rate columns of one or more frames,
+    `chunk_rows` rows at a time, so the vectors written to the database and
+    the query vectors of later searches are in the same space. Only the mean
+    and the components are kept: `transform` projects a whole frame with one
+    matrix product, and `save`/`load` keep them in an .npz file so later runs
+    skip the fit. The file also records a fingerprint of the data it was
+    fitted on, so `load_or_fit` refits when the data changes.
+    """
+
+    def __init__(self, mean, components, columns=RATE_COLUMNS, fingerprint=""):
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.components = np.asarray(components, dtype=np.float64)
+        self.columns = list(columns)
+        self.fingerprint = fingerprint
+
+    @classmethod
+    def fit(cls, frames, n_components=3, columns=RATE_COLUMNS, chunk_rows=FIT_CHUNK_ROWS):
+        """Fit the projection over the `columns` of every frame in `frames`."""
+        data = rate_data(frames, columns)
+        key = fingerprint(data, n_components, columns)
+        n_components = min(n_components, len(columns), len(data))
+        pca = IncrementalPCA(n_components=n_components)
+        starts = list(range(0, len(data), chunk_rows))
+        # Every partial_fit needs at least n_components rows, so a short tail joins the chunk before it
+        if len(starts) > 1 and len(data) - starts[-1] < n_components:
+            starts.pop()
+        for start, stop in zip(starts, starts[1:] + [len(data)]):
+            pca.partial_fit(data[start:stop])
+        return cls(pca.mean_, pca.components_, columns, key)
+
+    def transform(self, frame):
+        """Project the rows of a DataFrame into a float32 (rows, n_components) matrix."""
+        data = frame[self.columns].to_numpy(dtype=np.float64)
+        return ((data - self.mean) @ self.components.T).astype(np.float32)
+
+    def save(self, path):
+        # Write then rename, so an interrupted run never leaves a truncated file behind
+        temporary = path + ".tmp.npz"
+        np.savez(temporary, mean=self.mean, components=self.components, columns=np.array(self.columns),
+                 fingerprint=np.array(self.fingerprint))
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as saved:
+            key = str(saved['fingerprint']) if 'fingerprint' in saved.files else ""
+            return cls(saved['mean'], saved['components'], saved['columns'].tolist(), key)
+
+    @classmethod
+    def load_or_fit(cls, path, frames, n_components=3, columns=RATE_COLUMNS, chunk_rows=FIT_CHUNK_ROWS):
+        """Load the projection saved at `path` if it was fitted on the same data, else fit and save it.
+
+        The saved fingerprint must match the rate columns of `frames` and
+        `n_components`, so a changed dataset is never projected with a stale fit.
+        """
+        if os.path.exists(path):
+            projection = cls.load(path)
+            if projection.fingerprint == fingerprint(rate_data(frames, columns), n_components, columns):
+                return projection
+        projection = cls.fit(frames, n_components, columns, chunk_rows)
+        projection.save(path)
+        return projection
@@ -14,37 +14,71 @@ _sym_db = _symbol_database.Default()
 from google.protobuf import timestamp_pb2 as google_dot_protobuf_dot_timestamp__pb2
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0evectordb.proto\x12\x08vectordb\x1a\x1fgoogle/protobuf/timestamp.proto\"\xb2\x01\n\x12VectorWriteRequest\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\x0e\n\x06vector\x18\x02 \x03(\x02\x12.\n\ncreated_at\x18\x03 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12.\n\nupdated_at\x18\x04 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x10\n\x08keyspace\x18\x05 \x01(\t\x12\r\n\x05table\x18\x06 \x01(\t\"i\n\x17VectorBatchWriteRequest\x12-\n\x07vectors\x18\x01 \x03(\x0b\x32\x1c.vectordb.VectorWriteRequest\x12\x10\n\x08keyspace\x18\x02 \x01(\t\x12\r\n\x05table\x18\x03 \x01(\t\"&\n\x13VectorWriteResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\"A\n\x11VectorReadRequest\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\x10\n\x08keyspace\x18\x02 \x01(\t\x12\r\n\x05table\x18\x03 \x01(\t\"3\n\x12VectorReadResponse\x12\x0e\n\x06vector\x18\x01 \x03(\x02\x12\r\n\x05\x66ound\x18\x02 \x01(\x08\"\xb3\x01\n\x13VectorUpdateRequest\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\x0e\n\x06vector\x18\x02 \x03(\x02\x12.\n\ncreated_at\x18\x03 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12.\n\nupdated_at\x18\x04 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x10\n\x08keyspace\x18\x05 \x01(\t\x12\r\n\x05table\x18\x06 \x01(\t\"\'\n\x14VectorUpdateResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\"C\n\x13VectorDeleteRequest\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\x10\n\x08keyspace\x18\x02 \x01(\t\x12\r\n\x05table\x18\x03 \x01(\t\"\'\n\x14VectorDeleteResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\"w\n\x13VectorSearchRequest\x12\r\n\x05query\x18\x01 \x03(\x02\x12\r\n\x05top_k\x18\x02 \x01(\x05\x12\x0e\n\x06metric\x18\x03 \x01(\t\x12\x11\n\tthreshold\x18\x04 \x01(\x02\x12\x10\n\x08keyspace\x18\x05 \x01(\t\x12\r\n\x05table\x18\x06 \x01(\t\"?\n\x14VectorSearchResponse\x12\'\n\x07matches\x18\x01 \x03(\x0b\x32\x16.vectordb.SearchResult\"*\n\x0cSearchResult\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05score\x18\x02 \x01(\x02\x32\xbe\x03\n\x08VectorDB\x12G\n\x06Search\x12\x1d.vectordb.VectorSearchRequest\x1a\x1e.vectordb.VectorSearchResponse\x12N\n\nBatchWrite\x12!.vectordb.VectorBatchWriteRequest\x1a\x1d.vectordb.VectorWriteResponse\x12\x44\n\x05Write\x12\x1c.vectordb.VectorWriteRequest\x1a\x1d.vectordb.VectorWriteResponse\x12\x41\n\x04Read\x12\x1b.vectordb.VectorReadRequest\x1a\x1c.vectordb.VectorReadResponse\x12G\n\x06Update\x12\x1d.vectordb.VectorUpdateRequest\x1a\x1e.vectordb.VectorUpdateResponse\x12G\n\x06\x44\x65lete\x12\x1d.vectordb.VectorDeleteRequest\x1a\x1e.vectordb.VectorDeleteResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0evectordb.proto\x12\x08vectordb\x1a\x1fgoogle/protobuf/timestamp.proto\"<\n\x0cSparseVector\x12\x0f\n\x07indices\x18\x01 \x03(\r\x12\x0e\n\x06values\x18\x02 \x03(\x02\x12\x0b\n\x03\x64im\x18\x03 \x01(\r\"\xad\x03\n\x12VectorWriteRequest\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\x0e\n\x06vector\x18\x02 \x03(\x02\x12.\n\ncreated_at\x18\x03 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12.\n\nupdated_at\x18\x04 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x10\n\x08keyspace\x18\x05 \x01(\t\x12\r\n\x05table\x18\x06 \x01(\t\x12\x12\n\nvector_f32\x18\x07 \x01(\x0c\x12\x0b\n\x03\x64im\x18\x08 \x01(\x05\x12@\n\nattributes\x18\t \x03(\x0b\x32,.vectordb.VectorWriteRequest.AttributesEntry\x12&\n\x06sparse\x18\n \x01(\x0b\x32\x16.vectordb.SparseVector\x12\x12\n\nvector_f16\x18\x0b \x01(\x0c\x12\x11\n\tvector_i8\x18\x0c \x01(\x0c\x12\x14\n\x0cvector_scale\x18\r \x01(\x02\x1a\x31\n\x0f\x41ttributesEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"i\n\x17VectorBatchWriteRequest\x12-\n\x07vectors\x18\x01 \x03(\x0b\x32\x1c.vectordb.VectorWriteRequest\x12\x10\n\x08keyspace\x18\x02 \x01(\t\x12\r\n\x05table\x18\x03 \x01(\t\"&\n\x13VectorWriteResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\"?\n\x0eVectorChunkAck\x12\r\n\x05\x63hunk\x18\x01 \x01(\x03\x12\r\n\x05\x63ount\x18\x02 \x01(\x05\x12\x0f\n\x07success\x18\x03 \x01(\x08\"c\n\x19VectorStreamWriteResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\r\n\x05\x63ount\x18\x02 \x01(\x03\x12&\n\x04\x61\x63ks\x18\x03 \x03(\x0b\x32\x18.vectordb.VectorChunkAck\"Q\n\x11VectorReadRequest\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\x10\n\x08keyspace\x18\x02 \x01(\t\x12\r\n\x05table\x18\x03 \x01(\t\x12\x0e\n\x06packed\x18\x04 \x01(\x08\"|\n\x12VectorReadResponse\x12\x0e\n\x06vector\x18\x01 \x03(\x02\x12\r\n\x05\x66ound\x18\x02 \x01(\x08\x12\x12\n\nvector_f32\x18\x03 \x01(\x0c\x12\x0b\n\x03\x64im\x18\x04 \x01(\x05\x12&\n\x06sparse\x18\x05 \x01(\x0b\x32\x16.vectordb.SparseVector\"W\n\x16VectorBatchReadRequest\x12\x0c\n\x04keys\x18\x01 \x03(\t\x12\x10\n\x08keyspace\x18\x02 \x01(\t\x12\r\n\x05table\x18\x03 \x01(\t\x12\x0e\n\x06packed\x18\x04 \x01(\x08\"H\n\x17VectorBatchReadResponse\x12-\n\x07results\x18\x01 \x03(\x0b\x32\x1c.vectordb.VectorReadResponse\"\xaf\x03\n\x13VectorUpdateRequest\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\x0e\n\x06vector\x18\x02 \x03(\x02\x12.\n\ncreated_at\x18\x03 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12.\n\nupdated_at\x18\x04 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x10\n\x08keyspace\x18\x05 \x01(\t\x12\r\n\x05table\x18\x06 \x01(\t\x12\x12\n\nvector_f32\x18\x07 \x01(\x0c\x12\x0b\n\x03\x64im\x18\x08 \x01(\x05\x12\x41\n\nattributes\x18\t \x03(\x0b\x32-.vectordb.VectorUpdateRequest.AttributesEntry\x12&\n\x06sparse\x18\n \x01(\x0b\x32\x16.vectordb.SparseVector\x12\x12\n\nvector_f16\x18\x0b \x01(\x0c\x12\x11\n\tvector_i8\x18\x0c \x01(\x0c\x12\x14\n\x0cvector_scale\x18\r \x01(\x02\x1a\x31\n\x0f\x41ttributesEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"\'\n\x14VectorUpdateResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\"C\n\x13VectorDeleteRequest\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\x10\n\x08keyspace\x18\x02 \x01(\t\x12\r\n\x05table\x18\x03 \x01(\t\"\'\n\x14VectorDeleteResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\"\xdf\x02\n\x0cSearchFilter\x12\x12\n\nkey_prefix\x18\x01 \x01(\t\x12\x31\n\rcreated_after\x18\x02 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x32\n\x0e\x63reated_before\x18\x03 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x31\n\rupdated_after\x18\x04 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x32\n\x0eupdated_before\x18\x05 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12:\n\nattributes\x18\x06 \x03(\x0b\x32&.vectordb.SearchFilter.AttributesEntry\x1a\x31\n\x0f\x41ttributesEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"\xb8\x02\n\x13VectorSearchRequest\x12\r\n\x05query\x18\x01 \x03(\x02\x12\r\n\x05top_k\x18\x02 \x01(\x05\x12\x0e\n\x06metric\x18\x03 \x01(\t\x12\x11\n\tthreshold\x18\x04 \x01(\x02\x12\x10\n\x08keyspace\x18\x05 \x01(\t\x12\r\n\x05table\x18\x06 \x01(\t\x12\x11\n\tquery_f32\x18\x07 \x01(\x0c\x12\x0b\n\x03\x64im\x18\x08 \x01(\x05\x12&\n\x06\x66ilter\x18\t \x01(\x0b\x32\x16.vectordb.SearchFilter\x12,\n\x0csparse_query\x18\n \x01(\x0b\x32\x16.vectordb.SparseVector\x12\x11\n\tquery_f16\x18\x0b \x01(\x0c\x12\x10\n\x08query_i8\x18\x0c \x01(\x0c\x12\x13\n\x0bquery_scale\x18\r \x01(\x02\x12\x0f\n\x07rescore\x18\x0e \x01(\x05\"?\n\x14VectorSearchResponse\x12\'\n\x07matches\x18\x01 \x03(\x0b\x32\x16.vectordb.SearchResult\"*\n\x0cSearchResult\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05score\x18\x02 \x01(\x02\"\xc8\x02\n\x18VectorBatchSearchRequest\x12\x13\n\x0bqueries_f32\x18\x01 \x01(\x0c\x12\x0f\n\x07queries\x18\x02 \x03(\x02\x12\x0b\n\x03\x64im\x18\x03 \x01(\x05\x12\r\n\x05top_k\x18\x04 \x01(\x05\x12\x0e\n\x06metric\x18\x05 \x01(\t\x12\x11\n\tthreshold\x18\x06 \x01(\x02\x12\x10\n\x08keyspace\x18\x07 \x01(\t\x12\r\n\x05table\x18\x08 \x01(\t\x12&\n\x06\x66ilter\x18\t \x01(\x0b\x32\x16.vectordb.SearchFilter\x12.\n\x0esparse_queries\x18\n \x03(\x0b\x32\x16.vectordb.SparseVector\x12\x13\n\x0bqueries_f16\x18\x0b \x01(\x0c\x12\x12\n\nqueries_i8\x18\x0c \x01(\x0c\x12\x14\n\x0cquery_scales\x18\r \x03(\x02\x12\x0f\n\x07rescore\x18\x0e \x01(\x05\"L\n\x19VectorBatchSearchResponse\x12/\n\x07results\x18\x01 \x03(\x0b\x32\x1e.vectordb.VectorSearchResponse\"\x91\x03\n\x13HybridSearchRequest\x12\x10\n\x08keyspace\x18\x01 \x01(\t\x12\r\n\x05table\x18\x02 \x01(\t\x12\x11\n\tquery_f32\x18\x03 \x01(\x0c\x12\r\n\x05query\x18\x04 \x03(\x02\x12\x0b\n\x03\x64im\x18\x05 \x01(\x05\x12,\n\x0csparse_query\x18\x06 \x01(\x0b\x32\x16.vectordb.SparseVector\x12\r\n\x05top_k\x18\x07 \x01(\x05\x12\x14\n\x0c\x64\x65nse_metric\x18\x08 \x01(\t\x12\x15\n\rsparse_metric\x18\t \x01(\t\x12\x0e\n\x06\x66usion\x18\n \x01(\t\x12\x14\n\x0c\x64\x65nse_weight\x18\x0b \x01(\x02\x12\x15\n\rsparse_weight\x18\x0c \x01(\x02\x12\r\n\x05rrf_k\x18\r \x01(\x05\x12\x12\n\ncandidates\x18\x0e \x01(\x05\x12&\n\x06\x66ilter\x18\x0f \x01(\x0b\x32\x16.vectordb.SearchFilter\x12\x11\n\tquery_f16\x18\x10 \x01(\x0c\x12\x10\n\x08query_i8\x18\x11 \x01(\x0c\x12\x13\n\x0bquery_scale\x18\x12 \x01(\x02\"\x8c\x01\n\x11VectorScanRequest\x12\x10\n\x08keyspace\x18\x01 \x01(\t\x12\r\n\x05table\x18\x02 \x01(\t\x12\x0b\n\x03\x64im\x18\x03 \x01(\x05\x12\x0e\n\x06\x63ursor\x18\x04 \x01(\t\x12\x11\n\tmax_bytes\x18\x05 \x01(\x05\x12&\n\x06\x66ilter\x18\x06 \x01(\x0b\x32\x16.vectordb.SearchFilter\"\x90\x01\n\x0fVectorScanChunk\x12\x0c\n\x04keys\x18\x01 \x03(\t\x12\x13\n\x0bvectors_f32\x18\x02 \x01(\x0c\x12\x0b\n\x03\x64im\x18\x03 \x01(\x05\x12\x16\n\x0e\x63reated_at_f64\x18\x04 \x01(\x0c\x12\x16\n\x0eupdated_at_f64\x18\x05 \x01(\x0c\x12\x0e\n\x06\x63ursor\x18\x06 \x01(\t\x12\r\n\x05total\x18\x07 \x01(\x03\x32\xd2\x06\n\x08VectorDB\x12G\n\x06Search\x12\x1d.vectordb.VectorSearchRequest\x1a\x1e.vectordb.VectorSearchResponse\x12N\n\nBatchWrite\x12!.vectordb.VectorBatchWriteRequest\x1a\x1d.vectordb.VectorWriteResponse\x12\x44\n\x05Write\x12\x1c.vectordb.VectorWriteRequest\x1a\x1d.vectordb.VectorWriteResponse\x12\x41\n\x04Read\x12\x1b.vectordb.VectorReadRequest\x1a\x1c.vectordb.VectorReadResponse\x12G\n\x06Update\x12\x1d.vectordb.VectorUpdateRequest\x1a\x1e.vectordb.VectorUpdateResponse\x12G\n\x06\x44\x65lete\x12\x1d.vectordb.VectorDeleteRequest\x1a\x1e.vectordb.VectorDeleteResponse\x12W\n\x0bStreamWrite\x12!.vectordb.VectorBatchWriteRequest\x1a#.vectordb.VectorStreamWriteResponse(\x01\x12P\n\tBatchRead\x12 .vectordb.VectorBatchReadRequest\x1a!.vectordb.VectorBatchReadResponse\x12V\n\x0b\x42\x61tchSearch\x12\".vectordb.VectorBatchSearchRequest\x1a#.vectordb.VectorBatchSearchResponse\x12@\n\x04Scan\x12\x1b.vectordb.VectorScanRequest\x1a\x19.vectordb.VectorScanChunk0\x01\x12M\n\x0cHybridSearch\x12\x1d.vectordb.HybridSearchRequest\x1a\x1e.vectordb.VectorSearchResponseb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'vectordb_pb2', _globals)
 if _descriptor._USE_C_DESCRIPTORS == False:
   DESCRIPTOR._options = None
-  _globals['_VECTORWRITEREQUEST']._serialized_start=62
-  _globals['_VECTORWRITEREQUEST']._serialized_end=240
-  _globals['_VECTORBATCHWRITEREQUEST']._serialized_start=242
-  _globals['_VECTORBATCHWRITEREQUEST']._serialized_end=347
-  _globals['_VECTORWRITERESPONSE']._serialized_start=349
-  _globals['_VECTORWRITERESPONSE']._serialized_end=387
-  _globals['_VECTORREADREQUEST']._serialized_start=389
-  _globals['_VECTORREADREQUEST']._serialized_end=454
-  _globals['_VECTORREADRESPONSE']._serialized_start=456
-  _globals['_VECTORREADRESPONSE']._serialized_end=507
-  _globals['_VECTORUPDATEREQUEST']._serialized_start=510
-  _globals['_VECTORUPDATEREQUEST']._serialized_end=689
-  _globals['_VECTORUPDATERESPONSE']._serialized_start=691
-  _globals['_VECTORUPDATERESPONSE']._serialized_end=730
-  _globals['_VECTORDELETEREQUEST']._serialized_start=732
-  _globals['_VECTORDELETEREQUEST']._serialized_end=799
-  _globals['_VECTORDELETERESPONSE']._serialized_start=801
-  _globals['_VECTORDELETERESPONSE']._serialized_end=840
-  _globals['_VECTORSEARCHREQUEST']._serialized_start=842
-  _globals['_VECTORSEARCHREQUEST']._serialized_end=961
-  _globals['_VECTORSEARCHRESPONSE']._serialized_start=963
-  _globals['_VECTORSEARCHRESPONSE']._serialized_end=1026
-  _globals['_SEARCHRESULT']._serialized_start=1028
-  _globals['_SEARCHRESULT']._serialized_end=1070
-  _globals['_VECTORDB']._serialized_start=1073
-  _globals['_VECTORDB']._serialized_end=1519
+  _VECTORWRITEREQUEST_ATTRIBUTESENTRY._options = None
+  _VECTORWRITEREQUEST_ATTRIBUTESENTRY._serialized_options = b'8\001'
+  _VECTORUPDATEREQUEST_ATTRIBUTESENTRY._options = None
+  _VECTORUPDATEREQUEST_ATTRIBUTESENTRY._serialized_options = b'8\001'
+  _SEARCHFILTER_ATTRIBUTESENTRY._options = None
+  _SEARCHFILTER_ATTRIBUTESENTRY._serialized_options = b'8\001'
+  _globals['_SPARSEVECTOR']._serialized_start=61
+  _globals['_SPARSEVECTOR']._serialized_end=121
+  _globals['_VECTORWRITEREQUEST']._serialized_start=124
+  _globals['_VECTORWRITEREQUEST']._serialized_end=553
+  _globals['_VECTORWRITEREQUEST_ATTRIBUTESENTRY']._serialized_start=504
+  _globals['_VECTORWRITEREQUEST_ATTRIBUTESENTRY']._serialized_end=553
+  _globals['_VECTORBATCHWRITEREQUEST']._serialized_start=555
+  _globals['_VECTORBATCHWRITEREQUEST']._serialized_end=660
+  _globals['_VECTORWRITERESPONSE']._serialized_start=662
+  _globals['_VECTORWRITERESPONSE']._serialized_end=700
+  _globals['_VECTORCHUNKACK']._serialized_start=702
+  _globals['_VECTORCHUNKACK']._serialized_end=765
+  _globals['_VECTORSTREAMWRITERESPONSE']._serialized_start=767
+  _globals['_VECTORSTREAMWRITERESPONSE']._serialized_end=866
+  _globals['_VECTORREADREQUEST']._serialized_start=868
+  _globals['_VECTORREADREQUEST']._serialized_end=949
+  _globals['_VECTORREADRESPONSE']._serialized_start=951
+  _globals['_VECTORREADRESPONSE']._serialized_end=1075
+  _globals['_VECTORBATCHREADREQUEST']._serialized_start=1077
+  _globals['_VECTORBATCHREADREQUEST']._serialized_end=1164
+  _globals['_VECTORBATCHREADRESPONSE']._serialized_start=1166
+  _globals['_VECTORBATCHREADRESPONSE']._serialized_end=1238
+  _globals['_VECTORUPDATEREQUEST']._serialized_start=1241
+  _globals['_VECTORUPDATEREQUEST']._serialized_end=1672
+  _globals['_VECTORUPDATEREQUEST_ATTRIBUTESENTRY']._serialized_start=504
+  _globals['_VECTORUPDATEREQUEST_ATTRIBUTESENTRY']._serialized_end=553
+  _globals['_VECTORUPDATERESPONSE']._serialized_start=1674
+  _globals['_VECTORUPDATERESPONSE']._serialized_end=1713
+  _globals['_VECTORDELETEREQUEST']._serialized_start=1715
+  _globals['_VECTORDELETEREQUEST']._serialized_end=1782
+  _globals['_VECTORDELETERESPONSE']._serialized_start=1784
+  _globals['_VECTORDELETERESPONSE']._serialized_end=1823
+  _globals['_SEARCHFILTER']._serialized_start=1826
+  _globals['_SEARCHFILTER']._serialized_end=2177
+  _globals['_SEARCHFILTER_ATTRIBUTESENTRY']._serialized_start=504
+  _globals['_SEARCHFILTER_ATTRIBUTESENTRY']._serialized_end=553
+  _globals['_VECTORSEARCHREQUEST']._serialized_start=2180
+  _globals['_VECTORSEARCHREQUEST']._serialized_end=2492
+  _globals['_VECTORSEARCHRESPONSE']._serialized_start=2494
+  _globals['_VECTORSEARCHRESPONSE']._serialized_end=2557
+  _globals['_SEARCHRESULT']._serialized_start=2559
+  _globals['_SEARCHRESULT']._serialized_end=2601
+  _globals['_VECTORBATCHSEARCHREQUEST']._serialized_start=2604
+  _globals['_VECTORBATCHSEARCHREQUEST']._serialized_end=2932
+  _globals['_VECTORBATCHSEARCHRESPONSE']._serialized_start=2934
+  _globals['_VECTORBATCHSEARCHRESPONSE']._serialized_end=3010
+  _globals['_HYBRIDSEARCHREQUEST']._serialized_start=3013
+  _globals['_HYBRIDSEARCHREQUEST']._serialized_end=3414
+  _globals['_VECTORSCANREQUEST']._serialized_start=3417
+  _globals['_VECTORSCANREQUEST']._serialized_end=3557
+  _globals['_VECTORSCANCHUNK']._serialized_start=3560
+  _globals['_VECTORSCANCHUNK']._serialized_end=3704
+  _globals['_VECTORDB']._serialized_start=3707
+  _globals['_VECTORDB']._serialized_end=4557
 # @@protoc_insertion_point(module_scope)
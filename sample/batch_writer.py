@@ -0,0 +1,148 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import grpc
+import vectordb_pb2
+from vectordb_client import write_request
+
+# gRPC's default maximum message size; requests are kept below it
+MAX_MESSAGE_BYTES = 4 * 1024 * 1024
+
+# Room left for the keyspace/table fields and framing of the batch request
+BATCH_OVERHEAD_BYTES = 64 * 1024
+
+# Bytes a repeated-message field adds around each entry (tag + length varint)
+ENTRY_OVERHEAD_BYTES = 6
+
+# Batches sent concurrently on the channel
+MAX_IN_FLIGHT = 4
+
+# Latency each BatchWrite is tuned towards, in seconds
+TARGET_LATENCY = 0.25
+
+# Times a failed batch is resent before its keys are reported as failed
+BATCH_RETRIES = 3
+
+# Status codes worth resending the same batch for
+RETRYABLE_CODES = (grpc.StatusCode.UNAVAILABLE, grpc.StatusCode.DEADLINE_EXCEEDED,
+                   grpc.StatusCode.ABORTED, grpc.StatusCode.INTERNAL)
+
+class AdaptiveBatchWriter:
+    """Writes (key, vector) pairs with BatchWrite calls sized to the data.
+
+    Each VectorBatchWriteRequest is filled until it holds `batch_size`
+    vectors or would exceed `max_bytes` of serialized data, so wide vectors
+    never hit the gRPC message limit and narrow ones are not sent a few at
+    a time. After every batch the target count is rescaled by
+    `target_latency` / observed latency (at most doubling or halving), and
+    up to `max_in_flight` batches are outstanding at once. Batches that fail
+    with a transient status are resent up to `retries` times with backoff;
+    RESOURCE_EXHAUSTED splits the batch in half instead. Dense vectors are
+    packed in `encoding` ("f32", "f16" or "i8"), so narrower encodings fit
+    more vectors under `max_bytes`.
+    """
+
+    def __init__(self, stub, keyspace="redwing_keyspace", table="vectors", batch_size=256,
+                 max_bytes=MAX_MESSAGE_BYTES - BATCH_OVERHEAD_BYTES, max_in_flight=MAX_IN_FLIGHT,
+                 target_latency=TARGET_LATENCY, retries=BATCH_RETRIES, min_batch=1, max_batch=100000,
+                 timeout=None, encoding="f32"):
+        self.stub = stub
+        self.keyspace = keyspace
+        self.table = table
+        self.batch_size = batch_size
+        self.max_bytes = max_bytes
+        self.max_in_flight = max_in_flight
+        self.target_latency = target_latency
+        self.retries = retries
+        self.min_batch = min_batch
+        self.max_batch = max_batch
+        self.timeout = timeout
+        self.encoding = encoding
+
+    def _batches(self, items):
+        """Yield lists of VectorWriteRequests bounded by batch_size and max_bytes."""
+        batch, size = [], 0
+        for key, vector in items:
+            request = write_request(key, vector, self.encoding)
+            entry_bytes = request.ByteSize() + ENTRY_OVERHEAD_BYTES
+            if batch and (len(batch) >= self.batch_size or size + entry_bytes > self.max_bytes):
+                yield batch
+                batch, size = [], 0
+            batch.append(request)
+            size += entry_bytes
+        if batch:
+            yield batch
+
+    def _send(self, batch):
+        """Send one batch with retries; returns (latency, keys that could not be written)."""
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            try:
+                request = vectordb_pb2.VectorBatchWriteRequest(keyspace=self.keyspace, table=self.table, vectors=batch)
+                response = self.stub.BatchWrite(request, timeout=self.timeout)
+                if response.success:
+                    return time.perf_counter() - started, []
+                error = "server reported failure"
+            except grpc.RpcError as rpc_error:
+                if rpc_error.code() == grpc.StatusCode.RESOURCE_EXHAUSTED and len(batch) > 1:
+                    half = len(batch) // 2
+                    first_latency, first_failed = self._send(batch[:half])
+                    second_latency, second_failed = self._send(batch[half:])
+                    return first_latency + second_latency, first_failed + second_failed
+                if rpc_error.code() not in RETRYABLE_CODES:
+                    attempt = self.retries
+                error = rpc_error.details()
+            if attempt >= self.retries:
+                logging.error(f"BatchWrite of {len(batch)} vectors failed: {error}")
+                return time.perf_counter() - started, [request.key for request in batch]
+            attempt += 1
+            time.sleep(0.1 * 2 ** attempt)
+
+    def _tune(self, count, latency):
+        """Rescale the batch size towards target_latency from one completed batch."""
+        if count < self.batch_size or latency <= 0:
+            return  # Short batches (byte-limited or the last one) say little about the right size
+        factor = min(2.0, max(0.5, self.target_latency / latency))
+        self.batch_size = int(min(self.max_batch, max(self.min_batch, self.batch_size * factor)))
+
+    def write(self, items):
+        """Write an iterable of (key, vector) pairs; returns a summary dict.
+
+        The summary holds the vectors written, batches sent, elapsed
+        seconds, vectors/s, the final batch size and the keys of any
+        vectors that still failed after retrying.
+        """
+        started = time.perf_counter()
+        written, batches, failed = 0, 0, []
+        pending = {}
+        with ThreadPoolExecutor(self.max_in_flight) as executor:
+
+            def collect(done):
+                nonlocal written, batches
+                for future in done:
+                    count = pending.pop(future)
+                    latency, failed_keys = future.result()
+                    self._tune(count, latency)
+                    written += count - len(failed_keys)
+                    batches += 1
+                    failed.extend(failed_keys)
+
+            for batch in self._batches(items):
+                if len(pending) >= self.max_in_flight:
+                    collect(wait(pending, return_when=FIRST_COMPLETED).done)
+                pending[executor.submit(self._send, batch)] = len(batch)
+            collect(wait(pending).done)
+        elapsed = time.perf_counter() - started
+        return {
+            "vectors": written,
+            "batches": batches,
+            "seconds": elapsed,
+            "vectors_per_s": written / elapsed if elapsed else 0.0,
+            "batch_size": self.batch_size,
+            "failed_keys": failed,
+        }
+
+def batch_write(stub, items, keyspace="redwing_keyspace", table="vectors", **kwargs):
+    """Write (key, vector) pairs with an AdaptiveBatchWriter; returns its summary."""
+    return AdaptiveBatchWriter(stub, keyspace, table, **kwargs).write(items)
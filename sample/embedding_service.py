@@ -0,0 +1,100 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+import numpy as np
+
+# Sentence embedding model used by the healthcare samples
+DEFAULT_MODEL = 'all-MiniLM-L6-v2'
+
+# Most texts encoded in one model call
+MAX_BATCH_SIZE = 64
+
+# How long the first request of a batch waits for others to join it, in seconds
+MAX_WAIT = 0.005
+
+class EmbeddingService:
+    """A SentenceTransformer loaded once and shared by every caller.
+
+    `encode` can be called from any number of threads. Requests are queued
+    for one worker thread, which coalesces those arriving within `max_wait`
+    seconds of each other, up to `max_batch_size` texts, into a single model
+    call and hands each caller its rows as a float32 matrix ready for
+    pack_vector. Pass `model` to reuse an already loaded model.
+    """
+
+    def __init__(self, model_name=DEFAULT_MODEL, max_batch_size=MAX_BATCH_SIZE, max_wait=MAX_WAIT, model=None):
+        if model is None:
+            from sentence_transformers import SentenceTransformer
+            model = SentenceTransformer(model_name)
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.requests = queue.Queue()
+        self.batches = 0
+        self.texts = 0
+        self.worker = threading.Thread(target=self._run, name="embedding-service", daemon=True)
+        self.worker.start()
+
+    def encode(self, texts):
+        """Embed a list of texts; returns a (len(texts), dim) float32 array."""
+        future = Future()
+        self.requests.put((list(texts), future))
+        return future.result()
+
+    def encode_one(self, text):
+        """Embed a single text; returns a float32 vector."""
+        return self.encode([text])[0]
+
+    def close(self):
+        """Stop the worker once queued requests have been served."""
+        self.requests.put(None)
+        self.worker.join()
+
+    def _collect(self, first):
+        """Gather requests queued behind `first` until the wait window or batch is full."""
+        batch = [first]
+        size = len(first[0])
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self.requests.get(timeout=remaining) if remaining > 0 else self.requests.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self.requests.put(None)
+                break
+            batch.append(item)
+            size += len(item[0])
+        return batch
+
+    def _run(self):
+        while True:
+            first = self.requests.get()
+            if first is None:
+                return
+            batch = self._collect(first)
+            texts = [text for request_texts, _ in batch for text in request_texts]
+            try:
+                vectors = np.asarray(self.model.encode(texts, batch_size=self.max_batch_size), dtype=np.float32)
+            except Exception as error:
+                for _, future in batch:
+                    future.set_exception(error)
+                continue
+            self.batches += 1
+            self.texts += len(texts)
+            start = 0
+            for request_texts, future in batch:
+                future.set_result(vectors[start:start + len(request_texts)])
+                start += len(request_texts)
+
+_services = {}
+_services_lock = threading.Lock()
+
+def shared_embedding_service(model_name=DEFAULT_MODEL):
+    """Return the process-wide EmbeddingService for `model_name`, loading it on first use."""
+    with _services_lock:
+        if model_name not in _services:
+            _services[model_name] = EmbeddingService(model_name)
+        return _services[model_name]
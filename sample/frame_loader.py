@@ -0,0 +1,78 @@
+import string
+import numpy as np
+from vectordb_client import VECTOR_DTYPE
+from batch_writer import AdaptiveBatchWriter
+
+# Rows converted to keys and vectors at a time
+CHUNK_ROWS = 100000
+
+def _num_rows(frame):
+    return frame.num_rows if hasattr(frame, 'num_rows') else len(frame)
+
+def _slice(frame, start, stop):
+    """Rows start..stop of a pandas DataFrame or Arrow table, without copying."""
+    if hasattr(frame, 'iloc'):
+        return frame.iloc[start:stop]
+    return frame.slice(start, stop - start)
+
+def _column(frame, name):
+    """One column of a pandas DataFrame or Arrow table as a NumPy array."""
+    if hasattr(frame, 'iloc'):
+        return frame[name].to_numpy()
+    return frame.column(name).to_numpy()
+
+def frame_keys(frame, key):
+    """Build the key of every row of `frame` in one vectorized pass.
+
+    `key` is a column name, a template such as "{nonce}_{from_address}"
+    whose fields are column names, or a function taking the frame and
+    returning one key per row.
+    """
+    if callable(key):
+        return np.asarray(key(frame)).astype(str)
+    if '{' not in key:
+        return _column(frame, key).astype(str)
+    keys = np.full(_num_rows(frame), '', dtype=object)
+    for literal, field, spec, conversion in string.Formatter().parse(key):
+        if literal:
+            keys = keys + literal
+        if field is not None:
+            if spec or conversion:
+                raise ValueError(f"key template fields take no format spec or conversion: {{{field}}}")
+            keys = keys + _column(frame, field).astype(str).astype(object)
+    return keys.astype(str)
+
+def frame_matrix(frame, columns):
+    """Stack feature columns into a contiguous (rows, len(columns)) float32 matrix."""
+    matrix = np.empty((_num_rows(frame), len(columns)), dtype=VECTOR_DTYPE)
+    for i, name in enumerate(columns):
+        matrix[:, i] = _column(frame, name)
+    return matrix
+
+def frame_rows(frame, key, features=None, vectors=None, chunk_rows=CHUNK_ROWS):
+    """Lazily yield (key, vector) pairs for every row, converting chunk_rows at a time.
+
+    Vectors come from the `features` columns of the frame, or from a
+    precomputed `vectors` matrix aligned with its rows (e.g. PCA or TF-IDF
+    output).
+    """
+    if (features is None) == (vectors is None):
+        raise ValueError("pass exactly one of features or vectors")
+    for start in range(0, _num_rows(frame), chunk_rows):
+        stop = min(start + chunk_rows, _num_rows(frame))
+        chunk = _slice(frame, start, stop)
+        matrix = frame_matrix(chunk, features) if features is not None else \
+            np.ascontiguousarray(vectors[start:stop], dtype=VECTOR_DTYPE)
+        yield from zip(frame_keys(chunk, key), matrix)
+
+def load_frame(stub, frame, key, features=None, vectors=None, keyspace="redwing_keyspace", table="vectors",
+               chunk_rows=CHUNK_ROWS, **kwargs):
+    """Bulk-load a pandas DataFrame or Arrow table into the vector database.
+
+    Keys are built from `key` (see frame_keys) and vectors from the
+    `features` columns or a precomputed `vectors` matrix, one chunk of rows
+    at a time, and sent with an AdaptiveBatchWriter; extra keyword
+    arguments configure the writer. Returns the writer's summary.
+    """
+    writer = AdaptiveBatchWriter(stub, keyspace, table, **kwargs)
+    return writer.write(frame_rows(frame, key, features, vectors, chunk_rows))
@@ -1,51 +1,84 @@
+import itertools
 import grpc
 import vectordb_pb2
 import vectordb_pb2_grpc
-from sentence_transformers import SentenceTransformer
+from sklearn.feature_extraction.text import HashingVectorizer
+from vectordb_client import stream_write, sparse_rows, search_request, hybrid_search
+from embedding_service import shared_embedding_service
+
+# Stateless keyword features: papers and queries hash into the same sparse
+# space without a vocabulary having to be fitted and kept
+keyword_vectorizer = HashingVectorizer(n_features=2 ** 20, alternate_sign=False, stop_words='english')
 
 def process_papers(paper_texts):
-    """Convert paper texts into semantic vectors."""
-    model = SentenceTransformer('all-MiniLM-L6-v2')
-    paper_vectors = model.encode(paper_texts)
-    return paper_vectors
+    """Convert paper texts into float32 semantic vectors with the shared, already loaded model."""
+    return shared_embedding_service().encode(paper_texts)
+
+def keyword_vectors(paper_texts):
+    """Sparse term vectors of paper texts as a CSR matrix."""
+    return keyword_vectorizer.transform(paper_texts)
 
-def write_papers_to_database(papers, stub):
-    """Process papers and write to the database."""
+def write_papers_to_database(papers, stub, cache=None):
+    """Process papers and write to the database, invalidating `cache` if given."""
     
     paper_vectors = process_papers(papers)
-    for i, vector in enumerate(paper_vectors):
-        vector_bytes = vector.tobytes()
-        # Define keyspace and table name
-        _keyspace = "redwing_keyspace"
-        _table = "vectors"
+    paper_keys = [f"paper_{i}" for i in range(len(papers))]
+    # Define keyspace and table name
+    _keyspace = "redwing_keyspace"
+    _table = "vectors"
 
-        # Prepare data for Write
-        write_data = vectordb_pb2.VectorWriteRequest(
-            keyspace=_keyspace,
-            table=_table,
-            key=f"paper_{i}",
-            vector=vector_bytes
-        )
-        stub.Write(write_data)
+    # Stream the semantic and the keyword vector of every paper, stored side
+    # by side under its key, in a single StreamWrite call; the keyword vectors
+    # are only searched by search_similar_papers(..., hybrid=True)
+    stream_write(
+        stub,
+        itertools.chain(zip(paper_keys, paper_vectors), zip(paper_keys, sparse_rows(keyword_vectors(papers)))),
+        keyspace=_keyspace,
+        table=_table
+    )
+    if cache is not None:
+        cache.invalidate()
+
+def search_similar_papers(query, stub, cache=None, hybrid=False):
+    """Search for semantically similar papers; returns (key, cosine similarity) pairs.
 
-def search_similar_papers(query, stub):
-    """Search for semantically similar papers."""
+    With `hybrid` one HybridSearch call also ranks the papers against the
+    query's keyword vector and fuses both rankings on the server by
+    reciprocal rank, so the scores are fused rank scores rather than
+    similarities. With a SemanticResultCache, repeated and paraphrased
+    queries reuse earlier matches instead of issuing a new search; keep a
+    separate cache for each mode.
+    """
+    if cache is not None:
+        matches = cache.lookup_text(query)
+        if matches is not None:
+            return matches
+        generation = cache.generation
     query_vector = process_papers([query])[0]
+    if cache is not None:
+        matches = cache.lookup(query_vector)
+        if matches is not None:
+            return matches
     # Define keyspace and table name
     _keyspace = "redwing_keyspace"
     _table = "vectors"
-    search_request = vectordb_pb2.VectorSearchRequest(
-        query=query_vector.tobytes(),
-        top_k=5,
-        metric="cosine",
-        keyspace=_keyspace,
-        table=_table,        
-    )
-    search_response = stub.Search(search_request)
-    return [(match.key, match.score) for match in search_response.matches]
+    if hybrid:
+        query_keywords = next(sparse_rows(keyword_vectors([query])))
+        # Reciprocal-rank fusion, as embedding and keyword scores are on different scales
+        matches = hybrid_search(stub, query_vector, query_keywords, top_k=5, fusion="rrf",
+                                keyspace=_keyspace, table=_table)
+    else:
+        search_response = stub.Search(search_request(query_vector, top_k=5, metric="cosine",
+                                                     keyspace=_keyspace, table=_table))
+        matches = [(match.key, match.score) for match in search_response.matches]
+    if cache is not None:
+        cache.put(query, query_vector, matches, generation)
+    return matches
 
 def setup_grpc_channel():
     """Setup gRPC channel and create a stub (client)."""
+    # Uses the StreamWrite RPC (and HybridSearch with hybrid=True), which the helloredwing/vector image does not implement
+    # yet (it answers UNIMPLEMENTED): run against server/vectordb_server.py
     channel = grpc.insecure_channel('localhost:50051')
     return vectordb_pb2_grpc.VectorDBStub(channel)
 
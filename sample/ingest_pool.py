@@ -0,0 +1,194 @@
+import itertools
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from multiprocessing import shared_memory
+import grpc
+import numpy as np
+import vectordb_pb2
+from vectordb_client import VECTOR_DTYPE
+from batch_writer import MAX_MESSAGE_BYTES, BATCH_OVERHEAD_BYTES, BATCH_RETRIES, RETRYABLE_CODES
+
+# Full method name used to send pre-serialized VectorBatchWriteRequest bytes
+BATCH_WRITE_METHOD = '/vectordb.VectorDB/BatchWrite'
+
+# Serialized bytes per VectorWriteRequest on top of its key and vector payload
+ROW_OVERHEAD_BYTES = 24
+
+# Upper bound on the serialized bytes of one non-zero of a sparse row: a
+# uint32 index varint and a float32 value
+SPARSE_ENTRY_BYTES = 9
+
+# Serialized batches waiting to be sent, per channel
+IN_FLIGHT_PER_CHANNEL = 4
+
+# Below this many rows starting the worker processes costs more than it saves
+PARALLEL_MIN_ROWS = 100000
+
+# Set in each worker process by _attach
+_shm = None
+_arrays = None
+_dim = None
+
+def _layout(arrays):
+    """(name, offset, shape, dtype) of each array packed back to back into one block."""
+    layout, offset = [], 0
+    for name, array in arrays.items():
+        layout.append((name, offset, array.shape, array.dtype.str))
+        offset += array.nbytes
+    return layout, offset
+
+def _map(buffer, layout):
+    return {name: np.ndarray(shape, dtype=dtype, buffer=buffer, offset=offset)
+            for name, offset, shape, dtype in layout}
+
+def _attach(name, layout, dim):
+    """Worker initializer: map the shared arrays without copying them."""
+    global _arrays, _dim, _shm
+    # Spawned workers share the parent's resource tracker, so the block is
+    # unlinked exactly once, by the parent, when write() finishes
+    _shm = shared_memory.SharedMemory(name=name)
+    _arrays = _map(_shm.buf, layout)
+    _dim = dim
+
+def _serialize(task):
+    """Worker: turn rows start..start+len(keys) of the shared matrix into request bytes."""
+    start, keys, keyspace, table = task
+    if 'matrix' in _arrays:
+        rows = _arrays['matrix'][start:start + len(keys)]
+        vectors = [vectordb_pb2.VectorWriteRequest(key=key, vector_f32=row.tobytes(), dim=_dim)
+                   for key, row in zip(keys, rows)]
+    else:
+        indptr, indices, data = _arrays['indptr'], _arrays['indices'], _arrays['data']
+        vectors = [vectordb_pb2.VectorWriteRequest(key=key, sparse=vectordb_pb2.SparseVector(
+            indices=indices[indptr[row]:indptr[row + 1]], values=data[indptr[row]:indptr[row + 1]], dim=_dim
+        )) for row, key in enumerate(keys, start)]
+    request = vectordb_pb2.VectorBatchWriteRequest(keyspace=keyspace, table=table, vectors=vectors)
+    return start, len(keys), request.SerializeToString()
+
+class ParallelIngest:
+    """Bulk writer that builds VectorBatchWriteRequests in a pool of processes.
+
+    Protobuf message construction and serialization hold the GIL, so one
+    Python process can only prepare requests as fast as one core allows.
+    `write` copies the float32 matrix, or the arrays of a CSR matrix, once
+    into shared memory; `processes` workers map it, each serializing a range
+    of rows into a complete VectorBatchWriteRequest sized to stay under
+    `max_bytes`, and the parent
+    only passes those bytes to gRPC, round-robin over `channels` channels
+    with IN_FLIGHT_PER_CHANNEL requests outstanding on each. Workers are
+    started with the "spawn" method so they never inherit gRPC state.
+    """
+
+    def __init__(self, target='localhost:50051', keyspace="redwing_keyspace", table="vectors",
+                 processes=None, channels=1, max_bytes=MAX_MESSAGE_BYTES - BATCH_OVERHEAD_BYTES,
+                 retries=BATCH_RETRIES, timeout=None):
+        self.target = target
+        self.keyspace = keyspace
+        self.table = table
+        self.processes = processes or os.cpu_count()
+        self.channels = channels
+        self.max_bytes = max_bytes
+        self.retries = retries
+        self.timeout = timeout
+
+    def _tasks(self, keys, row_bytes):
+        """Split the rows into (start, keys) ranges whose estimated bytes stay under max_bytes."""
+        key_bytes = np.fromiter((len(key.encode()) for key in keys), dtype=np.int64, count=len(keys))
+        ends = np.cumsum(key_bytes + row_bytes + ROW_OVERHEAD_BYTES)
+        tasks, start = [], 0
+        while start < len(keys):
+            base = ends[start - 1] if start else 0
+            stop = max(start + 1, int(np.searchsorted(ends, base + self.max_bytes, side='right')))
+            tasks.append((start, keys[start:stop], self.keyspace, self.table))
+            start = stop
+        return tasks
+
+    def _send(self, batch_write, keys, payload):
+        """Send serialized bytes with retries; returns the keys that could not be written."""
+        for attempt in range(self.retries + 1):
+            try:
+                if batch_write(payload, timeout=self.timeout).success:
+                    return []
+                error = "server reported failure"
+            except grpc.RpcError as rpc_error:
+                error = rpc_error.details()
+                if rpc_error.code() not in RETRYABLE_CODES:
+                    break
+            if attempt < self.retries:
+                time.sleep(0.1 * 2 ** (attempt + 1))
+        logging.error(f"BatchWrite of {len(keys)} vectors starting at {keys[0]!r} failed: {error}")
+        return keys
+
+    def write(self, keys, matrix):
+        """Write `keys` with the rows of an (n, dim) matrix; returns a summary dict.
+
+        A CSR matrix (anything with indptr/indices/data, such as
+        TfidfVectorizer output) is written as sparse vectors without being
+        densified. The summary holds the vectors written, batches sent,
+        elapsed seconds, vectors/s and the keys of any vectors that still
+        failed after retrying, like AdaptiveBatchWriter.write.
+        """
+        started = time.perf_counter()
+        keys = [str(key) for key in keys]
+        if hasattr(matrix, 'indptr'):
+            arrays = {
+                'indptr': np.asarray(matrix.indptr, dtype=np.int64),
+                'indices': np.asarray(matrix.indices, dtype=np.uint32),
+                'data': np.asarray(matrix.data, dtype=np.float32),
+            }
+            shape = matrix.shape
+        else:
+            arrays = {'matrix': np.asarray(matrix, dtype=VECTOR_DTYPE)}
+            shape = arrays['matrix'].shape
+        if len(shape) != 2 or shape[0] != len(keys):
+            raise ValueError(f"expected one matrix row per key, got {shape} for {len(keys)} keys")
+        if 'matrix' in arrays:
+            row_bytes = VECTOR_DTYPE.itemsize * shape[1]
+        else:
+            row_bytes = SPARSE_ENTRY_BYTES * np.diff(arrays['indptr'])
+        tasks = self._tasks(keys, row_bytes)
+
+        layout, size = _layout(arrays)
+        shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        channels = []
+        try:
+            for name, offset, array_shape, dtype in layout:
+                np.ndarray(array_shape, dtype=dtype, buffer=shm.buf, offset=offset)[:] = arrays[name]
+            context = multiprocessing.get_context("spawn")
+            with context.Pool(self.processes, initializer=_attach, initargs=(shm.name, layout, shape[1])) as pool:
+                channels = [grpc.insecure_channel(self.target) for _ in range(self.channels)]
+                senders = itertools.cycle([channel.unary_unary(
+                    BATCH_WRITE_METHOD,
+                    response_deserializer=vectordb_pb2.VectorWriteResponse.FromString
+                ) for channel in channels])
+                failed, batches, pending = [], 0, set()
+                max_pending = IN_FLIGHT_PER_CHANNEL * self.channels
+                with ThreadPoolExecutor(max_pending) as executor:
+                    for start, count, payload in pool.imap_unordered(_serialize, tasks):
+                        if len(pending) >= max_pending:
+                            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                            failed.extend(key for future in done for key in future.result())
+                        pending.add(executor.submit(self._send, next(senders), keys[start:start + count], payload))
+                        batches += 1
+                    failed.extend(key for future in wait(pending).done for key in future.result())
+        finally:
+            for channel in channels:
+                channel.close()
+            shm.close()
+            shm.unlink()
+        elapsed = time.perf_counter() - started
+        written = len(keys) - len(failed)
+        return {
+            "vectors": written,
+            "batches": batches,
+            "seconds": elapsed,
+            "vectors_per_s": written / elapsed if elapsed else 0.0,
+            "failed_keys": failed,
+        }
+
+def parallel_write(keys, matrix, target='localhost:50051', keyspace="redwing_keyspace", table="vectors", **kwargs):
+    """Write an (n, dim) dense or CSR matrix under `keys` with a ParallelIngest; returns its summary."""
+    return ParallelIngest(target, keyspace, table, **kwargs).write(keys, matrix)
@@ -1,21 +1,19 @@
 import grpc
 import vectordb_pb2
 import vectordb_pb2_grpc
-import struct
+from vectordb_client import stream_write, scan_matrix, search_filter
 import numpy as np
 from sklearn.linear_model import LinearRegression
-import random
 
 def generate_sales_data(num_products, num_days):
     """Generate sales data for products over a period of time."""
-    sales_data = {}
-    for product_id in range(num_products):
-        daily_sales = [random.randint(10, 100) for _ in range(num_days)]  # Simulate daily sales
-        sales_data[product_id] = daily_sales
-    return sales_data
+    daily_sales = np.random.randint(10, 101, (num_products, num_days))  # Simulate daily sales
+    return dict(enumerate(daily_sales))
 
 def main():
     # Setup gRPC channel and create a stub (client)
+    # Uses the StreamWrite and Scan RPCs, which the helloredwing/vector image does not implement
+    # yet (it answers UNIMPLEMENTED): run against server/vectordb_server.py
     channel = grpc.insecure_channel('localhost:50051')
     stub = vectordb_pb2_grpc.VectorDBStub(channel)
 
@@ -25,39 +23,31 @@ def main():
     sales_data = generate_sales_data(num_products, num_days)
     _keyspace = "redwing_keyspace"
     _table = "vectors"
-    # Write sales data to the database
-    for product_id, daily_sales in sales_data.items():
-        for day, sales in enumerate(daily_sales):
-            data = [product_id, day, sales]
-            vector_bytes = struct.pack(f'{len(data)}f', *data)
+    # Stream sales data to the database in a single StreamWrite call
+    stream_write(
+        stub,
+        ((f"product_{product_id}_day_{day}", [product_id, day, sales])
+         for product_id, daily_sales in sales_data.items()
+         for day, sales in enumerate(daily_sales)),
+        keyspace=_keyspace,
+        table=_table
+    )
 
-            # Prepare data for Write
-            write_data = vectordb_pb2.VectorWriteRequest(
-                keyspace=_keyspace,
-                table=_table,
-                key=f"product_{product_id}_day_{day}",
-                vector=vector_bytes
-            )
-            stub.Write(write_data)
+    # Pull all [product_id, day, sales] vectors back in one streamed Scan
+    keys, sales_vectors, _, _ = scan_matrix(
+        stub,
+        dim=3,
+        keyspace=_keyspace,
+        table=_table,
+        filter=search_filter(key_prefix="product_")
+    )
+    sales_vectors = sales_vectors[["_day_" in key for key in keys]]
 
-    # Read and collect sales data for analysis
+    # Collect each product's sales ordered by day
     collected_data = []
     for product_id in range(num_products):
-        product_sales = []
-        for day in range(num_days):
-            read_data = vectordb_pb2.VectorReadRequest(
-                    keyspace=_keyspace,
-                    table=_table,
-                    key=f"product_{product_id}_day_{day}"
-                )
-            response = stub.Read(read_data)
-            if response.found:
-                vector_list = list(response.vector)
-                if len(vector_list) == 12:  # Check if the vector has the expected 12 elements
-                    sales = vector_list[-1]  # Extract the sales data (assuming it's the last element)
-                    product_sales.append(sales)
-                else:
-                    print(f"Unexpected number of elements in vector for product {product_id}, day {day}")
+        rows = sales_vectors[(sales_vectors[:, 0] == product_id) & (sales_vectors[:, 1] < num_days)]
+        product_sales = rows[np.argsort(rows[:, 1]), 2]
         if len(product_sales) == num_days:
             collected_data.append((product_id, product_sales))
         else:
@@ -1,69 +1,41 @@
 import grpc
 import vectordb_pb2
 import vectordb_pb2_grpc
-import struct
+from vectordb_client import stream_write, batch_read, decode_vector
 import numpy as np
 from sklearn.ensemble import IsolationForest
-import random
+from workload import log_features
 
 def generate_log_data(num_entries):
     """Generate simulated network log data with additional features."""
-    log_data = []
-    for _ in range(num_entries):
-        # Enhanced log data features
-        request_size = random.uniform(100, 10000)  # Size of request
-        response_time = random.uniform(0, 5)       # Response time in seconds
-        error_code = float(random.randint(0, 1))   # 0 for normal, 1 for error, as float
-        ip_address = float(random.randint(0, 255)) # Simulated IP address part, as float
-        # Convert string data to numerical representations (example approach)
-        url_endpoint = ['/login', '/api', '/home', '/user'].index(random.choice(['/login', '/api', '/home', '/user']))
-        http_method = ['GET', 'POST', 'PUT', 'DELETE'].index(random.choice(['GET', 'POST', 'PUT', 'DELETE']))
-        user_agent = ['browser', 'mobile', 'bot'].index(random.choice(['browser', 'mobile', 'bot']))
-        failed_logins = float(random.randint(0, 5)) # Failed login attempts, as float
-
-        log_data.append([request_size, response_time, error_code, 
-                         ip_address, url_endpoint, http_method, 
-                         user_agent, failed_logins])
-    return log_data
+    return log_features(num_entries)
 
 def main(num_entries=1000):  # Default value set to 1000
     # Setup gRPC channel and create a stub (client)
+    # Uses the StreamWrite and BatchRead RPCs, which the helloredwing/vector image does not implement
+    # yet (it answers UNIMPLEMENTED): run against server/vectordb_server.py
     channel = grpc.insecure_channel('localhost:50051') # use <your_deployed_terraform_ip>:50051 for deployed sandbox environments 
     stub = vectordb_pb2_grpc.VectorDBStub(channel)
 
     # Generate log data
-    log_data = generate_log_data(1000)  # 200 log entries
+    log_data = generate_log_data(num_entries)
 
     _keyspace = "redwing_keyspace"
     _table = "vectors"
-    # Write log data to the database
-    for i, entry in enumerate(log_data):
-        # Ensure all data are floats
-        entry_as_floats = list(map(float, entry))
-        vector_bytes = struct.pack(f'{len(entry_as_floats)}f', *entry_as_floats)
-        write_data = vectordb_pb2.VectorWriteRequest(
-            keyspace=_keyspace,
-            table=_table,            
-            key=f"log_{i}",
-            vector=vector_bytes
-        )
-        stub.Write(write_data)
-
-    # Assuming each log entry should have 8 features
-    feature_length = 8
+    keys = [f"log_{i}" for i in range(num_entries)]
+    # Stream log data to the database in a single StreamWrite call
+    stream_write(
+        stub,
+        zip(keys, log_data),
+        keyspace=_keyspace,
+        table=_table
+    )
 
-    # Read and collect log data for analysis, removing padding
-    collected_logs = []
-    for i in range(len(log_data)):
-        read_data = vectordb_pb2.VectorReadRequest(
-            keyspace=_keyspace,
-            table=_table,    
-            key=f"log_{i}")
-        response = stub.Read(read_data)
-        if response.found:
-            vector_list = list(response.vector)[:feature_length]  # Slice to remove padding
-            log_entry = np.array(vector_list)
-            collected_logs.append(log_entry)
+    # Read back exactly the logs written by this run, in batched reads; a prefix
+    # Scan would also return log keys left by earlier runs and other samples
+    found = batch_read(stub, keys, keyspace=_keyspace, table=_table)
+    keys = [key for key, response in zip(keys, found) if response.found]
+    collected_logs = np.array([decode_vector(response) for response in found if response.found])
 
     # Anomaly detection using Isolation Forest
     clf = IsolationForest(contamination=0.05)
@@ -71,16 +43,12 @@ def main(num_entries=1000):  # Default value set to 1000
     anomalies = clf.predict(collected_logs)
 
     # Calculate mean feature values for normal and anomalous logs
-    normal_logs = [collected_logs[i] for i in range(len(collected_logs)) if anomalies[i] != -1]
-    anomalous_logs = [collected_logs[i] for i in range(len(collected_logs)) if anomalies[i] == -1]
-
-    # Calculate mean feature values for normal and anomalous logs
-    normal_mean = np.mean(normal_logs, axis=0)
-    anomalous_mean = np.mean(anomalous_logs, axis=0)
+    normal_mean = collected_logs[anomalies != -1].mean(axis=0)
+    anomalous_mean = collected_logs[anomalies == -1].mean(axis=0)
 
     for i, anomaly in enumerate(anomalies):
         if anomaly == -1:  # -1 indicates an anomaly
-            print(f"Threat log entry detected: Log_{i}")
+            print(f"Threat log entry detected: {keys[i]}")
             print("Features of this log:")
             print(collected_logs[i])
             print("Average features of normal logs:")
@@ -94,7 +62,7 @@ def main(num_entries=1000):  # Default value set to 1000
     for i, anomaly in enumerate(anomalies):
         if anomaly == -1:  # -1 indicates an anomaly
             log_detail = {
-                'log_id': f'Log_{i}',
+                'log_id': keys[i],
                 'features': collected_logs[i],
                 'normal_mean': normal_mean,
                 'anomalous_mean': anomalous_mean
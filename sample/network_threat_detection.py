@@ -1,24 +1,19 @@
 import grpc
 import vectordb_pb2
 import vectordb_pb2_grpc
-import struct
+from vectordb_client import stream_write, batch_read, decode_vector
 import numpy as np
 from sklearn.ensemble import IsolationForest
-import random
+from workload import log_features
 
 def generate_log_data(num_entries):
-    """Generate simulated network log data."""
-    log_data = []
-    for _ in range(num_entries):
-        # Simulating log data features (e.g., request size, response time, error codes)
-        request_size = random.uniform(100, 10000)  # Size of request
-        response_time = random.uniform(0, 5)      # Response time in seconds
-        error_code = random.randint(0, 1)         # 0 for normal, 1 for error
-        log_data.append([request_size, response_time, error_code])
-    return log_data
+    """Generate simulated network log data: request size, response time and error code."""
+    return log_features(num_entries)[:, :3]
 
 def main():
     # Setup gRPC channel and create a stub (client)
+    # Uses the StreamWrite and BatchRead RPCs, which the helloredwing/vector image does not implement
+    # yet (it answers UNIMPLEMENTED): run against server/vectordb_server.py
     channel = grpc.insecure_channel('localhost:50051') # use <your_deployed_terraform_ip>:50051 for deployed sandbox environments 
     stub = vectordb_pb2_grpc.VectorDBStub(channel)
 
@@ -27,28 +22,20 @@ def main():
 
     _keyspace = "redwing_keyspace"
     _table = "vectors"
-    # Write log data to the database
-    for i, entry in enumerate(log_data):
-        vector_bytes = struct.pack(f'{len(entry)}f', *entry)
-        write_data = vectordb_pb2.VectorWriteRequest(
-            keyspace=_keyspace,
-            table=_table,           
-            key=f"log_{i}",
-            vector=vector_bytes
-        )
-        stub.Write(write_data)
-
-    # Read and collect log data for analysis
+    # Stream log data to the database in a single StreamWrite call
+    stream_write(
+        stub,
+        ((f"log_{i}", entry) for i, entry in enumerate(log_data)),
+        keyspace=_keyspace,
+        table=_table
+    )
+
+    # Read and collect log data for analysis in batched reads
     collected_logs = []
-    for i in range(len(log_data)):
-        read_data = vectordb_pb2.VectorReadRequest(
-            keyspace=_keyspace,
-            table=_table,                
-            key=f"log_{i}")
-        response = stub.Read(read_data)
+    keys = [f"log_{i}" for i in range(len(log_data))]
+    for response in batch_read(stub, keys, keyspace=_keyspace, table=_table):
         if response.found:
-            vector_list = list(response.vector)
-            log_entry = np.array(vector_list)
+            log_entry = decode_vector(response)
             collected_logs.append(log_entry)
 
     # Anomaly detection using Isolation Forest
@@ -1,53 +1,42 @@
 import grpc
 import vectordb_pb2
 import vectordb_pb2_grpc
-import struct
+from vectordb_client import stream_write
+from vectordb_cache import CachedVectorDBStub
 import numpy as np
-import random
 from sklearn.neighbors import NearestNeighbors
 
 def generate_user_profiles(num_users, num_products):
     """Generate user profiles with product ratings."""
-    user_profiles = []
-    for _ in range(num_users):
-        profile = [random.uniform(0, 5) for _ in range(num_products)]  # 0-5 rating for each product
-        user_profiles.append(profile)
-    return user_profiles
+    return np.random.uniform(0, 5, (num_users, num_products)).astype(np.float32)  # 0-5 rating for each product
 
 def main():
     # Setup gRPC channel and create a stub (client)
+    # Uses the StreamWrite RPCs, which the helloredwing/vector image does not implement
+    # yet (it answers UNIMPLEMENTED): run against server/vectordb_server.py
     channel = grpc.insecure_channel('localhost:50051')
-    stub = vectordb_pb2_grpc.VectorDBStub(channel)
+    # Profiles are looked up repeatedly, so reads go through a client-side cache
+    stub = CachedVectorDBStub(vectordb_pb2_grpc.VectorDBStub(channel))
 
     # Generate user profiles
     user_profiles = generate_user_profiles(100, 20)  # 100 users, 20 products
     _keyspace = "redwing_keyspace"
     _table = "vectors"
-    # Write user profiles to the database
-    for i, profile in enumerate(user_profiles):
-        vector_bytes = struct.pack(f'{len(profile)}f', *profile)
-        write_data = vectordb_pb2.VectorWriteRequest(
-            keyspace=_keyspace,
-            table=_table,     
-            key=f"user_{i}",
-            vector=vector_bytes
-        )
-        response = stub.Write(write_data)
-        print(f"Write operation for user_{i} successful: {response}")
-
-    # Read and collect user profiles for recommendation
+    # Stream user profiles to the database in a single StreamWrite call
+    response = stream_write(
+        stub,
+        ((f"user_{i}", profile) for i, profile in enumerate(user_profiles)),
+        keyspace=_keyspace,
+        table=_table
+    )
+    print(f"Write operation for {response.count} user profiles successful: {response.success}")
+
+    # Read and collect user profiles for recommendation; misses are fetched in batched reads
     collected_profiles = []
-    for i in range(len(user_profiles)):
-        read_data = vectordb_pb2.VectorReadRequest(
-            keyspace=_keyspace,
-            table=_table,     
-            key=f"user_{i}")
-        response = stub.Read(read_data)
-
-        if response.found:
-            # Convert the RepeatedScalarContainer to a list, then to a numpy array
-            vector_list = list(response.vector)
-            profile = np.array(vector_list)
+    keys = [f"user_{i}" for i in range(len(user_profiles))]
+    profiles = stub.read_many(keys, keyspace=_keyspace, table=_table)
+    for i, profile in enumerate(profiles):
+        if profile is not None:
             collected_profiles.append(profile)
         else:
             print(f"No profile found for user_{i}")
@@ -58,12 +47,14 @@ def main():
 
     # Recommend products for a specific user
     user_id = 0  # Example user
-    distances, indices = model.kneighbors([collected_profiles[user_id]])
+    user_profile = stub.read(f"user_{user_id}", keyspace=_keyspace, table=_table)  # Served from the cache
+    distances, indices = model.kneighbors([user_profile])
     recommended_products = set()
     for index in indices[0]:
         if index != user_id:
             recommended_products.update(np.nonzero(collected_profiles[index])[0])
     print(f"Recommended products for user_{user_id}: {recommended_products}")
+    print(f"Profile cache: {stub.stats()}")
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,111 @@
+import threading
+import numpy as np
+
+# Default number of cached queries
+MAX_ENTRIES = 256
+
+# Default cosine distance within which a cached query's matches are reused
+MAX_DISTANCE = 0.1
+
+class SemanticResultCache:
+    """LRU cache of search results keyed on query embeddings.
+
+    `lookup` returns the matches of the closest cached query when it lies
+    within `max_distance` cosine distance of the new embedding, so
+    paraphrases reuse one Search. `lookup_text` catches exact repeats before
+    the query is even embedded. `invalidate` drops everything, e.g. after new
+    documents are written; results computed across an invalidation are not
+    stored. Cached embeddings live in one normalised matrix so a lookup is a
+    single matrix-vector product.
+    """
+
+    def __init__(self, max_entries=MAX_ENTRIES, max_distance=MAX_DISTANCE):
+        self.max_entries = max_entries
+        self.max_distance = max_distance
+        self.lock = threading.Lock()
+        self.generation = 0
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._reset(0)
+
+    def _reset(self, dim):
+        self.vectors = np.zeros((self.max_entries, dim), dtype=np.float32)
+        self.matches = [None] * self.max_entries
+        self.texts = [None] * self.max_entries
+        self.slots = {}  # query text -> slot
+        self.last_used = np.zeros(self.max_entries, dtype=np.int64)
+        self.used = 0
+        self.clock = 0
+
+    def _touch(self, slot):
+        self.clock += 1
+        self.last_used[slot] = self.clock
+        return self.matches[slot]
+
+    def lookup_text(self, query):
+        """Matches cached for exactly this query text, or None (not counted as a miss)."""
+        with self.lock:
+            slot = self.slots.get(query)
+            if slot is None:
+                return None
+            self.exact_hits += 1
+            return self._touch(slot)
+
+    def lookup(self, vector):
+        """Matches of the nearest cached query within max_distance, or None."""
+        vector = np.asarray(vector, dtype=np.float32)
+        with self.lock:
+            if self.used and self.vectors.shape[1] == len(vector):
+                similarities = self.vectors[:self.used] @ (vector / max(np.linalg.norm(vector), 1e-12))
+                best = int(np.argmax(similarities))
+                if 1 - similarities[best] <= self.max_distance:
+                    self.semantic_hits += 1
+                    return self._touch(best)
+            self.misses += 1
+            return None
+
+    def put(self, query, vector, matches, generation=None):
+        """Cache `matches` for a query; skipped if invalidated since `generation` was read."""
+        vector = np.asarray(vector, dtype=np.float32)
+        with self.lock:
+            if generation is not None and generation != self.generation:
+                return
+            if self.vectors.shape[1] != len(vector):
+                self._reset(len(vector))
+            if query in self.slots:
+                slot = self.slots[query]
+            elif self.used < self.max_entries:
+                slot = self.used
+                self.used += 1
+            else:
+                slot = int(np.argmin(self.last_used[:self.used]))
+                del self.slots[self.texts[slot]]
+                self.evictions += 1
+            self.vectors[slot] = vector / max(np.linalg.norm(vector), 1e-12)
+            self.matches[slot] = list(matches)
+            self.texts[slot] = query
+            self.slots[query] = slot
+            self._touch(slot)
+
+    def invalidate(self):
+        """Drop every cached result."""
+        with self.lock:
+            self.generation += 1
+            self._reset(self.vectors.shape[1])
+
+    def stats(self):
+        """Hit, miss and eviction counters with the overall and per-kind hit ratios."""
+        with self.lock:
+            hits = self.exact_hits + self.semantic_hits
+            lookups = hits + self.misses
+            return {
+                "exact_hits": self.exact_hits,
+                "semantic_hits": self.semantic_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": self.used,
+                "hit_ratio": hits / lookups if lookups else 0.0,
+                "semantic_hit_ratio": self.semantic_hits / lookups if lookups else 0.0,
+            }
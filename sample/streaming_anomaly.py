@@ -0,0 +1,130 @@
+import itertools
+from collections import deque
+import numpy as np
+from vectordb_client import stream_write, scan_matrix, search_filter
+
+# Default fraction of entries flagged as anomalous
+CONTAMINATION = 0.05
+
+# Number of recent scores the anomaly threshold is estimated from
+SCORE_HISTORY = 10000
+
+# Number of most recent threats kept for display
+MAX_THREATS = 100
+
+# Timestamps cross the wire with microsecond precision
+WATERMARK_SLACK = 1e-6
+
+class StreamingAnomalyDetector:
+    """Online outlier model updated one window of vectors at a time.
+
+    The mean and covariance of every entry seen so far are kept as running
+    statistics and merged with each new window, so nothing is refitted from
+    scratch. Entries are scored by squared Mahalanobis distance and flagged
+    when they exceed the (1 - contamination) quantile of the last
+    `history` scores. Mean vectors of normal and anomalous entries are
+    maintained as running sums.
+    """
+
+    def __init__(self, dim, contamination=CONTAMINATION, history=SCORE_HISTORY):
+        self.dim = dim
+        self.contamination = contamination
+        self.count = 0
+        self.mean = np.zeros(dim)
+        self.m2 = np.zeros((dim, dim))  # sum of outer products of deviations from the mean
+        self.scores = deque(maxlen=history)
+        self.normal_sum = np.zeros(dim)
+        self.normal_count = 0
+        self.anomalous_sum = np.zeros(dim)
+        self.anomalous_count = 0
+
+    def _merge(self, window):
+        """Fold a window into the running mean/covariance (Chan et al. parallel update)."""
+        count = len(window)
+        mean = window.mean(axis=0)
+        deviations = window - mean
+        delta = mean - self.mean
+        total = self.count + count
+        self.m2 += deviations.T @ deviations + np.outer(delta, delta) * self.count * count / total
+        self.mean += delta * count / total
+        self.count = total
+
+    def update(self, window):
+        """Ingest an (n, dim) window; returns (scores, is_anomaly) for just these entries."""
+        window = np.asarray(window, dtype=np.float64).reshape(-1, self.dim)
+        if not len(window):
+            return np.empty(0), np.empty(0, dtype=bool)
+        self._merge(window)
+        covariance = self.m2 / max(self.count - 1, 1)
+        ridge = 1e-6 * max(np.trace(covariance) / self.dim, 1e-12)
+        precision = np.linalg.pinv(covariance + ridge * np.eye(self.dim))
+        deviations = window - self.mean
+        scores = np.einsum('ij,jk,ik->i', deviations, precision, deviations)
+        self.scores.extend(scores.tolist())
+        threshold = np.quantile(np.fromiter(self.scores, dtype=np.float64), 1 - self.contamination)
+        is_anomaly = scores > threshold
+        self.normal_sum += window[~is_anomaly].sum(axis=0)
+        self.normal_count += int((~is_anomaly).sum())
+        self.anomalous_sum += window[is_anomaly].sum(axis=0)
+        self.anomalous_count += int(is_anomaly.sum())
+        return scores, is_anomaly
+
+    @property
+    def normal_mean(self):
+        return self.normal_sum / max(self.normal_count, 1)
+
+    @property
+    def anomalous_mean(self):
+        return self.anomalous_sum / max(self.anomalous_count, 1)
+
+class StreamingThreatMonitor:
+    """Feeds log vectors written since the last poll into a StreamingAnomalyDetector.
+
+    `poll` Scans only entries whose updated_at is at or after the newest one
+    already seen, so each refresh costs time proportional to the new
+    entries rather than to the whole table. It needs the StreamWrite and
+    Scan RPCs of server/vectordb_server.py.
+    """
+
+    def __init__(self, stub, dim, keyspace="redwing_keyspace", table="vectors", key_prefix="log_",
+                 detector=None, max_threats=MAX_THREATS):
+        self.stub = stub
+        self.dim = dim
+        self.keyspace = keyspace
+        self.table = table
+        self.key_prefix = key_prefix
+        self.detector = detector or StreamingAnomalyDetector(dim)
+        self.threats = deque(maxlen=max_threats)
+        self.watermark = None
+        self.recent = {}  # key -> updated_at of entries already scored near the watermark
+        self.sequence = itertools.count()
+
+    def ingest(self, entries):
+        """Write new log vectors under fresh keys; returns the keys used."""
+        keys = [f"{self.key_prefix}stream_{next(self.sequence)}" for _ in entries]
+        stream_write(self.stub, zip(keys, entries), keyspace=self.keyspace, table=self.table)
+        return keys
+
+    def poll(self):
+        """Score entries written since the last poll; returns their threats as dicts."""
+        since = None if self.watermark is None else self.watermark - WATERMARK_SLACK
+        keys, vectors, _, updated_at = scan_matrix(
+            self.stub,
+            dim=self.dim,
+            keyspace=self.keyspace,
+            table=self.table,
+            filter=search_filter(key_prefix=self.key_prefix, updated_after=since)
+        )
+        # The scan overlaps the previous one by the slack, so skip entries already scored
+        new = np.array([self.recent.get(key) != updated for key, updated in zip(keys, updated_at)], dtype=bool)
+        if len(updated_at):
+            self.watermark = max(updated_at.max(), self.watermark or 0.0)
+            self.recent.update(zip(keys, updated_at.tolist()))
+            self.recent = {key: updated for key, updated in self.recent.items()
+                           if updated >= self.watermark - 2 * WATERMARK_SLACK}
+        keys = [key for key, is_new in zip(keys, new) if is_new]
+        vectors = vectors[new]
+        scores, is_anomaly = self.detector.update(vectors)
+        threats = [{'log_id': keys[i], 'features': vectors[i], 'score': scores[i]} for i in np.flatnonzero(is_anomaly)]
+        self.threats.extend(threats)
+        return threats
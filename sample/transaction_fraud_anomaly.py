@@ -1,33 +1,19 @@
 import grpc
 import vectordb_pb2
 import vectordb_pb2_grpc
-import struct
+from vectordb_client import stream_write, scan_matrix, search_filter
 import numpy as np
 from sklearn.ensemble import IsolationForest
-import random
+from workload import transactions
 
 def generate_transactions(num_normal, num_anomalous):
-    """Generate normal and anomalous transactions."""
-    transactions = []
-
-    # Generate normal transactions
-    for _ in range(num_normal):
-        amount = random.uniform(10, 1000)  # Random transaction amount
-        time = random.uniform(0, 24)       # Time of the transaction
-        location = random.randint(0, 100)  # Location ID (example)
-        transactions.append([amount, time, location])
-
-    # Generate anomalous transactions
-    for _ in range(num_anomalous):
-        amount = random.uniform(5000, 10000)  # Larger amounts for anomalies
-        time = random.uniform(0, 24)
-        location = random.randint(0, 100)
-        transactions.append([amount, time, location])
-
-    return transactions
+    """Generate normal and anomalous [amount, time, location] transactions."""
+    return transactions(num_normal, num_anomalous)
 
 def main():
     # Setup gRPC channel and create a stub (client)
+    # Uses the StreamWrite and Scan RPCs, which the helloredwing/vector image does not implement
+    # yet (it answers UNIMPLEMENTED): run against server/vectordb_server.py
     channel = grpc.insecure_channel('localhost:50051')
     stub = vectordb_pb2_grpc.VectorDBStub(channel)
 
@@ -35,32 +21,23 @@ def main():
     transactions = generate_transactions(50, 5)  # 50 normal and 5 anomalous
     _keyspace = "redwing_keyspace"
     _table = "vectors"
-    # Write transactions to the database
-    for i, transaction in enumerate(transactions):
-        vector_bytes = struct.pack(f'{len(transaction)}f', *transaction)
-        write_data = vectordb_pb2.VectorWriteRequest(
-            keyspace=_keyspace,
-            table=_table,    
-            key=f"transaction_{i}",
-            vector=vector_bytes
-        )
-        response = stub.Write(write_data)
-        print(f"Write operation for transaction_{i} successful: {response}")
-
-    # Read and collect transaction vectors for analysis
-    collected_transactions = []
-    for i in range(len(transactions)):
-        read_data = vectordb_pb2.VectorReadRequest(
-            keyspace=_keyspace,
-            table=_table,  
-            key=f"transaction_{i}")
-        response = stub.Read(read_data)
-
-        if response.found:
-            transaction = response.vector  # Transaction vector
-            collected_transactions.append(transaction)
-        else:
-            print(f"No transaction found for transaction_{i}")
+    # Stream transactions to the database in a single StreamWrite call
+    response = stream_write(
+        stub,
+        ((f"transaction_{i}", transaction) for i, transaction in enumerate(transactions)),
+        keyspace=_keyspace,
+        table=_table
+    )
+    print(f"Write operation for {response.count} transactions successful: {response.success}")
+
+    # Pull every transaction vector back for analysis in one streamed Scan
+    keys, collected_transactions, _, _ = scan_matrix(
+        stub,
+        dim=3,
+        keyspace=_keyspace,
+        table=_table,
+        filter=search_filter(key_prefix="transaction_")
+    )
 
     # Anomaly detection using Isolation Forest
     clf = IsolationForest(contamination=0.1)  # Adjust contamination as needed
@@ -68,9 +45,9 @@ def main():
     scores = clf.decision_function(collected_transactions)
     anomalies = clf.predict(collected_transactions)
 
-    for i, (score, anomaly) in enumerate(zip(scores, anomalies)):
+    for key, score, anomaly in zip(keys, scores, anomalies):
         if anomaly == -1:  # -1 indicates an anomaly
-            print(f"Anomalous transaction detected: Transaction_{i}, Score: {score}")
+            print(f"Anomalous transaction detected: {key}, Score: {score}")
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,174 @@
+import asyncio
+import itertools
+import grpc
+import numpy as np
+import vectordb_pb2
+import vectordb_pb2_grpc
+from vectordb_client import encode_vector, decode_vector, decode_sparse, write_request, search_request, hybrid_search_request
+
+# Default cap on concurrent RPCs sharing the single HTTP/2 connection
+MAX_IN_FLIGHT = 64
+
+class AsyncVectorDBClient:
+    """Asyncio VectorDB client built on grpc.aio with bounded in-flight RPCs.
+
+    Every call acquires a slot from a semaphore of size `max_in_flight`, so any
+    number of coroutines can be started while at most that many requests are
+    outstanding on the channel. `timeout` is passed to gRPC as the per-call
+    deadline; when it expires the RPC is cancelled on both client and server.
+    Dense vectors and queries are packed in `encoding` ("f32", "f16" or "i8").
+    """
+
+    def __init__(self, target='localhost:50051', keyspace="redwing_keyspace", table="vectors",
+                 max_in_flight=MAX_IN_FLIGHT, timeout=None, options=None, encoding="f32"):
+        self.channel = grpc.aio.insecure_channel(target, options=options)
+        self.stub = vectordb_pb2_grpc.VectorDBStub(self.channel)
+        self.keyspace = keyspace
+        self.table = table
+        self.max_in_flight = max_in_flight
+        self.timeout = timeout
+        self.encoding = encoding
+        self._slots = asyncio.Semaphore(max_in_flight)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        await self.channel.close()
+
+    async def _call(self, method, request, timeout=None):
+        async with self._slots:
+            return await method(request, timeout=timeout or self.timeout)
+
+    async def write(self, key, vector, timeout=None):
+        """Write one vector; returns the server's success flag."""
+        request = write_request(key, vector, self.encoding, keyspace=self.keyspace, table=self.table)
+        response = await self._call(self.stub.Write, request, timeout)
+        return response.success
+
+    async def read(self, key, timeout=None):
+        """Read one vector as a float32 array, or None when the key is missing.
+
+        Keys holding only a sparse vector are returned by decode_sparse.
+        """
+        request = vectordb_pb2.VectorReadRequest(keyspace=self.keyspace, table=self.table, key=key, packed=True)
+        response = await self._call(self.stub.Read, request, timeout)
+        if not response.found:
+            return None
+        return decode_vector(response) if response.vector_f32 or response.vector else decode_sparse(response)
+
+    async def search(self, query, top_k=10, metric="cosine", threshold=0.0, timeout=None, filter=None, rescore=0):
+        """Search for the nearest vectors; returns a list of (key, score).
+
+        `filter` is an optional SearchFilter built with search_filter();
+        `rescore` rescores that many candidates at full precision on a
+        quantized table.
+        """
+        request = search_request(query, top_k=top_k, metric=metric, encoding=self.encoding, threshold=threshold,
+                                 keyspace=self.keyspace, table=self.table, filter=filter, rescore=rescore)
+        response = await self._call(self.stub.Search, request, timeout)
+        return [(match.key, match.score) for match in response.matches]
+
+    async def hybrid_search(self, query, sparse_query, top_k=10, fusion="weighted", timeout=None, **kwargs):
+        """Search with a dense and a SparseVector query fused on the server; returns a list of (key, score)."""
+        request = hybrid_search_request(query, sparse_query, top_k, fusion, self.encoding,
+                                        keyspace=self.keyspace, table=self.table, **kwargs)
+        response = await self._call(self.stub.HybridSearch, request, timeout)
+        return [(match.key, match.score) for match in response.matches]
+
+    async def update(self, key, vector, timeout=None):
+        """Replace the vector stored under `key`; returns the success flag.
+
+        A SparseVector replaces the key's sparse vector, as in write().
+        """
+        if isinstance(vector, vectordb_pb2.SparseVector):
+            request = vectordb_pb2.VectorUpdateRequest(keyspace=self.keyspace, table=self.table, key=key, sparse=vector)
+        else:
+            request = vectordb_pb2.VectorUpdateRequest(keyspace=self.keyspace, table=self.table, key=key,
+                                                       **encode_vector(vector, self.encoding))
+        response = await self._call(self.stub.Update, request, timeout)
+        return response.success
+
+    async def delete(self, key, timeout=None):
+        """Delete the vector stored under `key`; returns the success flag."""
+        request = vectordb_pb2.VectorDeleteRequest(keyspace=self.keyspace, table=self.table, key=key)
+        response = await self._call(self.stub.Delete, request, timeout)
+        return response.success
+
+    async def batch_write(self, items, timeout=None):
+        """Write a list of (key, vector) pairs in one BatchWrite call."""
+        request = vectordb_pb2.VectorBatchWriteRequest(
+            keyspace=self.keyspace,
+            table=self.table,
+            vectors=[write_request(key, vector, self.encoding) for key, vector in items]
+        )
+        response = await self._call(self.stub.BatchWrite, request, timeout)
+        return response.success
+
+    async def _gather(self, func, items, deadline):
+        """Run func over items with at most max_in_flight pending, preserving order.
+
+        A fixed set of workers pulls from a shared iterator, so `items` may be
+        a generator: it is consumed only as slots free up, and millions of
+        items do not turn into millions of pending tasks. If `deadline` seconds
+        pass first, every outstanding RPC is cancelled and TimeoutError raised.
+        The first failing call cancels the other workers, so no further items
+        are pulled or sent once its exception is raised.
+        """
+        results = {}
+        pending = enumerate(items)
+
+        async def worker():
+            for index, item in pending:
+                results[index] = await func(item)
+
+        workers = [asyncio.create_task(worker()) for _ in range(self.max_in_flight)]
+        try:
+            await asyncio.wait_for(asyncio.gather(*workers), deadline)
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+        return [results[index] for index in range(len(results))]
+
+    async def write_many(self, items, deadline=None):
+        """Write (key, vector) pairs concurrently; returns success flags in order."""
+        return await self._gather(lambda item: self.write(*item), items, deadline)
+
+    async def read_many(self, keys, deadline=None):
+        """Read keys concurrently; returns arrays (or None) in key order."""
+        return await self._gather(self.read, keys, deadline)
+
+    async def search_many(self, queries, top_k=10, metric="cosine", threshold=0.0, deadline=None):
+        """Run many searches concurrently; returns one match list per query."""
+        return await self._gather(
+            lambda query: self.search(query, top_k=top_k, metric=metric, threshold=threshold),
+            queries,
+            deadline
+        )
+
+    async def batch_write_many(self, items, batch_size=500, deadline=None):
+        """Split (key, vector) pairs into BatchWrite calls and send them concurrently."""
+        items = iter(items)
+        batches = iter(lambda: list(itertools.islice(items, batch_size)), [])
+        return await self._gather(self.batch_write, batches, deadline)
+
+async def main():
+    async with AsyncVectorDBClient() as client:
+        vectors = np.random.rand(1000, 8).astype(np.float32)
+        keys = [f"async_{i}" for i in range(len(vectors))]
+
+        written = await client.write_many(zip(keys, vectors), deadline=30)
+        print(f"Wrote {sum(written)} / {len(keys)} vectors")
+
+        collected = await client.read_many(keys, deadline=30)
+        print(f"Read back {sum(vector is not None for vector in collected)} vectors")
+
+        matches = await client.search(vectors[0], top_k=5)
+        print(f"Nearest neighbours of {keys[0]}: {matches}")
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,236 @@
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+import vectordb_pb2
+from vectordb_client import batch_read, decode_vector, decode_sparse
+
+# Default budget for cached vector payloads
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Requests that leave keyspace/table empty address the server's defaults
+DEFAULT_KEYSPACE = "redwing_keyspace"
+DEFAULT_TABLE = "vectors"
+
+class CachedVectorDBStub:
+    """Read-through cache in front of a VectorDBStub.
+
+    `Read` and the `read`/`read_many` helpers are served from an LRU of
+    float32 arrays bounded by `max_bytes` of vector data; entries older than
+    `ttl` seconds, when set, are refetched. `Write`, `BatchWrite`,
+    `StreamWrite`, `Update` and `Delete` issued through this wrapper
+    invalidate the keys they touch once the server has answered (StreamWrite
+    once the whole stream is acknowledged). A read that misses takes the
+    key's version before its RPC and only caches the result if no
+    invalidation bumped that version meanwhile, so a write racing with the
+    read never leaves the old vector cached. Writes made by other clients
+    are only seen once an entry expires, so set a `ttl` when they matter.
+    Every other RPC is passed straight to the wrapped stub.
+    """
+
+    def __init__(self, stub, max_bytes=CACHE_MAX_BYTES, ttl=None):
+        self.stub = stub
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # (keyspace, table, key) -> (vector, expires_at)
+        self.reading = {}  # (keyspace, table, key) -> [reads in flight, version], while any are
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __getattr__(self, name):
+        return getattr(self.stub, name)
+
+    @staticmethod
+    def _cache_key(keyspace, table, key):
+        return (keyspace or DEFAULT_KEYSPACE, table or DEFAULT_TABLE, key)
+
+    def _get(self, cache_key):
+        with self.lock:
+            entry = self.entries.get(cache_key)
+            if entry is not None and (entry[1] is None or entry[1] > time.monotonic()):
+                self.entries.move_to_end(cache_key)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                self._remove(cache_key)
+            self.misses += 1
+            return None
+
+    def _begin_read(self, cache_key):
+        """Register a read of a missed key; returns the version _put checks."""
+        with self.lock:
+            reading = self.reading.setdefault(cache_key, [0, 0])
+            reading[0] += 1
+            return reading[1]
+
+    def _end_read(self, cache_key):
+        with self.lock:
+            reading = self.reading[cache_key]
+            reading[0] -= 1
+            if not reading[0]:
+                del self.reading[cache_key]
+
+    def _put(self, cache_key, vector, version):
+        """Cache a vector read since _begin_read returned `version`, unless it was invalidated since."""
+        vector = np.array(vector, dtype=np.float32)
+        if vector.nbytes > self.max_bytes:
+            return
+        # Callers share the cached array, so keep it immutable
+        vector.flags.writeable = False
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self.lock:
+            if self.reading[cache_key][1] != version:
+                return
+            self._remove(cache_key)
+            self.entries[cache_key] = (vector, expires_at)
+            self.size_bytes += vector.nbytes
+            while self.size_bytes > self.max_bytes:
+                _, (evicted, _) = self.entries.popitem(last=False)
+                self.size_bytes -= evicted.nbytes
+                self.evictions += 1
+
+    def _remove(self, cache_key):
+        entry = self.entries.pop(cache_key, None)
+        if entry is not None:
+            self.size_bytes -= entry[0].nbytes
+
+    def invalidate(self, keys, keyspace="", table=""):
+        """Drop the cached vectors of `keys` and stop reads in flight from caching them."""
+        self._invalidate_cache_keys([self._cache_key(keyspace, table, key) for key in keys])
+
+    def _invalidate_cache_keys(self, cache_keys):
+        with self.lock:
+            for cache_key in cache_keys:
+                self._remove(cache_key)
+                if cache_key in self.reading:
+                    self.reading[cache_key][1] += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size_bytes = 0
+            for reading in self.reading.values():
+                reading[1] += 1
+
+    def stats(self):
+        """Hit/miss/eviction counters plus the current entry count and size."""
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "entries": len(self.entries),
+                "bytes": self.size_bytes,
+            }
+
+    def read(self, key, keyspace=DEFAULT_KEYSPACE, table=DEFAULT_TABLE, timeout=None):
+        """Return the vector stored under `key` as a float32 array, or None.
+
+        Keys holding only a sparse vector are returned by decode_sparse.
+        Keys with a sparse vector are not cached, so Read never drops it.
+        """
+        cache_key = self._cache_key(keyspace, table, key)
+        vector = self._get(cache_key)
+        if vector is not None:
+            return vector
+        version = self._begin_read(cache_key)
+        try:
+            request = vectordb_pb2.VectorReadRequest(keyspace=keyspace, table=table, key=key, packed=True)
+            response = self.stub.Read(request, timeout=timeout)
+            if not response.found:
+                return None
+            if not (response.vector_f32 or response.vector):
+                return decode_sparse(response)
+            vector = decode_vector(response)
+            if not response.HasField('sparse'):
+                self._put(cache_key, vector, version)
+            return vector
+        finally:
+            self._end_read(cache_key)
+
+    def read_many(self, keys, keyspace=DEFAULT_KEYSPACE, table=DEFAULT_TABLE, timeout=None):
+        """Return vectors (or None) for `keys`, fetching all misses in batched reads."""
+        keys = list(keys)
+        vectors = [self._get(self._cache_key(keyspace, table, key)) for key in keys]
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        cache_keys = [self._cache_key(keyspace, table, keys[i]) for i in missing]
+        versions = [self._begin_read(cache_key) for cache_key in cache_keys]
+        try:
+            responses = batch_read(self.stub, [keys[i] for i in missing], keyspace=keyspace, table=table,
+                                   timeout=timeout)
+            for i, cache_key, version, response in zip(missing, cache_keys, versions, responses):
+                if response.found and not (response.vector_f32 or response.vector):
+                    vectors[i] = decode_sparse(response)
+                elif response.found:
+                    vectors[i] = decode_vector(response)
+                    if not response.HasField('sparse'):
+                        self._put(cache_key, vectors[i], version)
+        finally:
+            for cache_key in cache_keys:
+                self._end_read(cache_key)
+        return vectors
+
+    def Read(self, request, *args, **kwargs):
+        cache_key = self._cache_key(request.keyspace, request.table, request.key)
+        vector = self._get(cache_key)
+        if vector is None:
+            version = self._begin_read(cache_key)
+            try:
+                response = self.stub.Read(request, *args, **kwargs)
+                if response.found and not response.HasField('sparse'):
+                    self._put(cache_key, decode_vector(response), version)
+            finally:
+                self._end_read(cache_key)
+            return response
+        if request.packed:
+            return vectordb_pb2.VectorReadResponse(found=True, vector_f32=vector.astype('<f4').tobytes(), dim=len(vector))
+        return vectordb_pb2.VectorReadResponse(found=True, vector=vector)
+
+    def Write(self, request, *args, **kwargs):
+        try:
+            return self.stub.Write(request, *args, **kwargs)
+        finally:
+            self.invalidate([request.key], request.keyspace, request.table)
+
+    def Update(self, request, *args, **kwargs):
+        try:
+            return self.stub.Update(request, *args, **kwargs)
+        finally:
+            self.invalidate([request.key], request.keyspace, request.table)
+
+    def Delete(self, request, *args, **kwargs):
+        try:
+            return self.stub.Delete(request, *args, **kwargs)
+        finally:
+            self.invalidate([request.key], request.keyspace, request.table)
+
+    def _invalidate_batch(self, request):
+        for vector in request.vectors:
+            self.invalidate([vector.key], request.keyspace or vector.keyspace, request.table or vector.table)
+
+    def BatchWrite(self, request, *args, **kwargs):
+        try:
+            return self.stub.BatchWrite(request, *args, **kwargs)
+        finally:
+            self._invalidate_batch(request)
+
+    def StreamWrite(self, request_iterator, *args, **kwargs):
+        # The server applies chunks as they arrive and answers once at the end, so the
+        # keys sent are invalidated after that answer, or the failure, like Write
+        sent = []
+
+        def recording():
+            for request in request_iterator:
+                sent.extend(self._cache_key(request.keyspace or vector.keyspace, request.table or vector.table,
+                                            vector.key) for vector in request.vectors)
+                yield request
+
+        try:
+            return self.stub.StreamWrite(recording(), *args, **kwargs)
+        finally:
+            self._invalidate_cache_keys(sent)
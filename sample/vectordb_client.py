@@ -0,0 +1,301 @@
+import itertools
+import grpc
+import numpy as np
+import vectordb_pb2
+from google.protobuf.timestamp_pb2 import Timestamp
+
+# Default number of vectors sent per StreamWrite chunk
+STREAM_CHUNK_SIZE = 500
+
+# Default number of keys requested per BatchRead call
+BATCH_READ_CHUNK_SIZE = 1000
+
+# Default number of query vectors sent per BatchSearch call
+BATCH_SEARCH_CHUNK_SIZE = 1000
+
+# Wire dtype of the packed vector_f32 / query_f32 fields
+VECTOR_DTYPE = np.dtype('<f4')
+
+# Wire dtypes of the packed *_f16 and *_i8 fields
+F16_DTYPE = np.dtype('<f2')
+I8_DTYPE = np.dtype('i1')
+
+# Dense vector wire encodings: "f16" halves and "i8" quarters the bytes of
+# "f32"; int8 codes travel with one float scale per vector
+ENCODINGS = ("f32", "f16", "i8")
+
+# Largest int8 code; a vector's scale maps its largest magnitude to it
+I8_MAX = 127
+
+# Wire dtype of the packed Scan timestamps (epoch seconds)
+TIMESTAMP_DTYPE = np.dtype('<f8')
+
+# Times a broken Scan stream is reopened from its last cursor
+SCAN_RETRIES = 3
+
+def pack_vector(vector):
+    """Encode a vector as little-endian float32 bytes, returning (bytes, dim)."""
+    array = np.ascontiguousarray(vector, dtype=VECTOR_DTYPE)
+    return array.tobytes(), array.shape[-1]
+
+def quantize_i8(vectors):
+    """Symmetric int8 codes of each row of `vectors` and its scale, so row ~= scale * codes.
+
+    Returns (codes, scales); all-zero rows get scale 1.
+    """
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    peaks = np.abs(vectors).max(axis=1)
+    scales = np.where(peaks > 0, peaks / I8_MAX, 1).astype(np.float32)
+    codes = np.clip(np.rint(vectors / scales[:, None]), -I8_MAX, I8_MAX).astype(I8_DTYPE)
+    return codes, scales
+
+def encode_vector(vector, encoding="f32", prefix="vector"):
+    """Pack a vector in a wire encoding; returns the request fields as keyword arguments.
+
+    `prefix` names the fields: "vector" for write and update requests
+    (vector_f16, vector_scale, ...) and "query" for search requests.
+    """
+    if encoding == "f32":
+        data, dim = pack_vector(vector)
+        return {f"{prefix}_f32": data, "dim": dim}
+    array = np.asarray(vector, dtype=np.float32)
+    if encoding == "f16":
+        return {f"{prefix}_f16": array.astype(F16_DTYPE).tobytes(), "dim": array.shape[-1]}
+    if encoding == "i8":
+        codes, scales = quantize_i8(array)
+        return {f"{prefix}_i8": codes.tobytes(), f"{prefix}_scale": float(scales[0]), "dim": array.shape[-1]}
+    raise ValueError(f"unknown encoding {encoding!r}, expected one of {ENCODINGS}")
+
+def decode_vector(message):
+    """Return the vector of a response as a float32 array.
+
+    Packed `vector_f32` payloads are wrapped with np.frombuffer without copying
+    or creating Python floats; responses using `repeated float` are converted.
+    """
+    if message.vector_f32:
+        return np.frombuffer(message.vector_f32, dtype=VECTOR_DTYPE)
+    return np.array(message.vector, dtype=np.float32)
+
+def sparse_vector(indices, values, dim=0):
+    """Build a SparseVector from parallel index/value sequences."""
+    return vectordb_pb2.SparseVector(indices=np.asarray(indices, dtype=np.uint32),
+                                     values=np.asarray(values, dtype=np.float32), dim=dim)
+
+def sparse_rows(matrix):
+    """Yield one SparseVector per row of a CSR matrix (e.g. TfidfVectorizer output).
+
+    Only the indptr/indices/data arrays are read, so the matrix is never
+    densified.
+    """
+    indptr, indices, data = matrix.indptr, matrix.indices, matrix.data.astype(np.float32, copy=False)
+    dim = matrix.shape[1]
+    for row in range(matrix.shape[0]):
+        start, stop = indptr[row], indptr[row + 1]
+        yield vectordb_pb2.SparseVector(indices=indices[start:stop], values=data[start:stop], dim=dim)
+
+def decode_sparse(message):
+    """Return the sparse vector of a response as (int64 indices, float32 values, dim)."""
+    sparse = message.sparse
+    return np.array(sparse.indices, dtype=np.int64), np.array(sparse.values, dtype=np.float32), sparse.dim
+
+def write_request(key, vector, encoding="f32", **kwargs):
+    """Build a VectorWriteRequest carrying the vector packed in `encoding` (see ENCODINGS).
+
+    A SparseVector is sent as is in the `sparse` field.
+    """
+    if isinstance(vector, vectordb_pb2.SparseVector):
+        return vectordb_pb2.VectorWriteRequest(key=key, sparse=vector, **kwargs)
+    return vectordb_pb2.VectorWriteRequest(key=key, **encode_vector(vector, encoding), **kwargs)
+
+def search_request(query, top_k=10, metric="cosine", encoding="f32", **kwargs):
+    """Build a VectorSearchRequest carrying the query packed in `encoding` (see ENCODINGS).
+
+    A SparseVector query is sent in `sparse_query` and searches the table's
+    sparse vectors. Pass `rescore` to rescore that many candidates at full
+    precision on a quantized table.
+    """
+    if isinstance(query, vectordb_pb2.SparseVector):
+        return vectordb_pb2.VectorSearchRequest(sparse_query=query, top_k=top_k, metric=metric, **kwargs)
+    return vectordb_pb2.VectorSearchRequest(**encode_vector(query, encoding, "query"), top_k=top_k, metric=metric,
+                                            **kwargs)
+
+def hybrid_search_request(query, sparse_query, top_k=10, fusion="weighted", encoding="f32", **kwargs):
+    """Build a HybridSearchRequest from a dense query and a SparseVector query.
+
+    The dense query is packed in `encoding`. Keyword arguments set the
+    remaining fields, e.g. dense_weight, sparse_weight, rrf_k, candidates,
+    keyspace, table or filter.
+    """
+    return vectordb_pb2.HybridSearchRequest(**encode_vector(query, encoding, "query"), sparse_query=sparse_query,
+                                            top_k=top_k, fusion=fusion, **kwargs)
+
+def hybrid_search(stub, query, sparse_query, top_k=10, fusion="weighted", keyspace="redwing_keyspace",
+                  table="vectors", timeout=None, **kwargs):
+    """Search with a dense and a sparse query in one HybridSearch call; returns a list of (key, score).
+
+    The server fuses both candidate lists, by weighted score ("weighted") or
+    reciprocal rank ("rrf"), so no over-fetching or client-side merge is
+    needed. See hybrid_search_request for the keyword arguments.
+    """
+    request = hybrid_search_request(query, sparse_query, top_k, fusion, keyspace=keyspace, table=table, **kwargs)
+    return [(match.key, match.score) for match in stub.HybridSearch(request, timeout=timeout).matches]
+
+def _timestamp(value):
+    """Convert a datetime or epoch seconds to a Timestamp."""
+    timestamp = Timestamp()
+    if hasattr(value, 'timestamp'):
+        timestamp.FromDatetime(value)
+    else:
+        timestamp.FromMicroseconds(int(value * 1e6))
+    return timestamp
+
+def search_filter(key_prefix="", created_after=None, created_before=None,
+                  updated_after=None, updated_before=None, **attributes):
+    """Build a SearchFilter; bounds are datetimes or epoch seconds.
+
+    Keyword arguments beyond the named ones are attribute equality matches,
+    e.g. search_filter(key_prefix="log_", severity="high").
+    """
+    bounds = {name: _timestamp(value) for name, value in (
+        ('created_after', created_after), ('created_before', created_before),
+        ('updated_after', updated_after), ('updated_before', updated_before)) if value is not None}
+    return vectordb_pb2.SearchFilter(key_prefix=key_prefix, attributes=attributes, **bounds)
+
+def _write_chunks(items, keyspace, table, chunk_size, encoding="f32"):
+    """Lazily group (key, vector) pairs into VectorBatchWriteRequest chunks."""
+    iterator = iter(items)
+    while True:
+        chunk = list(itertools.islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield vectordb_pb2.VectorBatchWriteRequest(
+            keyspace=keyspace,
+            table=table,
+            vectors=[write_request(key, vector, encoding) for key, vector in chunk]
+        )
+
+def stream_write(stub, items, keyspace="redwing_keyspace", table="vectors",
+                 chunk_size=STREAM_CHUNK_SIZE, timeout=None, encoding="f32"):
+    """Stream any iterable of (key, vector) pairs to the server in one StreamWrite call.
+
+    Chunks are built only when gRPC pulls the next message off the request
+    iterator, so HTTP/2 flow control bounds how much is held in memory and the
+    input can be a generator over tens of millions of vectors. Dense vectors
+    are packed in `encoding`; "f16" or "i8" cut the bytes on the wire.
+    Returns the VectorStreamWriteResponse with per-chunk acks and the total count.
+    """
+    return stub.StreamWrite(_write_chunks(items, keyspace, table, chunk_size, encoding), timeout=timeout)
+
+def batch_read(stub, keys, keyspace="redwing_keyspace", table="vectors",
+               chunk_size=BATCH_READ_CHUNK_SIZE, packed=True, timeout=None):
+    """Read many keys with BatchRead, splitting large key lists into chunks.
+
+    Returns one VectorReadResponse per key in the same order as `keys`;
+    missing keys come back with found set to False. Use decode_vector to
+    turn each result into a float32 array.
+    """
+    keys = list(keys)
+    results = []
+    for start in range(0, len(keys), chunk_size):
+        request = vectordb_pb2.VectorBatchReadRequest(
+            keyspace=keyspace,
+            table=table,
+            keys=keys[start:start + chunk_size],
+            packed=packed
+        )
+        results.extend(stub.BatchRead(request, timeout=timeout).results)
+    return results
+
+def batch_search(stub, queries, top_k=10, metric="cosine", threshold=0.0,
+                 keyspace="redwing_keyspace", table="vectors",
+                 chunk_size=BATCH_SEARCH_CHUNK_SIZE, timeout=None, filter=None, encoding="f32", rescore=0):
+    """Search many query vectors with BatchSearch, one call per chunk of queries.
+
+    `queries` is an (N, dim) matrix; it is sent packed in `encoding` so the
+    server can score the whole chunk as one matrix operation. A list of
+    SparseVectors searches the table's sparse vectors instead. `filter` is an
+    optional SearchFilter from search_filter(); `rescore` rescores that many
+    candidates per query at full precision on a quantized table. Returns N
+    lists of (key, score).
+    """
+    if encoding not in ENCODINGS:
+        raise ValueError(f"unknown encoding {encoding!r}, expected one of {ENCODINGS}")
+    if len(queries) == 0:
+        return []
+    sparse = isinstance(queries, (list, tuple)) and isinstance(queries[0], vectordb_pb2.SparseVector)
+    if not sparse:
+        queries = np.ascontiguousarray(np.atleast_2d(queries), dtype=VECTOR_DTYPE)
+    matches = []
+    for start in range(0, len(queries), chunk_size):
+        chunk = queries[start:start + chunk_size]
+        if sparse:
+            payload = {'sparse_queries': chunk}
+        elif encoding == "i8":
+            codes, scales = quantize_i8(chunk)
+            payload = {'queries_i8': codes.tobytes(), 'query_scales': scales, 'dim': queries.shape[1]}
+        elif encoding == "f16":
+            payload = {'queries_f16': chunk.astype(F16_DTYPE).tobytes(), 'dim': queries.shape[1]}
+        else:
+            payload = {'queries_f32': chunk.tobytes(), 'dim': queries.shape[1]}
+        request = vectordb_pb2.VectorBatchSearchRequest(
+            **payload,
+            top_k=top_k,
+            metric=metric,
+            threshold=threshold,
+            keyspace=keyspace,
+            table=table,
+            filter=filter,
+            rescore=rescore
+        )
+        response = stub.BatchSearch(request, timeout=timeout)
+        matches.extend([(match.key, match.score) for match in result.matches] for result in response.results)
+    return matches
+
+def scan(stub, keyspace="redwing_keyspace", table="vectors", dim=0, cursor="",
+         max_bytes=0, filter=None, retries=SCAN_RETRIES, timeout=None):
+    """Yield the VectorScanChunk messages of a Scan over a whole table.
+
+    If the stream breaks with UNAVAILABLE it is reopened from the cursor of
+    the last chunk received, up to `retries` times, so no chunk is lost or
+    repeated. `filter` is an optional SearchFilter from search_filter().
+    """
+    while True:
+        request = vectordb_pb2.VectorScanRequest(keyspace=keyspace, table=table, dim=dim, cursor=cursor,
+                                                 max_bytes=max_bytes, filter=filter)
+        try:
+            for chunk in stub.Scan(request, timeout=timeout):
+                cursor = chunk.cursor
+                yield chunk
+            return
+        except grpc.RpcError as error:
+            if error.code() != grpc.StatusCode.UNAVAILABLE or retries <= 0:
+                raise
+            retries -= 1
+
+def scan_matrix(stub, dim, keyspace="redwing_keyspace", table="vectors", **kwargs):
+    """Pull every vector of dimension `dim` in a table into one float32 matrix.
+
+    The matrix is preallocated from the row count announced with the first
+    chunk and each chunk is copied straight into it from the packed payload.
+    Extra keyword arguments go to scan(). Returns (keys, vectors, created_at,
+    updated_at) with timestamps as float64 epoch seconds.
+    """
+    keys = []
+    vectors = np.empty((0, dim), dtype=np.float32)
+    created_at = np.empty(0, dtype=np.float64)
+    updated_at = np.empty(0, dtype=np.float64)
+    filled = 0
+    for chunk in scan(stub, keyspace, table, dim=dim, **kwargs):
+        count = len(chunk.keys)
+        if filled + count > len(vectors):
+            # Rows written while the scan runs can exceed the announced total
+            capacity = max(filled + count, chunk.total, 2 * len(vectors))
+            vectors = np.resize(vectors, (capacity, dim))
+            created_at = np.resize(created_at, capacity)
+            updated_at = np.resize(updated_at, capacity)
+        vectors[filled:filled + count] = np.frombuffer(chunk.vectors_f32, dtype=VECTOR_DTYPE).reshape(count, dim)
+        created_at[filled:filled + count] = np.frombuffer(chunk.created_at_f64, dtype=TIMESTAMP_DTYPE)
+        updated_at[filled:filled + count] = np.frombuffer(chunk.updated_at_f64, dtype=TIMESTAMP_DTYPE)
+        keys.extend(chunk.keys)
+        filled += count
+    return keys, vectors[:filled], created_at[:filled], updated_at[:filled]
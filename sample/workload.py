@@ -0,0 +1,81 @@
+import numpy as np
+
+# Distributions accepted by vectors()
+DISTRIBUTIONS = ("normal", "uniform", "clustered", "unit")
+
+# Rows generated per block by vector_chunks
+CHUNK_SIZE = 100000
+
+def vectors(count, dim, distribution="normal", clusters=16, spread=0.1, rng=None):
+    """Generate a (count, dim) float32 matrix in one vectorized call.
+
+    - normal: standard normal entries
+    - uniform: entries uniform in [0, 1)
+    - clustered: a Gaussian mixture of `clusters` centres with `spread` noise,
+      closer to real embeddings, where neighbours are meaningful
+    - unit: standard normal rows scaled to unit length
+    """
+    rng = rng or np.random.default_rng()
+    if distribution == "normal":
+        return rng.standard_normal((count, dim), dtype=np.float32)
+    if distribution == "uniform":
+        return rng.random((count, dim), dtype=np.float32)
+    if distribution == "clustered":
+        centres = rng.standard_normal((clusters, dim), dtype=np.float32)
+        noise = rng.standard_normal((count, dim), dtype=np.float32)
+        return centres[rng.integers(0, clusters, count)] + spread * noise
+    if distribution == "unit":
+        matrix = rng.standard_normal((count, dim), dtype=np.float32)
+        return matrix / np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+    raise ValueError(f"unknown distribution {distribution!r}, expected one of {DISTRIBUTIONS}")
+
+def inject_anomalies(matrix, fraction, scale=10.0, rng=None):
+    """Push a random `fraction` of rows far from the bulk of the data, in place.
+
+    Anomalous rows are shifted by `scale` column standard deviations in a
+    random direction. Returns a boolean mask of the rows changed.
+    """
+    rng = rng or np.random.default_rng()
+    is_anomaly = rng.random(len(matrix)) < fraction
+    count = int(is_anomaly.sum())
+    directions = rng.standard_normal((count, matrix.shape[1])).astype(matrix.dtype)
+    directions /= np.maximum(np.linalg.norm(directions, axis=1, keepdims=True), 1e-12)
+    matrix[is_anomaly] += scale * directions * matrix.std(axis=0)
+    return is_anomaly
+
+def keys(count, prefix="vec_", start=0):
+    """Keys prefix+start .. prefix+(start + count - 1)."""
+    return [f"{prefix}{i}" for i in range(start, start + count)]
+
+def vector_chunks(count, dim, chunk_size=CHUNK_SIZE, prefix="vec_", rng=None, **kwargs):
+    """Lazily yield (keys, matrix) blocks totalling `count` rows.
+
+    Suitable for feeding tens of millions of vectors into stream_write
+    without materialising them all; extra arguments go to vectors().
+    """
+    rng = rng or np.random.default_rng()
+    for start in range(0, count, chunk_size):
+        size = min(chunk_size, count - start)
+        yield keys(size, prefix, start), vectors(size, dim, rng=rng, **kwargs)
+
+def log_features(count, rng=None):
+    """Simulated network logs: request_size, response_time, error_code, ip_address,
+    url_endpoint, http_method, user_agent and failed_logins, as float32 rows."""
+    rng = rng or np.random.default_rng()
+    return np.column_stack([
+        rng.uniform(100, 10000, count),  # Size of request
+        rng.uniform(0, 5, count),        # Response time in seconds
+        rng.integers(0, 2, count),       # 0 for normal, 1 for error
+        rng.integers(0, 256, count),     # Simulated IP address part
+        rng.integers(0, 4, count),       # Index into /login, /api, /home, /user
+        rng.integers(0, 4, count),       # Index into GET, POST, PUT, DELETE
+        rng.integers(0, 3, count),       # Index into browser, mobile, bot
+        rng.integers(0, 6, count),       # Failed login attempts
+    ]).astype(np.float32)
+
+def transactions(num_normal, num_anomalous, rng=None):
+    """[amount, time, location] rows; anomalous transactions have far larger amounts."""
+    rng = rng or np.random.default_rng()
+    count = num_normal + num_anomalous
+    amounts = np.concatenate([rng.uniform(10, 1000, num_normal), rng.uniform(5000, 10000, num_anomalous)])
+    return np.column_stack([amounts, rng.uniform(0, 24, count), rng.integers(0, 101, count)]).astype(np.float32)
@@ -0,0 +1,32 @@
+import numpy as np
+
+# Distances shared by the ANN indexes. Lower is closer for every metric:
+#   cosine    -> 1 - cosine similarity (queries are normalised first)
+#   euclidean -> squared L2 distance
+#   dot       -> negated inner product
+
+def prepare_query(metric, vector):
+    """Normalise for cosine so distances reduce to a dot product with stored rows."""
+    vector = np.asarray(vector, dtype=np.float32)
+    if metric == "cosine":
+        return vector / max(np.linalg.norm(vector), 1e-12)
+    return vector
+
+def distances(segment, metric, query, rows):
+    """Exact distances from a prepared query to the given segment rows."""
+    vectors = segment.decode(rows)
+    if metric == "euclidean":
+        diff = vectors - query
+        return np.einsum('ij,ij->i', diff, diff)
+    dots = vectors @ query
+    if metric == "dot":
+        return -dots
+    return 1 - dots / np.maximum(segment.norms[rows], 1e-12)
+
+def to_scores(metric, distances):
+    """Convert distances to the higher-is-better scores used by Segment.scores."""
+    if metric == "euclidean":
+        return -np.sqrt(np.maximum(distances, 0))
+    if metric == "dot":
+        return -distances
+    return 1 - distances
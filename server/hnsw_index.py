@@ -0,0 +1,151 @@
+import heapq
+import math
+import numpy as np
+from distances import prepare_query, distances, to_scores
+
+class HNSWIndex:
+    """Hierarchical Navigable Small World graph over the rows of a Segment.
+
+    The graph is built incrementally as rows are appended and reads vectors
+    straight from the segment's matrix. Deleted rows stay in the graph as
+    tombstones so it remains navigable, but are never returned.
+
+    M is the number of links per node (2 * M on the bottom layer),
+    ef_construction the beam width while inserting and ef_search the beam
+    width while querying. The graph is built for a single metric; searches
+    with another metric fall back to a brute-force scan.
+
+    This is a pure-Python reference implementation: inserts take milliseconds
+    each and run under the table's write lock, so bulk loads block readers.
+    """
+
+    # The graph can answer queries from the first insert onwards
+    ready = True
+
+    def __init__(self, segment, metric="cosine", M=16, ef_construction=200, ef_search=64, seed=0):
+        self.segment = segment
+        self.metric = metric
+        self.M = int(M)
+        self.max_links_0 = 2 * self.M
+        self.ef_construction = int(ef_construction)
+        self.ef_search = int(ef_search)
+        self.level_mult = 1 / math.log(max(self.M, 2))
+        self.rng = np.random.default_rng(seed)
+        self.links = []  # row -> list of neighbour lists, one per level
+        self.entry = None
+        self.max_level = -1
+
+    def _prepare(self, vector):
+        return prepare_query(self.metric, vector)
+
+    def _distances(self, query, rows):
+        return distances(self.segment, self.metric, query, rows)
+
+    def scores(self, distances):
+        return to_scores(self.metric, distances)
+
+    def _search_layer(self, query, entry_points, ef, level):
+        """Beam search on one layer; returns up to ef (distance, row) pairs, closest first."""
+        visited = set(entry_points)
+        distances = self._distances(query, np.array(entry_points))
+        candidates = list(zip(distances.tolist(), entry_points))
+        heapq.heapify(candidates)
+        results = [(-distance, row) for distance, row in candidates]
+        heapq.heapify(results)
+        while len(results) > ef:
+            heapq.heappop(results)
+        while candidates:
+            distance, row = heapq.heappop(candidates)
+            if distance > -results[0][0]:
+                break
+            neighbours = [n for n in self.links[row][level] if n not in visited]
+            if not neighbours:
+                continue
+            visited.update(neighbours)
+            for neighbour_distance, neighbour in zip(self._distances(query, np.array(neighbours)).tolist(), neighbours):
+                if len(results) < ef or neighbour_distance < -results[0][0]:
+                    heapq.heappush(candidates, (neighbour_distance, neighbour))
+                    heapq.heappush(results, (-neighbour_distance, neighbour))
+                    if len(results) > ef:
+                        heapq.heappop(results)
+        return sorted((-distance, row) for distance, row in results)
+
+    def _select_neighbours(self, candidates, count):
+        """Neighbour selection heuristic: keep a candidate only if it is closer to
+        the base node than to every neighbour already selected."""
+        selected = []
+        for distance, row in candidates:
+            if len(selected) >= count:
+                break
+            if selected:
+                to_selected = self._distances(self._prepare(self.segment.decode(row)), np.array(selected))
+                if (to_selected < distance).any():
+                    continue
+            selected.append(row)
+        return selected
+
+    def _random_level(self):
+        return int(-math.log(1 - self.rng.random()) * self.level_mult)
+
+    def add(self, rows):
+        """Insert newly appended segment rows into the graph."""
+        for row in rows:
+            self._insert(int(row))
+
+    def _insert(self, row):
+        level = self._random_level()
+        while len(self.links) <= row:
+            self.links.append(None)
+        self.links[row] = [[] for _ in range(level + 1)]
+        if self.entry is None:
+            self.entry = row
+            self.max_level = level
+            return
+
+        query = self._prepare(self.segment.decode(row))
+        entry_points = [self.entry]
+        for current in range(self.max_level, level, -1):
+            entry_points = [self._search_layer(query, entry_points, 1, current)[0][1]]
+
+        for current in range(min(level, self.max_level), -1, -1):
+            candidates = self._search_layer(query, entry_points, self.ef_construction, current)
+            neighbours = self._select_neighbours(candidates, self.M)
+            self.links[row][current] = neighbours
+            max_links = self.max_links_0 if current == 0 else self.M
+            for neighbour in neighbours:
+                links = self.links[neighbour][current]
+                links.append(row)
+                if len(links) > max_links:
+                    base = self._prepare(self.segment.decode(neighbour))
+                    ordered = sorted(zip(self._distances(base, np.array(links)).tolist(), links))
+                    self.links[neighbour][current] = self._select_neighbours(ordered, max_links)
+            entry_points = [candidate for _, candidate in candidates]
+
+        if level > self.max_level:
+            self.max_level = level
+            self.entry = row
+
+    def search(self, query, top_k, allowed=None):
+        """Approximate top_k live rows for one query; returns (rows, distances).
+
+        `allowed` is an optional boolean mask over segment rows (defaults to
+        the live rows). If tombstones or filtered-out rows crowd allowed rows
+        out of the beam, the search is retried with a wider beam.
+        """
+        if self.entry is None:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        query = self._prepare(query)
+        entry_points = [self.entry]
+        for current in range(self.max_level, 0, -1):
+            entry_points = [self._search_layer(query, entry_points, 1, current)[0][1]]
+
+        allowed = self.segment.live if allowed is None else allowed
+        ef = max(self.ef_search, top_k)
+        while True:
+            found = self._search_layer(query, entry_points, ef, 0)
+            live = [(distance, row) for distance, row in found if allowed[row]]
+            if len(live) >= top_k or len(found) < ef or ef >= self.segment.size:
+                break
+            ef *= 2
+        live = live[:top_k]
+        return np.array([row for _, row in live], dtype=np.int64), np.array([distance for distance, _ in live])
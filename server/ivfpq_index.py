@@ -0,0 +1,193 @@
+import numpy as np
+from distances import prepare_query, distances, to_scores
+
+def kmeans(data, k, iterations=20, rng=None):
+    """Lloyd's k-means on float32 rows; returns a (k, dim) centroid matrix.
+
+    Centroids left without members are re-seeded from random rows so every
+    code stays in use.
+    """
+    rng = rng or np.random.default_rng(0)
+    k = min(k, len(data))
+    centroids = data[rng.choice(len(data), k, replace=False)].copy()
+    for _ in range(iterations):
+        assignments = nearest(data, centroids)
+        counts = np.bincount(assignments, minlength=k)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, data)
+        empty = counts == 0
+        centroids[~empty] = sums[~empty] / counts[~empty, None]
+        if empty.any():
+            centroids[empty] = data[rng.choice(len(data), int(empty.sum()), replace=False)]
+    return centroids
+
+def nearest(data, centroids, block=4096):
+    """Index of the nearest centroid (squared L2) for every row of data."""
+    centroid_norms = (centroids * centroids).sum(axis=1)
+    result = np.empty(len(data), dtype=np.int64)
+    for start in range(0, len(data), block):
+        chunk = data[start:start + block]
+        result[start:start + block] = np.argmin(centroid_norms - 2 * chunk @ centroids.T, axis=1)
+    return result
+
+class IVFPQIndex:
+    """Inverted file with product-quantised residuals over the rows of a Segment.
+
+    A coarse k-means quantizer splits the rows into `nlist` inverted lists and
+    each row's residual to its list centroid is compressed to `m` one-byte
+    codes (2 ** nbits centroids per sub-space), so a row costs m bytes instead
+    of 4 * dim. A query scans the `nprobe` closest lists with table lookups,
+    then re-ranks the best `rerank * top_k` candidates exactly against the
+    segment's full-precision vectors.
+
+    Quantizers are trained once, on a sample of `train_size` rows, when the
+    segment first holds that many; until then `ready` is False and searches
+    fall back to the brute-force scan. Cosine indexes quantize normalised
+    vectors. Searches with another metric also use the brute-force scan.
+    """
+
+    def __init__(self, segment, metric="cosine", nlist=256, nprobe=8, m=8, nbits=8,
+                 train_size=20000, rerank=8, seed=0):
+        if nbits > 8:
+            raise ValueError("nbits must be at most 8 so codes fit in one byte")
+        self.segment = segment
+        self.metric = metric
+        self.nlist = int(nlist)
+        self.nprobe = int(nprobe)
+        self.m = int(m)
+        self.ksub = 1 << int(nbits)
+        self.train_size = int(train_size)
+        self.rerank = int(rerank)
+        self.rng = np.random.default_rng(seed)
+        # Pad vectors with zeros so they split evenly into m sub-spaces;
+        # padding changes neither distances nor inner products.
+        self.dsub = -(-segment.dim // self.m)
+        self.ready = False
+        self.coarse = None     # (nlist, dim) list centroids
+        self.codebooks = None  # (m, ksub, dsub) sub-space centroids
+        self.list_rows = []    # per list: row ids
+        self.list_codes = []   # per list: (rows, m) uint8 codes
+        self.list_sizes = None
+
+    def scores(self, distances):
+        return to_scores(self.metric, distances)
+
+    def _prepare(self, vectors):
+        """Normalise rows for cosine and zero-pad them to m * dsub columns."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if self.metric == "cosine":
+            vectors = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        padding = self.m * self.dsub - vectors.shape[1]
+        if padding:
+            vectors = np.pad(vectors, ((0, 0), (0, padding)))
+        return vectors
+
+    def _assign(self, vectors):
+        """Inverted list per row: nearest centroid, or best inner product for dot."""
+        if self.metric == "dot":
+            return np.argmax(vectors @ self.coarse.T, axis=1)
+        return nearest(vectors, self.coarse)
+
+    def _encode(self, residuals):
+        sub = residuals.reshape(len(residuals), self.m, self.dsub)
+        codes = np.empty((len(residuals), self.m), dtype=np.uint8)
+        for j in range(self.m):
+            codes[:, j] = nearest(sub[:, j], self.codebooks[j])
+        return codes
+
+    def _train(self):
+        live = np.flatnonzero(self.segment.live[:self.segment.size])
+        sample = live[self.rng.choice(len(live), min(self.train_size, len(live)), replace=False)]
+        data = self._prepare(self.segment.decode(sample))
+        self.coarse = kmeans(data, self.nlist, rng=self.rng)
+        self.nlist = len(self.coarse)
+        residuals = (data - self.coarse[self._assign(data)]).reshape(len(data), self.m, self.dsub)
+        self.codebooks = np.zeros((self.m, self.ksub, self.dsub), dtype=np.float32)
+        for j in range(self.m):
+            codebook = kmeans(np.ascontiguousarray(residuals[:, j]), self.ksub, rng=self.rng)
+            self.codebooks[j, :len(codebook)] = codebook
+        self.list_rows = [np.empty(16, dtype=np.int64) for _ in range(self.nlist)]
+        self.list_codes = [np.empty((16, self.m), dtype=np.uint8) for _ in range(self.nlist)]
+        self.list_sizes = np.zeros(self.nlist, dtype=np.int64)
+        self.ready = True
+        self._encode_rows(np.arange(self.segment.size))
+
+    def _encode_rows(self, rows, block=65536):
+        for start in range(0, len(rows), block):
+            chunk = rows[start:start + block]
+            vectors = self._prepare(self.segment.decode(chunk))
+            lists = self._assign(vectors)
+            codes = self._encode(vectors - self.coarse[lists])
+            for list_id in np.unique(lists):
+                members = lists == list_id
+                self._append(list_id, chunk[members], codes[members])
+
+    def _append(self, list_id, rows, codes):
+        size = self.list_sizes[list_id]
+        needed = size + len(rows)
+        if needed > len(self.list_rows[list_id]):
+            capacity = max(needed, 2 * len(self.list_rows[list_id]))
+            self.list_rows[list_id] = np.resize(self.list_rows[list_id], capacity)
+            self.list_codes[list_id] = np.resize(self.list_codes[list_id], (capacity, self.m))
+        self.list_rows[list_id][size:needed] = rows
+        self.list_codes[list_id][size:needed] = codes
+        self.list_sizes[list_id] = needed
+
+    def add(self, rows):
+        """Encode newly appended segment rows, training first once enough exist."""
+        if self.ready:
+            self._encode_rows(np.asarray(rows))
+        elif self.segment.live[:self.segment.size].sum() >= self.train_size:
+            self._train()
+
+    def _lookup_tables(self, query, lists):
+        """Per probed list, an (m, ksub) table of sub-space distances to the query."""
+        codebooks = self.codebooks
+        if self.metric == "dot":
+            table = -np.einsum('jd,jkd->jk', query.reshape(self.m, self.dsub), codebooks)
+            base = -(self.coarse[lists] @ query)
+            return base, np.broadcast_to(table, (len(lists),) + table.shape)
+        residuals = (query - self.coarse[lists]).reshape(len(lists), self.m, 1, self.dsub)
+        diff = residuals - codebooks[None]
+        return np.zeros(len(lists), dtype=np.float32), np.einsum('ljkd,ljkd->ljk', diff, diff)
+
+    def search(self, query, top_k, allowed=None):
+        """Approximate top_k live rows for one query; returns (rows, exact distances).
+
+        `allowed` is an optional boolean mask over segment rows (defaults to
+        the live rows); other rows are skipped while the lists are scanned.
+        """
+        allowed = self.segment.live if allowed is None else allowed
+        prepared = self._prepare(query.reshape(1, -1))[0]
+        if self.metric == "dot":
+            coarse_distances = -(self.coarse @ prepared)
+        else:
+            diff = self.coarse - prepared
+            coarse_distances = np.einsum('ij,ij->i', diff, diff)
+        nprobe = min(self.nprobe, self.nlist)
+        lists = np.argpartition(coarse_distances, nprobe - 1)[:nprobe]
+        base, tables = self._lookup_tables(prepared, lists)
+
+        candidate_rows, candidate_distances = [], []
+        columns = np.arange(self.m)
+        for list_id, offset, table in zip(lists, base, tables):
+            size = self.list_sizes[list_id]
+            if not size:
+                continue
+            rows = self.list_rows[list_id][:size]
+            codes = self.list_codes[list_id][:size]
+            live = allowed[rows]
+            candidate_rows.append(rows[live])
+            candidate_distances.append(offset + table[columns, codes[live]].sum(axis=1))
+        if not candidate_rows:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        rows = np.concatenate(candidate_rows)
+        approximate = np.concatenate(candidate_distances)
+
+        shortlist = min(len(rows), max(top_k, 1) * self.rerank)
+        if shortlist < len(rows):
+            keep = np.argpartition(approximate, shortlist - 1)[:shortlist]
+            rows = rows[keep]
+        exact = distances(self.segment, self.metric, prepare_query(self.metric, query), rows)
+        order = np.argsort(exact, kind="stable")[:top_k]
+        return rows[order], exact[order]
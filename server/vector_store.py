@@ -0,0 +1,713 @@
+import copy
+import os
+import threading
+import time
+from array import array
+from collections import namedtuple
+import numpy as np
+from hnsw_index import HNSWIndex
+from ivfpq_index import IVFPQIndex
+
+# Defaults used when a request leaves keyspace/table empty, matching the documented schema
+DEFAULT_KEYSPACE = "redwing_keyspace"
+DEFAULT_TABLE = "vectors"
+
+METRICS = ("cosine", "euclidean", "dot")
+
+# Metrics a search over sparse vectors supports
+SPARSE_METRICS = ("cosine", "dot")
+
+# Ways HybridSearch merges its dense and sparse candidates: a weighted sum of
+# scores, or reciprocal-rank fusion
+FUSIONS = ("weighted", "rrf")
+
+# Location of a key stored in a table's sparse segment, in place of a dimension
+SPARSE = "sparse"
+
+# A sparse vector as read back from a table: sorted int64 indices, float32 values
+SparseRow = namedtuple("SparseRow", ["indices", "values", "dim"])
+
+# Upper bound on query x row scores materialised at once during a brute-force scan
+MAX_SCORE_ELEMENTS = 1 << 24
+
+# Storage precisions selectable per keyspace/table, with the dtype of the stored matrix.
+# "i8" keeps symmetric int8 codes and one float32 scale per row: vector = scale * codes.
+PRECISIONS = {
+    "f32": np.float32,
+    "f16": np.float16,
+    "i8": np.int8,
+}
+
+# Largest int8 code; a row's scale maps its largest magnitude to it
+I8_MAX = 127
+
+# Rows of a quantized matrix converted to float32 at a time while scoring
+SCORE_BLOCK_ROWS = 1 << 16
+
+# Filters matching at most this fraction of a segment skip the index and
+# score just the matching rows exactly
+FILTER_EXACT_FRACTION = 0.05
+
+# Approximate payload of one Scan chunk, well under gRPC's 4 MB message limit
+SCAN_CHUNK_BYTES = 1 << 20
+
+# Rough per-row overhead of a Scan chunk beyond the vector: key and timestamps
+SCAN_ROW_OVERHEAD = 40
+
+# Index types selectable per keyspace/table; "flat" is the brute-force scan
+INDEX_TYPES = {
+    "flat": None,
+    "hnsw": HNSWIndex,
+    "ivfpq": IVFPQIndex,
+}
+
+def parse_index_spec(spec):
+    """Parse an index spec such as "hnsw:M=16,ef_construction=200,metric=cosine".
+
+    Returns (index_type, params); numeric values are converted to numbers.
+    """
+    index_type, _, options = spec.partition(":")
+    if index_type not in INDEX_TYPES:
+        raise ValueError(f"unknown index type {index_type!r}, expected one of {list(INDEX_TYPES)}")
+    params = {}
+    for option in filter(None, options.split(",")):
+        name, _, value = option.partition("=")
+        try:
+            params[name] = float(value) if "." in value else int(value)
+        except ValueError:
+            params[name] = value
+    return index_type, params
+
+def parse_precision_spec(spec):
+    """Parse a storage precision spec such as "i8" or "i8:rescore".
+
+    Returns (precision, rescore). With "rescore" a quantized table also keeps
+    its float32 vectors so searches can rescore candidates at full precision.
+    """
+    precision, _, option = spec.partition(":")
+    if precision not in PRECISIONS:
+        raise ValueError(f"unknown precision {precision!r}, expected one of {list(PRECISIONS)}")
+    if option not in ("", "rescore"):
+        raise ValueError(f"unknown precision option {option!r}, expected 'rescore'")
+    return precision, option == "rescore"
+
+def quantize(vectors, precision):
+    """Encode float32 rows for storage at `precision`; returns (stored rows, per-row scales)."""
+    scales = np.ones(len(vectors), dtype=np.float32)
+    if precision != "i8":
+        return vectors.astype(PRECISIONS[precision]), scales
+    peaks = np.abs(vectors).max(axis=1) if vectors.size else scales
+    scales[peaks > 0] = peaks[peaks > 0] / I8_MAX
+    codes = np.clip(np.rint(vectors / scales[:, None]), -I8_MAX, I8_MAX).astype(np.int8)
+    return codes, scales
+
+class RowFilter:
+    """Conditions a row must meet to be returned by a search.
+
+    Time bounds are epoch seconds, inclusive for `*_after` and exclusive for
+    `*_before`; None leaves that side open. `attributes` must all match exactly.
+    """
+
+    def __init__(self, key_prefix="", created_after=None, created_before=None,
+                 updated_after=None, updated_before=None, attributes=None):
+        self.key_prefix = key_prefix
+        self.created_after = created_after
+        self.created_before = created_before
+        self.updated_after = updated_after
+        self.updated_before = updated_before
+        self.attributes = attributes or {}
+
+class RowSet:
+    """Keys, timestamps, attributes and liveness of append-only rows.
+
+    Rows are append-only: overwriting or deleting a key marks its old row dead
+    so row ids stay stable for any index built over them. Subclasses store
+    the vectors themselves and list their per-row arrays in `COLUMNS`, which
+    are grown together.
+    """
+
+    COLUMNS = ("norms", "created_at", "updated_at", "live")
+
+    def __init__(self, capacity):
+        self.size = 0
+        self.keys = []
+        self.attributes = []       # row -> attribute dict, or None
+        self.attribute_rows = {}  # (name, value) -> rows carrying that attribute
+        self.norms = np.empty(capacity, dtype=np.float32)
+        self.created_at = np.empty(capacity, dtype=np.float64)
+        self.updated_at = np.empty(capacity, dtype=np.float64)
+        self.live = np.zeros(capacity, dtype=bool)
+
+    def _resize(self, name, old, capacity):
+        new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+        new[:self.size] = old[:self.size]
+        return new
+
+    def _append_rows(self, keys, norms, created_at, updated_at, attributes):
+        """Record the metadata of a block of new rows and return their row ids."""
+        count = len(keys)
+        if self.size + count > len(self.live):
+            capacity = len(self.live)
+            while capacity < self.size + count:
+                capacity *= 2
+            for name in self.COLUMNS:
+                setattr(self, name, self._resize(name, getattr(self, name), capacity))
+        rows = np.arange(self.size, self.size + count)
+        self.norms[rows] = norms
+        self.created_at[rows] = created_at
+        self.updated_at[rows] = updated_at
+        self.live[rows] = True
+        self.keys.extend(keys)
+        self.attributes.extend(attributes or [None] * count)
+        for row, row_attributes in zip(rows, attributes or ()):
+            for item in (row_attributes or {}).items():
+                self.attribute_rows.setdefault(item, []).append(int(row))
+        self.size += count
+        return rows
+
+    def kill(self, row):
+        self.live[row] = False
+
+    def snapshot(self):
+        """A copy of the rows as they are now, to search without holding the table lock.
+
+        Stored rows never change once appended, so the copy shares the arrays
+        and lists up to `size` and only copies the live mask; rows appended or
+        killed afterwards are not seen. Must be called with the table lock held.
+        """
+        view = copy.copy(self)
+        view.live = self.live[:self.size].copy()
+        return view
+
+    def matching(self, row_filter):
+        """Boolean mask over the rows that are live and pass `row_filter`."""
+        mask = self.live[:self.size].copy()
+        for (name, value) in row_filter.attributes.items():
+            allowed = np.zeros(self.size, dtype=bool)
+            # Rows past `size` belong to writes made after a snapshot was taken
+            rows = np.array(self.attribute_rows.get((name, value), []), dtype=np.int64)
+            allowed[rows[rows < self.size]] = True
+            mask &= allowed
+        for column, low, high in ((self.created_at, row_filter.created_after, row_filter.created_before),
+                                  (self.updated_at, row_filter.updated_after, row_filter.updated_before)):
+            if low is not None:
+                mask &= column[:self.size] >= low
+            if high is not None:
+                mask &= column[:self.size] < high
+        if row_filter.key_prefix:
+            candidates = np.flatnonzero(mask)
+            prefix = row_filter.key_prefix
+            mask[candidates] = [self.keys[row].startswith(prefix) for row in candidates]
+        return mask
+
+class Segment(RowSet):
+    """All vectors of one dimension in a table, kept as a contiguous matrix.
+
+    The matrix holds float32, float16 or int8 rows depending on `precision`;
+    int8 rows are scaled by a per-row float32 `scales` entry. Searches score
+    the stored rows directly, converting them to float32 a block at a time,
+    and norms are those of the decoded rows. With `rescore` a quantized
+    segment also keeps the float32 rows in `full`, used only to rescore
+    candidates exactly.
+
+    With a `path` the vector matrices are memory-mapped .npy files rather
+    than process memory, so with a compressed index only the codes stay
+    resident. The files are scratch space and are overwritten on start-up.
+    """
+
+    COLUMNS = RowSet.COLUMNS + ("vectors", "scales")
+
+    def __init__(self, dim, capacity=1024, index_type="flat", index_params=None, path=None,
+                 precision="f32", rescore=False):
+        super().__init__(capacity)
+        self.dim = dim
+        self.precision = precision
+        self.paths = {"vectors": path}
+        self.vectors = self._matrix("vectors", (capacity, dim), PRECISIONS[precision])
+        self.scales = np.ones(capacity, dtype=np.float32)
+        self.full = None
+        if rescore and precision != "f32":
+            self.COLUMNS = Segment.COLUMNS + ("full",)
+            self.paths["full"] = path and os.path.splitext(path)[0] + ".full.npy"
+            self.full = self._matrix("full", (capacity, dim), np.float32)
+        index_class = INDEX_TYPES[index_type]
+        self.index = index_class(self, **(index_params or {})) if index_class else None
+
+    def _matrix(self, name, shape, dtype):
+        path = self.paths[name]
+        if path is None:
+            return np.zeros(shape, dtype=dtype)
+        # Write the resized file next to the old one and swap it in; the old
+        # mapping stays valid until it has been copied from.
+        matrix = np.lib.format.open_memmap(path + ".tmp", mode="w+", dtype=dtype, shape=shape)
+        os.replace(path + ".tmp", path)
+        return matrix
+
+    def _resize(self, name, old, capacity):
+        if name not in self.paths:
+            return super()._resize(name, old, capacity)
+        new = self._matrix(name, (capacity,) + old.shape[1:], old.dtype)
+        new[:self.size] = old[:self.size]
+        return new
+
+    def decode(self, rows):
+        """The stored rows (a row id, ids or a slice) as float32 vectors."""
+        vectors = self.vectors[rows].astype(np.float32, copy=False)
+        if self.precision == "i8":
+            vectors *= np.expand_dims(self.scales[rows], -1)
+        return vectors
+
+    def append(self, keys, vectors, created_at, updated_at, attributes=None):
+        """Append a block of float32 rows, stored at the segment's precision, and return their row ids."""
+        start = self.size
+        stored, scales = quantize(vectors, self.precision)
+        decoded = vectors if self.precision == "f32" else stored.astype(np.float32) * scales[:, None]
+        rows = self._append_rows(keys, np.linalg.norm(decoded, axis=1), created_at, updated_at, attributes)
+        self.vectors[start:self.size] = stored
+        self.scales[start:self.size] = scales
+        if self.full is not None:
+            self.full[start:self.size] = vectors
+        if self.index is not None:
+            self.index.add(rows)
+        return rows
+
+    def _dots(self, queries, rows, full):
+        """Inner products of queries with the stored rows, or the float32 rows with `full`."""
+        if full and self.full is not None:
+            return queries @ self.full[rows].T, np.linalg.norm(self.full[rows], axis=1)
+        if self.precision == "f32":
+            return queries @ self.vectors[rows].T, self.norms[rows]
+        rows = np.arange(self.size)[rows]
+        dots = np.empty((len(queries), len(rows)), dtype=np.float32)
+        for start in range(0, len(rows), SCORE_BLOCK_ROWS):
+            block = rows[start:start + SCORE_BLOCK_ROWS]
+            # Scoring int8 codes and scaling the products equals scoring the dequantized rows
+            dots[:, start:start + len(block)] = queries @ self.vectors[block].astype(np.float32).T
+            if self.precision == "i8":
+                dots[:, start:start + len(block)] *= self.scales[block]
+        return dots, self.norms[rows]
+
+    def scores(self, queries, metric, rows=None, full=False):
+        """Score queries against every row, or just `rows`; higher is better for all metrics.
+
+        Euclidean distances are returned negated so one top-k routine serves
+        every metric. Dead rows score -inf when scoring the whole segment.
+        With `full` the float32 rows kept for rescoring are used, if any.
+        """
+        dots, norms = self._dots(queries, slice(0, self.size) if rows is None else rows, full)
+        if metric == "dot":
+            scores = dots
+        elif metric == "cosine":
+            query_norms = np.linalg.norm(queries, axis=1, keepdims=True)
+            scores = dots / np.maximum(query_norms * norms, 1e-12)
+        else:
+            squared = (queries * queries).sum(axis=1, keepdims=True) + norms ** 2 - 2 * dots
+            scores = -np.sqrt(np.maximum(squared, 0))
+        if rows is None:
+            scores[:, ~self.live[:self.size]] = -np.inf
+        return scores
+
+    def search(self, queries, top_k, metric, threshold, row_filter=None, rescore=0):
+        """Top-k for each query; returns a list of (rows, scores) per query.
+
+        Uses the segment's index when it was built for `metric` and is ready,
+        otherwise a brute-force scan. A `row_filter` is applied while
+        candidates are scanned: the index skips non-matching rows, and filters
+        matching few rows switch to an exact scan of just those rows. With
+        `rescore` > top_k on a quantized segment keeping float32 rows, the
+        best `rescore` candidates are rescored exactly before the top-k is cut.
+        """
+        if rescore > top_k and self.full is not None:
+            results = []
+            for query, (rows, _) in zip(queries, self.search(queries, rescore, metric, 0, row_filter)):
+                selected, best = select_top_k(self.scores(query[None, :], metric, rows, full=True)[0],
+                                              top_k, metric, threshold)
+                results.append((rows[selected], best))
+            return results
+        allowed = None if row_filter is None else self.matching(row_filter)
+        use_index = self.index is not None and self.index.metric == metric and self.index.ready
+        if use_index and (allowed is None or allowed.sum() > FILTER_EXACT_FRACTION * self.size):
+            return [self._index_search(query, top_k, metric, threshold, allowed) for query in queries]
+        rows = None if allowed is None else np.flatnonzero(allowed)
+        count = self.size if rows is None else len(rows)
+        if count == 0:
+            return [(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)) for _ in queries]
+        results = []
+        step = max(1, MAX_SCORE_ELEMENTS // count)
+        for start in range(0, len(queries), step):
+            scores = self.scores(queries[start:start + step], metric, rows)
+            for row_scores in scores:
+                selected, best = select_top_k(row_scores, top_k, metric, threshold)
+                results.append((selected if rows is None else rows[selected], best))
+        return results
+
+    def _index_search(self, query, top_k, metric, threshold, allowed=None):
+        rows, distances = self.index.search(query, top_k, allowed)
+        selected, scores = select_top_k(self.index.scores(distances), top_k, metric, threshold)
+        return rows[selected], scores
+
+def select_top_k(scores, top_k, metric, threshold):
+    """Pick the best `top_k` entries of a score vector, best first.
+
+    `scores` follow the higher-is-better convention of Segment.scores. A zero
+    threshold means no threshold; otherwise cosine/dot keep scores >= threshold
+    and euclidean keeps distances <= threshold. Returned euclidean scores are
+    positive distances again.
+    """
+    candidates = np.flatnonzero(np.isfinite(scores))
+    if threshold:
+        limit = -threshold if metric == "euclidean" else threshold
+        candidates = candidates[scores[candidates] >= limit]
+    if len(candidates) > top_k:
+        candidates = candidates[np.argpartition(-scores[candidates], top_k - 1)[:top_k]]
+    candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+    best = scores[candidates]
+    return candidates, (-best if metric == "euclidean" else best)
+
+class SparseSegment(RowSet):
+    """The sparse vectors of a table with an inverted index over their indices.
+
+    Each row keeps its sorted indices and values. For every index, a posting
+    list holds the rows having a non-zero there and their values. Both are
+    append-only arrays, so dead rows stay in the postings and are masked out
+    at search time like dead rows of a dense Segment.
+    """
+
+    def __init__(self, capacity=1024):
+        super().__init__(capacity)
+        self.row_indices = []  # row -> int64 indices
+        self.row_values = []   # row -> float32 values
+        self.row_dims = []     # row -> declared dimensionality, 0 when unset
+        self.postings = {}     # index -> (array of rows, array of values)
+
+    def append(self, keys, vectors, created_at, updated_at, attributes=None):
+        """Append (indices, values, dim) triples and return their row ids."""
+        norms = [np.linalg.norm(values) for _, values, _ in vectors]
+        rows = self._append_rows(keys, norms, created_at, updated_at, attributes)
+        for row, (indices, values, dim) in zip(rows.tolist(), vectors):
+            self.row_indices.append(indices)
+            self.row_values.append(values)
+            self.row_dims.append(dim)
+            for index, value in zip(indices.tolist(), values.tolist()):
+                posting = self.postings.get(index)
+                if posting is None:
+                    posting = self.postings[index] = (array('q'), array('f'))
+                posting[0].append(row)
+                posting[1].append(value)
+        return rows
+
+    def _posting(self, index):
+        """Copies of the rows and values of one posting list, cut at `size`.
+
+        Values are copied before rows, which are appended first, so the two
+        copies line up even while a writer appends to the lists.
+        """
+        rows, values = self.postings[index]
+        values = np.frombuffer(values[:], dtype=np.float32)
+        rows = np.frombuffer(rows[:len(values)], dtype=np.int64)
+        count = np.searchsorted(rows, self.size)
+        return rows[:count], values[:count]
+
+    def row(self, row):
+        return SparseRow(self.row_indices[row].copy(), self.row_values[row].copy(), self.row_dims[row])
+
+    def scores(self, query, metric, rows):
+        """Exact scores of one (indices, values) query against just `rows`."""
+        indices, values = query
+        scores = np.zeros(len(rows))
+        for i, row in enumerate(rows):
+            _, mine, theirs = np.intersect1d(indices, self.row_indices[row], assume_unique=True, return_indices=True)
+            scores[i] = values[mine] @ self.row_values[row][theirs]
+        if metric == "cosine":
+            scores /= np.maximum(np.linalg.norm(values) * self.norms[rows], 1e-12)
+        return scores
+
+    def search(self, queries, top_k, metric, threshold, row_filter=None, rescore=0):
+        """Top-k rows sharing an index with each (indices, values) query.
+
+        Scores are accumulated only over the posting lists of the query's
+        indices, so the cost follows the postings touched rather than the
+        number of rows. Sparse values are kept at full precision, so
+        `rescore` has nothing to do. Returns a list of (rows, scores) per query.
+        """
+        allowed = self.live[:self.size] if row_filter is None else self.matching(row_filter)
+        results = []
+        for indices, values in queries:
+            postings = [(self._posting(index), value) for index, value in zip(indices.tolist(), values.tolist())
+                        if index in self.postings]
+            if not postings:
+                results.append((np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)))
+                continue
+            rows = np.concatenate([posting[0] for posting, _ in postings])
+            products = np.concatenate([value * posting[1] for posting, value in postings])
+            candidates, positions = np.unique(rows, return_inverse=True)
+            scores = np.bincount(positions, weights=products, minlength=len(candidates))
+            if metric == "cosine":
+                scores /= np.maximum(np.linalg.norm(values) * self.norms[candidates], 1e-12)
+            keep = allowed[candidates]
+            selected, best = select_top_k(scores[keep], top_k, metric, threshold)
+            results.append((candidates[keep][selected], best.astype(np.float32)))
+        return results
+
+class VectorTable:
+    """One keyspace/table: a Segment per vector dimension, a SparseSegment for
+    sparse vectors, and the key directories.
+
+    A key can hold one dense and one sparse vector side by side, such as an
+    embedding and the TF-IDF terms of the same document.
+    """
+
+    def __init__(self, index_type="flat", index_params=None, path_prefix=None, precision="f32", rescore=False):
+        self.lock = threading.RLock()
+        self.index_type = index_type
+        self.index_params = index_params
+        self.path_prefix = path_prefix
+        self.precision = precision
+        self.rescore = rescore
+        self.segments = {}
+        self.sparse = SparseSegment()
+        self.locations = {}         # key -> (dim, row) of its dense vector
+        self.sparse_locations = {}  # key -> (SPARSE, row) of its sparse vector
+
+    def _segment(self, dim):
+        if dim not in self.segments:
+            path = f"{self.path_prefix}.{dim}.npy" if self.path_prefix else None
+            self.segments[dim] = Segment(dim, index_type=self.index_type, index_params=self.index_params, path=path,
+                                         precision=self.precision, rescore=self.rescore)
+        return self.segments[dim]
+
+    def _rows_at(self, location):
+        """The Segment or SparseSegment a key's location points into."""
+        return self.sparse if location[0] == SPARSE else self.segments[location[0]]
+
+    def write(self, keys, vectors, created_at=None, updated_at=None, attributes=None):
+        """Upsert equally sized vectors.
+
+        `created_at`/`updated_at` are optional arrays of epoch seconds where NaN
+        means unset: updated_at then defaults to now, and created_at to the
+        existing row's value for a known key or now for a new one. `attributes`
+        is an optional list of dicts; None keeps an existing key's attributes.
+        """
+        with self.lock:
+            return self._upsert(self._segment(vectors.shape[1]), vectors.shape[1], keys, vectors,
+                                created_at, updated_at, attributes)
+
+    def write_sparse(self, keys, vectors, created_at=None, updated_at=None, attributes=None):
+        """Upsert sparse vectors given as (indices, values, dim) triples; see write."""
+        return self._upsert(self.sparse, SPARSE, keys, vectors, created_at, updated_at, attributes)
+
+    def _existing(self, key, locations):
+        """Location of the key's vector in `locations`, else of its vector of the other form."""
+        return locations.get(key) or self.locations.get(key) or self.sparse_locations.get(key)
+
+    def _upsert(self, segment, location, keys, vectors, created_at, updated_at, attributes):
+        locations = self.sparse_locations if location == SPARSE else self.locations
+        now = time.time()
+        count = len(keys)
+        created = np.full(count, np.nan) if created_at is None else np.array(created_at, dtype=np.float64)
+        updated = np.full(count, np.nan) if updated_at is None else np.array(updated_at, dtype=np.float64)
+        updated[np.isnan(updated)] = now
+        with self.lock:
+            for i in np.flatnonzero(np.isnan(created)):
+                previous = self._existing(keys[i], locations)
+                created[i] = now if previous is None else self._rows_at(previous).created_at[previous[1]]
+            attributes = [None] * count if attributes is None else list(attributes)
+            for i, row_attributes in enumerate(attributes):
+                previous = self._existing(keys[i], locations)
+                if row_attributes is None and previous is not None:
+                    attributes[i] = self._rows_at(previous).attributes[previous[1]]
+            rows = segment.append(keys, vectors, created, updated, attributes)
+            for key, row in zip(keys, rows):
+                previous = locations.get(key)
+                if previous is not None:
+                    self._rows_at(previous).kill(previous[1])
+                locations[key] = (location, int(row))
+        return count
+
+    def read(self, key, sparse=False):
+        """Return (vector, created_at, updated_at) for a key's dense vector, or None.
+
+        Dense vectors are returned as float32 decoded from the table's
+        precision. With `sparse` the key's sparse vector is returned instead,
+        as a SparseRow.
+        """
+        with self.lock:
+            location = (self.sparse_locations if sparse else self.locations).get(key)
+            if location is None:
+                return None
+            segment = self._rows_at(location)
+            row = location[1]
+            vector = segment.row(row) if sparse else segment.decode(row)
+            return vector, segment.created_at[row], segment.updated_at[row]
+
+    def contains(self, key):
+        with self.lock:
+            return key in self.locations or key in self.sparse_locations
+
+    def delete(self, key):
+        """Delete both the dense and the sparse vector of a key."""
+        with self.lock:
+            found = False
+            for locations in (self.locations, self.sparse_locations):
+                location = locations.pop(key, None)
+                if location is not None:
+                    self._rows_at(location).kill(location[1])
+                    found = True
+            return found
+
+    def scan(self, dim=0, cursor="", max_bytes=0, row_filter=None):
+        """Yield live rows in chunks as (dim, keys, vectors, created_at, updated_at, cursor, total).
+
+        Segments are visited in dimension order and rows in append order, so
+        a cursor "dim:row" names the next row to send. The lock is held only
+        while a chunk is copied out: rows deleted later in the scan are
+        skipped, and rows written during it may be returned. `total` counts
+        the matching rows from the cursor on when the scan starts.
+        """
+        start_dim, start_row = (int(part) for part in cursor.split(":")) if cursor else (0, 0)
+        max_bytes = max_bytes or SCAN_CHUNK_BYTES
+        with self.lock:
+            dims = sorted(d for d in self.segments if (not dim or d == dim) and d >= start_dim)
+            masks = {d: self.segments[d].matching(row_filter) for d in dims} if row_filter else {}
+            total = 0
+            for d in dims:
+                first = start_row if d == start_dim else 0
+                mask = masks[d] if row_filter else self.segments[d].live[:self.segments[d].size]
+                total += int(mask[first:].sum())
+        for d in dims:
+            step = max(1, max_bytes // (4 * d + SCAN_ROW_OVERHEAD))
+            row = start_row if d == start_dim else 0
+            while True:
+                with self.lock:
+                    segment = self.segments[d]
+                    end = min(row + step, len(masks[d]) if row_filter else segment.size)
+                    if row >= end:
+                        break
+                    mask = segment.live[row:end]
+                    if row_filter:
+                        mask = mask & masks[d][row:end]
+                    rows = row + np.flatnonzero(mask)
+                    chunk = ([segment.keys[r] for r in rows], segment.decode(rows),
+                             segment.created_at[rows], segment.updated_at[rows])
+                row = end
+                if len(rows):
+                    yield (d,) + chunk + (f"{d}:{end}", total)
+
+    def search(self, queries, top_k, metric, threshold, row_filter=None, rescore=0):
+        """Search an (N, dim) query matrix; returns N lists of (key, score).
+
+        With `rescore` > top_k on a table keeping float32 vectors beside its
+        quantized ones, the best `rescore` candidates are rescored exactly.
+        Flat segments are scored on a snapshot after the lock is released, so
+        concurrent searches run in parallel; indexes are updated in place by
+        writes and are searched under the lock.
+        """
+        with self.lock:
+            segment = self.segments.get(queries.shape[1])
+            if segment is not None and segment.index is not None:
+                return self._search(segment, queries, top_k, metric, threshold, row_filter, rescore)
+            segment = None if segment is None else segment.snapshot()
+        return self._search(segment, queries, top_k, metric, threshold, row_filter, rescore)
+
+    def search_sparse(self, queries, top_k, metric, threshold, row_filter=None):
+        """Search the sparse vectors with (indices, values) queries; returns N lists of (key, score)."""
+        with self.lock:
+            sparse = self.sparse.snapshot()
+        return self._search(sparse, queries, top_k, metric, threshold, row_filter)
+
+    def hybrid_search(self, query, sparse_query, top_k, candidates, dense_metric, sparse_metric,
+                      fusion="weighted", dense_weight=1.0, sparse_weight=1.0, rrf_k=60, row_filter=None):
+        """Fuse a dense and an (indices, values) sparse search into one list of (key, score).
+
+        Each side contributes its top `candidates`. Weighted fusion scores
+        every key in the union on both sides, computing the score the key
+        was not retrieved with exactly, so a key missed by one side is not
+        penalised for it. RRF uses only the rank of a key in each list.
+        Like search, scoring runs on snapshots outside the lock unless the
+        dense segment has an index.
+        """
+        with self.lock:
+            segment = self.segments.get(len(query))
+            if segment is not None and segment.index is not None:
+                return self._hybrid_search(segment, self.sparse, query, sparse_query, top_k, candidates, dense_metric,
+                                           sparse_metric, fusion, dense_weight, sparse_weight, rrf_k, row_filter)
+            segment = None if segment is None else segment.snapshot()
+            sparse = self.sparse.snapshot()
+        return self._hybrid_search(segment, sparse, query, sparse_query, top_k, candidates, dense_metric,
+                                   sparse_metric, fusion, dense_weight, sparse_weight, rrf_k, row_filter)
+
+    def _hybrid_search(self, segment, sparse, query, sparse_query, top_k, candidates, dense_metric, sparse_metric,
+                       fusion, dense_weight, sparse_weight, rrf_k, row_filter):
+        dense = self._search(segment, query.reshape(1, -1), candidates, dense_metric, 0, row_filter)[0]
+        sparse_matches = self._search(sparse, [sparse_query], candidates, sparse_metric, 0, row_filter)[0]
+        fused = {}
+        if fusion == "rrf":
+            for weight, matches in ((dense_weight, dense), (sparse_weight, sparse_matches)):
+                for rank, (key, _) in enumerate(matches, 1):
+                    fused[key] = fused.get(key, 0.0) + weight / (rrf_k + rank)
+        else:
+            dense_scores, sparse_scores = dict(dense), dict(sparse_matches)
+            if segment is not None:
+                self._fill_scores(dense_scores, sparse_scores, self.locations, segment.dim, segment,
+                                  lambda rows: segment.scores(query.reshape(1, -1), dense_metric, rows)[0], row_filter)
+            self._fill_scores(sparse_scores, dense_scores, self.sparse_locations, SPARSE, sparse,
+                              lambda rows: sparse.scores(sparse_query, sparse_metric, rows), row_filter)
+            for key in dense_scores.keys() | sparse_scores.keys():
+                fused[key] = dense_weight * dense_scores.get(key, 0.0) + sparse_weight * sparse_scores.get(key, 0.0)
+        return sorted(fused.items(), key=lambda item: (-item[1], item[0]))[:top_k]
+
+    @staticmethod
+    def _fill_scores(scores, others, locations, location, segment, score_rows, row_filter):
+        """Add to `scores` the exact score of each key only found in `others`.
+
+        Keys without a vector in `segment` (at `location`), including keys
+        rewritten after a snapshot was taken, or whose row fails the filter,
+        score nothing on this side.
+        """
+        rows = {}
+        for key in others:
+            if key not in scores:
+                # One lookup per key, as writers may move keys while a snapshot is scored
+                found = locations.get(key)
+                if found is not None and found[0] == location and found[1] < segment.size:
+                    rows[key] = found[1]
+        if row_filter is not None:
+            allowed = segment.matching(row_filter)
+            rows = {key: row for key, row in rows.items() if allowed[row]}
+        if rows:
+            scores.update(zip(rows, score_rows(np.array(list(rows.values()))).tolist()))
+
+    @staticmethod
+    def _search(segment, queries, top_k, metric, threshold, row_filter, rescore=0):
+        if segment is None or top_k <= 0:
+            return [[] for _ in queries]
+        results = segment.search(queries, top_k, metric, threshold, row_filter, rescore)
+        return [[(segment.keys[row], float(score)) for row, score in zip(rows, scores)]
+                for rows, scores in results]
+
+class VectorStore:
+    """All tables held by the server, created on first use.
+
+    `index_specs` maps (keyspace, table) to an (index_type, params) pair from
+    parse_index_spec; tables without an entry use the brute-force scan.
+    `precision_specs` maps (keyspace, table) to a (precision, rescore) pair
+    from parse_precision_spec; tables without an entry store float32.
+    With a `data_dir` vector matrices are memory-mapped files in that directory.
+    """
+
+    def __init__(self, index_specs=None, data_dir=None, precision_specs=None):
+        self.lock = threading.Lock()
+        self.index_specs = index_specs or {}
+        self.precision_specs = precision_specs or {}
+        self.data_dir = data_dir
+        self.tables = {}
+
+    def table(self, keyspace, table):
+        name = (keyspace or DEFAULT_KEYSPACE, table or DEFAULT_TABLE)
+        with self.lock:
+            if name not in self.tables:
+                index_type, index_params = self.index_specs.get(name, ("flat", None))
+                prefix = os.path.join(self.data_dir, ".".join(name)) if self.data_dir else None
+                precision, rescore = self.precision_specs.get(name, ("f32", False))
+                self.tables[name] = VectorTable(index_type, index_params, prefix, precision, rescore)
+            return self.tables[name]
@@ -0,0 +1,362 @@
+import argparse
+import logging
+import os
+import re
+from concurrent import futures
+import grpc
+import numpy as np
+import vectordb_pb2
+import vectordb_pb2_grpc
+from vector_store import VectorStore, RowFilter, METRICS, SPARSE_METRICS, FUSIONS, parse_index_spec, parse_precision_spec
+
+# Setup basic configuration for logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Used when a search request leaves top_k or metric unset
+DEFAULT_TOP_K = 10
+DEFAULT_METRIC = "cosine"
+
+# Used when a HybridSearch request leaves fusion, rrf_k or candidates unset;
+# each side contributes HYBRID_CANDIDATE_FACTOR * top_k candidates by default
+DEFAULT_FUSION = "weighted"
+DEFAULT_RRF_K = 60
+HYBRID_CANDIDATE_FACTOR = 4
+
+# Dtypes of the packed vector fields, in order of precedence; int8 codes come with a scale
+PACKED_DTYPES = {
+    "f32": np.dtype('<f4'),
+    "f16": np.dtype('<f2'),
+    "i8": np.dtype('i1'),
+}
+
+def unpack(packed, repeated, context):
+    """Decode the first set field of `packed` ({encoding: bytes}), else the repeated floats.
+
+    Returns (float32 array, encoding); int8 codes are returned unscaled.
+    """
+    for encoding, data in packed.items():
+        if data:
+            dtype = PACKED_DTYPES[encoding]
+            if len(data) % dtype.itemsize:
+                context.abort(grpc.StatusCode.INVALID_ARGUMENT,
+                              f"packed {encoding} vector length is not a multiple of {dtype.itemsize} bytes")
+            return np.frombuffer(data, dtype=dtype).astype(np.float32, copy=False), encoding
+    return np.asarray(repeated, dtype=np.float32), None
+
+def check_scales(scales, context):
+    """Abort unless every int8 scale is positive and finite."""
+    scales = np.asarray(scales, dtype=np.float32)
+    if not np.all(np.isfinite(scales) & (scales > 0)):
+        context.abort(grpc.StatusCode.INVALID_ARGUMENT, "int8 vectors need a positive, finite scale")
+    return scales
+
+def decode_vector(vector_f32, vector, dim, context, vector_f16=b"", vector_i8=b"", scale=0.0):
+    """Decode a request vector from its packed (float32, float16 or scaled int8) or repeated form, aborting on bad input."""
+    array, encoding = unpack({"f32": vector_f32, "f16": vector_f16, "i8": vector_i8}, vector, context)
+    if dim and len(array) != dim:
+        context.abort(grpc.StatusCode.INVALID_ARGUMENT, f"vector has {len(array)} elements but dim is {dim}")
+    if len(array) == 0:
+        context.abort(grpc.StatusCode.INVALID_ARGUMENT, "vector is empty")
+    if encoding == "i8":
+        array *= check_scales(scale, context)
+    return array
+
+def decode_matrix(matrix_f32, values, dim, context, matrix_f16=b"", matrix_i8=b"", scales=()):
+    """Decode an (N, dim) row-major matrix from its packed or flattened form; int8 rows take one scale each."""
+    flat, encoding = unpack({"f32": matrix_f32, "f16": matrix_f16, "i8": matrix_i8}, values, context)
+    if dim <= 0 or len(flat) == 0 or len(flat) % dim:
+        context.abort(grpc.StatusCode.INVALID_ARGUMENT, f"cannot split {len(flat)} values into rows of dim {dim}")
+    matrix = flat.reshape(-1, dim)
+    if encoding == "i8":
+        if len(scales) != len(matrix):
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, f"got {len(scales)} scales for {len(matrix)} int8 rows")
+        matrix *= check_scales(scales, context)[:, None]
+    return matrix
+
+def request_vector(request, context):
+    """Decode the dense vector of a VectorWriteRequest or VectorUpdateRequest."""
+    return decode_vector(request.vector_f32, request.vector, request.dim, context,
+                         request.vector_f16, request.vector_i8, request.vector_scale)
+
+def request_query(request, context):
+    """Decode the dense query of a VectorSearchRequest or HybridSearchRequest."""
+    return decode_vector(request.query_f32, request.query, request.dim, context,
+                         request.query_f16, request.query_i8, request.query_scale)
+
+def decode_sparse(sparse, context):
+    """Decode a SparseVector into (sorted int64 indices, float32 values, dim), aborting on bad input."""
+    indices = np.asarray(sparse.indices, dtype=np.int64)
+    values = np.asarray(sparse.values, dtype=np.float32)
+    if len(indices) != len(values):
+        context.abort(grpc.StatusCode.INVALID_ARGUMENT,
+                      f"sparse vector has {len(indices)} indices but {len(values)} values")
+    if sparse.dim and len(indices) and indices.max() >= sparse.dim:
+        context.abort(grpc.StatusCode.INVALID_ARGUMENT, f"sparse index {indices.max()} is out of range for dim {sparse.dim}")
+    order = np.argsort(indices, kind='stable')
+    indices, values = indices[order], values[order]
+    if np.any(indices[1:] == indices[:-1]):
+        context.abort(grpc.StatusCode.INVALID_ARGUMENT, "sparse vector has duplicate indices")
+    return indices, values, sparse.dim
+
+def timestamp_seconds(message, field):
+    """Return a Timestamp field as epoch seconds, or NaN when it is unset."""
+    if message.HasField(field):
+        return getattr(message, field).ToMicroseconds() / 1e6
+    return np.nan
+
+def row_filter(request):
+    """Translate the request's SearchFilter into a RowFilter, or None when unset."""
+    if not request.HasField('filter'):
+        return None
+    bounds = {}
+    for field in ('created_after', 'created_before', 'updated_after', 'updated_before'):
+        seconds = timestamp_seconds(request.filter, field)
+        bounds[field] = None if np.isnan(seconds) else seconds
+    return RowFilter(request.filter.key_prefix, attributes=dict(request.filter.attributes), **bounds)
+
+def search_options(request, context):
+    """Validate and default the shared top_k/metric/threshold of a search request."""
+    metric = request.metric or DEFAULT_METRIC
+    if metric not in METRICS:
+        context.abort(grpc.StatusCode.INVALID_ARGUMENT, f"unknown metric {metric!r}, expected one of {METRICS}")
+    return request.top_k or DEFAULT_TOP_K, metric, request.threshold
+
+def sparse_search_options(request, context):
+    """search_options for a sparse query, which supports SPARSE_METRICS only."""
+    top_k, metric, threshold = search_options(request, context)
+    if metric not in SPARSE_METRICS:
+        context.abort(grpc.StatusCode.INVALID_ARGUMENT,
+                      f"metric {metric!r} is not supported for sparse queries, expected one of {SPARSE_METRICS}")
+    return top_k, metric, threshold
+
+def rescore_option(request, table, context):
+    """Validate the rescore depth of a dense search against the table's storage."""
+    if request.rescore > (request.top_k or DEFAULT_TOP_K) and table.precision != "f32" and not table.rescore:
+        context.abort(grpc.StatusCode.FAILED_PRECONDITION,
+                      f"the table stores {table.precision} vectors without full-precision copies to rescore with; "
+                      f"configure it with --precision KEYSPACE.TABLE={table.precision}:rescore")
+    return request.rescore
+
+def hybrid_options(request, context):
+    """Validate and default the fusion settings of a HybridSearchRequest as keyword arguments."""
+    dense_metric = request.dense_metric or DEFAULT_METRIC
+    sparse_metric = request.sparse_metric or DEFAULT_METRIC
+    fusion = request.fusion or DEFAULT_FUSION
+    if dense_metric not in METRICS:
+        context.abort(grpc.StatusCode.INVALID_ARGUMENT, f"unknown dense_metric {dense_metric!r}, expected one of {METRICS}")
+    if sparse_metric not in SPARSE_METRICS:
+        context.abort(grpc.StatusCode.INVALID_ARGUMENT,
+                      f"unknown sparse_metric {sparse_metric!r}, expected one of {SPARSE_METRICS}")
+    if fusion not in FUSIONS:
+        context.abort(grpc.StatusCode.INVALID_ARGUMENT, f"unknown fusion {fusion!r}, expected one of {FUSIONS}")
+    if fusion == "weighted" and dense_metric == "euclidean":
+        context.abort(grpc.StatusCode.INVALID_ARGUMENT, "weighted fusion needs a cosine or dot dense_metric; use rrf")
+    top_k = request.top_k or DEFAULT_TOP_K
+    weights = (request.dense_weight, request.sparse_weight)
+    if weights == (0, 0):
+        weights = (1.0, 1.0)
+    return {
+        "top_k": top_k,
+        "candidates": max(request.candidates, top_k) if request.candidates else HYBRID_CANDIDATE_FACTOR * top_k,
+        "dense_metric": dense_metric,
+        "sparse_metric": sparse_metric,
+        "fusion": fusion,
+        "dense_weight": weights[0],
+        "sparse_weight": weights[1],
+        "rrf_k": request.rrf_k or DEFAULT_RRF_K,
+    }
+
+def search_response(matches):
+    return vectordb_pb2.VectorSearchResponse(
+        matches=[vectordb_pb2.SearchResult(key=key, score=score) for key, score in matches]
+    )
+
+class VectorDBServicer(vectordb_pb2_grpc.VectorDBServicer):
+    """In-memory VectorDB service for local development, benchmarks and CI.
+
+    Each keyspace/table is a VectorTable holding contiguous matrices, of
+    float32 or the precision configured for it, and an inverted index of its
+    sparse vectors. Dense searches use the
+    table's configured index, or a vectorized brute-force scan for flat
+    tables.
+    """
+
+    def __init__(self, store=None):
+        self.store = store or VectorStore()
+
+    def _write(self, table, requests, context):
+        """Write a sequence of VectorWriteRequest/VectorUpdateRequest, grouped by dimension.
+
+        Sparse vectors form their own group.
+        """
+        groups = {}
+        for request in requests:
+            if request.HasField('sparse'):
+                vector = decode_sparse(request.sparse, context)
+                group = groups.setdefault(None, ([], [], [], [], []))
+            else:
+                vector = request_vector(request, context)
+                group = groups.setdefault(len(vector), ([], [], [], [], []))
+            group[0].append(request.key)
+            group[1].append(vector)
+            group[2].append(timestamp_seconds(request, 'created_at'))
+            group[3].append(timestamp_seconds(request, 'updated_at'))
+            group[4].append(dict(request.attributes) or None)
+        for dim, (keys, vectors, created_at, updated_at, attributes) in groups.items():
+            if dim is None:
+                table.write_sparse(keys, vectors, created_at, updated_at, attributes)
+            else:
+                table.write(keys, np.vstack(vectors), created_at, updated_at, attributes)
+        return len(requests)
+
+    def _write_batch(self, request, context):
+        keyspace = request.keyspace or (request.vectors[0].keyspace if request.vectors else "")
+        table = request.table or (request.vectors[0].table if request.vectors else "")
+        return self._write(self.store.table(keyspace, table), request.vectors, context)
+
+    def Write(self, request, context):
+        self._write(self.store.table(request.keyspace, request.table), [request], context)
+        return vectordb_pb2.VectorWriteResponse(success=True)
+
+    def BatchWrite(self, request, context):
+        self._write_batch(request, context)
+        return vectordb_pb2.VectorWriteResponse(success=True)
+
+    def StreamWrite(self, request_iterator, context):
+        response = vectordb_pb2.VectorStreamWriteResponse(success=True)
+        for chunk, request in enumerate(request_iterator):
+            count = self._write_batch(request, context)
+            response.acks.add(chunk=chunk, count=count, success=True)
+            response.count += count
+        return response
+
+    def _read(self, table, key, packed):
+        with table.lock:
+            dense, sparse = table.read(key), table.read(key, sparse=True)
+        if dense is None and sparse is None:
+            return vectordb_pb2.VectorReadResponse(found=False)
+        response = vectordb_pb2.VectorReadResponse(found=True)
+        if sparse is not None:
+            vector = sparse[0]
+            response.sparse.CopyFrom(vectordb_pb2.SparseVector(indices=vector.indices, values=vector.values, dim=vector.dim))
+        if dense is not None and packed:
+            response.vector_f32 = dense[0].astype('<f4').tobytes()
+            response.dim = len(dense[0])
+        elif dense is not None:
+            response.vector.extend(dense[0])
+        return response
+
+    def Read(self, request, context):
+        return self._read(self.store.table(request.keyspace, request.table), request.key, request.packed)
+
+    def BatchRead(self, request, context):
+        table = self.store.table(request.keyspace, request.table)
+        return vectordb_pb2.VectorBatchReadResponse(
+            results=[self._read(table, key, request.packed) for key in request.keys]
+        )
+
+    def Update(self, request, context):
+        table = self.store.table(request.keyspace, request.table)
+        with table.lock:
+            if not table.contains(request.key):
+                return vectordb_pb2.VectorUpdateResponse(success=False)
+            self._write(table, [request], context)
+        return vectordb_pb2.VectorUpdateResponse(success=True)
+
+    def Delete(self, request, context):
+        table = self.store.table(request.keyspace, request.table)
+        return vectordb_pb2.VectorDeleteResponse(success=table.delete(request.key))
+
+    def Search(self, request, context):
+        if request.HasField('sparse_query'):
+            indices, values, _ = decode_sparse(request.sparse_query, context)
+            top_k, metric, threshold = sparse_search_options(request, context)
+            table = self.store.table(request.keyspace, request.table)
+            return search_response(
+                table.search_sparse([(indices, values)], top_k, metric, threshold, row_filter(request))[0])
+        query = request_query(request, context)
+        top_k, metric, threshold = search_options(request, context)
+        table = self.store.table(request.keyspace, request.table)
+        rescore = rescore_option(request, table, context)
+        return search_response(
+            table.search(query.reshape(1, -1), top_k, metric, threshold, row_filter(request), rescore)[0])
+
+    def BatchSearch(self, request, context):
+        if request.sparse_queries:
+            queries = [decode_sparse(query, context)[:2] for query in request.sparse_queries]
+            top_k, metric, threshold = sparse_search_options(request, context)
+            table = self.store.table(request.keyspace, request.table)
+            results = table.search_sparse(queries, top_k, metric, threshold, row_filter(request))
+            return vectordb_pb2.VectorBatchSearchResponse(results=[search_response(matches) for matches in results])
+        queries = decode_matrix(request.queries_f32, request.queries, request.dim, context,
+                                request.queries_f16, request.queries_i8, request.query_scales)
+        top_k, metric, threshold = search_options(request, context)
+        table = self.store.table(request.keyspace, request.table)
+        rescore = rescore_option(request, table, context)
+        results = table.search(queries, top_k, metric, threshold, row_filter(request), rescore)
+        return vectordb_pb2.VectorBatchSearchResponse(results=[search_response(matches) for matches in results])
+
+    def HybridSearch(self, request, context):
+        if not request.HasField('sparse_query'):
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, "sparse_query is required")
+        query = request_query(request, context)
+        sparse_query = decode_sparse(request.sparse_query, context)[:2]
+        options = hybrid_options(request, context)
+        table = self.store.table(request.keyspace, request.table)
+        return search_response(table.hybrid_search(query, sparse_query, row_filter=row_filter(request), **options))
+
+    def Scan(self, request, context):
+        if request.cursor and not re.fullmatch(r"\d+:\d+", request.cursor):
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, f"malformed cursor {request.cursor!r}")
+        table = self.store.table(request.keyspace, request.table)
+        chunks = table.scan(request.dim, request.cursor, request.max_bytes, row_filter(request))
+        for dim, keys, vectors, created_at, updated_at, cursor, total in chunks:
+            yield vectordb_pb2.VectorScanChunk(
+                keys=keys,
+                vectors_f32=vectors.astype('<f4').tobytes(),
+                dim=dim,
+                created_at_f64=created_at.astype('<f8').tobytes(),
+                updated_at_f64=updated_at.astype('<f8').tobytes(),
+                cursor=cursor,
+                total=total
+            )
+
+def serve(port=50051, max_workers=10, store=None):
+    """Start the reference server on `port` and return the running grpc.Server."""
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=max_workers))
+    vectordb_pb2_grpc.add_VectorDBServicer_to_server(VectorDBServicer(store), server)
+    server.add_insecure_port(f'[::]:{port}')
+    server.start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="In-memory reference VectorDB server.")
+    parser.add_argument('--port', type=int, default=50051, help="Port to listen on (default: 50051)")
+    parser.add_argument('--workers', type=int, default=10, help="Size of the RPC thread pool (default: 10)")
+    parser.add_argument('--index', action='append', default=[], metavar='KEYSPACE.TABLE=SPEC',
+                        help="Index for a table, e.g. redwing_keyspace.vectors=hnsw:M=16,ef_search=64 (repeatable)")
+    parser.add_argument('--precision', action='append', default=[], metavar='KEYSPACE.TABLE=SPEC',
+                        help="Storage precision for a table: f32 (default), f16 or i8, with ':rescore' to also "
+                             "keep float32 copies for rescoring, e.g. redwing_keyspace.vectors=i8:rescore (repeatable)")
+    parser.add_argument('--data-dir', help="Keep vector matrices in memory-mapped files in this directory")
+    args = parser.parse_args()
+
+    index_specs = {}
+    for option in args.index:
+        name, _, spec = option.partition("=")
+        keyspace, _, table = name.partition(".")
+        index_specs[(keyspace, table)] = parse_index_spec(spec)
+    precision_specs = {}
+    for option in args.precision:
+        name, _, spec = option.partition("=")
+        keyspace, _, table = name.partition(".")
+        precision_specs[(keyspace, table)] = parse_precision_spec(spec)
+
+    if args.data_dir:
+        os.makedirs(args.data_dir, exist_ok=True)
+    server = serve(args.port, args.workers, VectorStore(index_specs, args.data_dir, precision_specs))
+    logging.info(f"Reference VectorDB server listening on port {args.port}.")
+    server.wait_for_termination()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,17 @@
+#!/bin/bash
+
+# Regenerate the Python gRPC stubs from proto/vectordb.proto and copy them
+# into every directory that imports vectordb_pb2 / vectordb_pb2_grpc.
+# Requires: pip install grpcio-tools==1.59.3
+
+# Run from the repository root
+cd "$(dirname "$0")/.." || exit 1
+
+TARGETS="sample test server industry/crypto industry/finance industry/utility/electricity"
+
+for target in $TARGETS; do
+    echo "Generating stubs in $target"
+    python -m grpc_tools.protoc -I proto --python_out=$target --grpc_python_out=$target proto/vectordb.proto || exit 1
+done
+
+echo "Stub generation complete."
@@ -2,6 +2,8 @@ import sys
 import os
 import grpc
 import importlib.util
+import struct
+import asyncio
 import vectordb_pb2
 import vectordb_pb2_grpc
 
@@ -82,5 +84,206 @@ def main():
     batch_write_response = stub.BatchWrite(batch_write_data)
     print("Batch Write response:", batch_write_response)
 
+    # Prepare chunks for Stream Write
+    stream_write_chunks = (
+        vectordb_pb2.VectorBatchWriteRequest(
+            keyspace=_keyspace,
+            table=_table,
+            vectors=[
+                vectordb_pb2.VectorWriteRequest(
+                    key=f"vector_key_stream_{chunk}_{i}",
+                    vector=[float(chunk), float(i), 1.0]
+                )
+                for i in range(100)
+            ]
+        )
+        for chunk in range(5)
+    )
+
+    # Testing Stream Write Method
+    stream_write_response = stub.StreamWrite(stream_write_chunks)
+    print("Stream Write response:", stream_write_response.success, stream_write_response.count)
+
+    # Prepare data for Batch Read, including a key that does not exist
+    batch_read_data = vectordb_pb2.VectorBatchReadRequest(
+        keyspace=_keyspace,
+        table=_table,
+        keys=["vector_key_456", "vector_key_789", "vector_key_missing"]
+    )
+
+    # Testing Batch Read Method
+    batch_read_response = stub.BatchRead(batch_read_data)
+    print("Batch Read response:", [result.found for result in batch_read_response.results])
+
+    # Prepare packed float32 data for Write
+    packed_vector = struct.pack('<3f', 0.5, 1.2, 3.4)
+    packed_write_data = vectordb_pb2.VectorWriteRequest(
+        keyspace=_keyspace,
+        table=_table,
+        key="vector_key_packed",
+        vector_f32=packed_vector,
+        dim=3
+    )
+
+    # Testing Write and Read Methods with the packed encoding
+    packed_write_response = stub.Write(packed_write_data)
+    print("Packed Write response:", packed_write_response)
+    packed_read_response = stub.Read(vectordb_pb2.VectorReadRequest(
+        keyspace=_keyspace,
+        table=_table,
+        key="vector_key_packed",
+        packed=True
+    ))
+    print("Packed Read response:", struct.unpack(f'<{packed_read_response.dim}f', packed_read_response.vector_f32))
+
+    # Prepare two query vectors for Batch Search
+    batch_search_data = vectordb_pb2.VectorBatchSearchRequest(
+        keyspace=_keyspace,
+        table=_table,
+        queries_f32=struct.pack('<6f', 4.5, 5.6, 6.7, 7.8, 8.9, 9.0),
+        dim=3,
+        top_k=2,
+        metric="cosine"
+    )
+
+    # Testing Batch Search Method
+    batch_search_response = stub.BatchSearch(batch_search_data)
+    print("Batch Search response:", [[match.key for match in result.matches] for result in batch_search_response.results])
+
+    # Prepare a Write carrying attributes and a Search filtered on them
+    attributed_write_data = vectordb_pb2.VectorWriteRequest(
+        keyspace=_keyspace,
+        table=_table,
+        key="log_vector_key_321",
+        vector=[4.4, 5.5, 6.6],
+        attributes={"severity": "high"}
+    )
+    stub.Write(attributed_write_data)
+    filtered_search_data = vectordb_pb2.VectorSearchRequest(
+        keyspace=_keyspace,
+        table=_table,
+        query=[4.5, 5.6, 6.7],
+        top_k=5,
+        metric="cosine",
+        filter=vectordb_pb2.SearchFilter(key_prefix="log_", attributes={"severity": "high"})
+    )
+
+    # Testing Search Method with a filter
+    filtered_search_response = stub.Search(filtered_search_data)
+    print("Filtered Search response:", [match.key for match in filtered_search_response.matches])
+
+    # Prepare a Scan over the stream-written vectors in small chunks
+    scan_data = vectordb_pb2.VectorScanRequest(
+        keyspace=_keyspace,
+        table=_table,
+        dim=3,
+        max_bytes=4096,
+        filter=vectordb_pb2.SearchFilter(key_prefix="vector_key_stream_")
+    )
+
+    # Testing Scan Method
+    scan_chunks = list(stub.Scan(scan_data))
+    print("Scan response:", len(scan_chunks), "chunks,", sum(len(chunk.keys) for chunk in scan_chunks), "vectors")
+
+    # Prepare a Write of a sparse vector and a sparse Search against it
+    sparse_write_data = vectordb_pb2.VectorWriteRequest(
+        keyspace=_keyspace,
+        table=_table,
+        key="sparse_vector_key_1",
+        sparse=vectordb_pb2.SparseVector(indices=[3, 17, 42], values=[0.5, 1.0, 0.25], dim=100)
+    )
+    stub.Write(sparse_write_data)
+    sparse_read_response = stub.Read(vectordb_pb2.VectorReadRequest(
+        keyspace=_keyspace,
+        table=_table,
+        key="sparse_vector_key_1"
+    ))
+    print("Sparse Read response:", list(sparse_read_response.sparse.indices), list(sparse_read_response.sparse.values))
+    sparse_search_data = vectordb_pb2.VectorSearchRequest(
+        keyspace=_keyspace,
+        table=_table,
+        sparse_query=vectordb_pb2.SparseVector(indices=[17, 99], values=[1.0, 2.0]),
+        top_k=5,
+        metric="dot"
+    )
+
+    # Testing Search Method with a sparse query
+    sparse_search_response = stub.Search(sparse_search_data)
+    print("Sparse Search response:", [(match.key, match.score) for match in sparse_search_response.matches])
+
+    # Prepare a dense vector under the sparse key and a Hybrid Search over both
+    stub.Write(vectordb_pb2.VectorWriteRequest(
+        keyspace=_keyspace,
+        table=_table,
+        key="sparse_vector_key_1",
+        vector=[4.6, 5.7, 6.8]
+    ))
+    hybrid_search_data = vectordb_pb2.HybridSearchRequest(
+        keyspace=_keyspace,
+        table=_table,
+        query=[4.5, 5.6, 6.7],
+        sparse_query=vectordb_pb2.SparseVector(indices=[17], values=[1.0]),
+        top_k=3,
+        fusion="rrf"
+    )
+
+    # Testing Hybrid Search Method
+    hybrid_search_response = stub.HybridSearch(hybrid_search_data)
+    print("Hybrid Search response:", [(match.key, match.score) for match in hybrid_search_response.matches])
+
+    # Prepare Writes packed as float16 and as int8 codes with a scale, and an int8 Search
+    stub.Write(vectordb_pb2.VectorWriteRequest(
+        keyspace=_keyspace,
+        table=_table,
+        key="vector_key_f16",
+        vector_f16=struct.pack('<3e', 0.5, 1.25, 3.5),
+        dim=3
+    ))
+    stub.Write(vectordb_pb2.VectorWriteRequest(
+        keyspace=_keyspace,
+        table=_table,
+        key="vector_key_i8",
+        vector_i8=struct.pack('<3b', 19, 45, 127),
+        vector_scale=3.4 / 127,
+        dim=3
+    ))
+    quantized_search_data = vectordb_pb2.VectorSearchRequest(
+        keyspace=_keyspace,
+        table=_table,
+        query_i8=struct.pack('<3b', 19, 45, 127),
+        query_scale=3.4 / 127,
+        dim=3,
+        top_k=3,
+        rescore=10
+    )
+
+    # Testing Search Method with a quantized query
+    quantized_search_response = stub.Search(quantized_search_data)
+    print("Quantized Search response:", [(match.key, match.score) for match in quantized_search_response.matches])
+
+async def async_write_many_stops_on_failure():
+    """Write a generator whose 10th vector is empty and count the items pulled after the failure."""
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'sample'))
+    from vectordb_aio import AsyncVectorDBClient
+
+    consumed = []
+
+    def items():
+        for i in range(200):
+            consumed.append(i)
+            yield f"async_failure_key_{i}", [] if i == 10 else [0.5, 1.2, 3.4]
+
+    async with AsyncVectorDBClient(max_in_flight=4) as client:
+        try:
+            await client.write_many(items(), deadline=30)
+        except grpc.aio.AioRpcError as error:
+            print("Async write_many error:", error.code())
+        at_failure = len(consumed)
+        await asyncio.sleep(1)
+    print(f"Async write_many items pulled: {at_failure} at the failure, {len(consumed)} one second later")
+    if len(consumed) != at_failure:
+        raise SystemExit("write_many kept sending after a failed call")
+
 if __name__ == '__main__':
     main()
+    asyncio.run(async_write_many_stops_on_failure())
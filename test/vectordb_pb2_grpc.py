@@ -45,6 +45,31 @@ class VectorDBStub(object):
                 request_serializer=vectordb__pb2.VectorDeleteRequest.SerializeToString,
                 response_deserializer=vectordb__pb2.VectorDeleteResponse.FromString,
                 )
+        self.StreamWrite = channel.stream_unary(
+                '/vectordb.VectorDB/StreamWrite',
+                request_serializer=vectordb__pb2.VectorBatchWriteRequest.SerializeToString,
+                response_deserializer=vectordb__pb2.VectorStreamWriteResponse.FromString,
+                )
+        self.BatchRead = channel.unary_unary(
+                '/vectordb.VectorDB/BatchRead',
+                request_serializer=vectordb__pb2.VectorBatchReadRequest.SerializeToString,
+                response_deserializer=vectordb__pb2.VectorBatchReadResponse.FromString,
+                )
+        self.BatchSearch = channel.unary_unary(
+                '/vectordb.VectorDB/BatchSearch',
+                request_serializer=vectordb__pb2.VectorBatchSearchRequest.SerializeToString,
+                response_deserializer=vectordb__pb2.VectorBatchSearchResponse.FromString,
+                )
+        self.Scan = channel.unary_stream(
+                '/vectordb.VectorDB/Scan',
+                request_serializer=vectordb__pb2.VectorScanRequest.SerializeToString,
+                response_deserializer=vectordb__pb2.VectorScanChunk.FromString,
+                )
+        self.HybridSearch = channel.unary_unary(
+                '/vectordb.VectorDB/HybridSearch',
+                request_serializer=vectordb__pb2.HybridSearchRequest.SerializeToString,
+                response_deserializer=vectordb__pb2.VectorSearchResponse.FromString,
+                )
 
 
 class VectorDBServicer(object):
@@ -87,6 +112,47 @@ class VectorDBServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def StreamWrite(self, request_iterator, context):
+        """Client-streaming bulk ingest: each message is one chunk of vectors, the
+        single response acknowledges every chunk and carries the total count.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def BatchRead(self, request, context):
+        """Reads many keys of one keyspace/table in a single call. Results are
+        returned in request order, with found = false for missing keys.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def BatchSearch(self, request, context):
+        """Scores N query vectors against one keyspace/table with a shared
+        top_k/metric/threshold and returns one match list per query, in order.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def Scan(self, request, context):
+        """Streams every live dense vector of one keyspace/table in chunks of roughly
+        max_bytes. Each chunk carries a cursor; sending it back in a new request
+        resumes the scan after that chunk.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def HybridSearch(self, request, context):
+        """Scores one keyspace/table against a dense and a sparse query together
+        and returns a single top_k fused from both, merged on the server.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_VectorDBServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -120,6 +186,31 @@ def add_VectorDBServicer_to_server(servicer, server):
                     request_deserializer=vectordb__pb2.VectorDeleteRequest.FromString,
                     response_serializer=vectordb__pb2.VectorDeleteResponse.SerializeToString,
             ),
+            'StreamWrite': grpc.stream_unary_rpc_method_handler(
+                    servicer.StreamWrite,
+                    request_deserializer=vectordb__pb2.VectorBatchWriteRequest.FromString,
+                    response_serializer=vectordb__pb2.VectorStreamWriteResponse.SerializeToString,
+            ),
+            'BatchRead': grpc.unary_unary_rpc_method_handler(
+                    servicer.BatchRead,
+                    request_deserializer=vectordb__pb2.VectorBatchReadRequest.FromString,
+                    response_serializer=vectordb__pb2.VectorBatchReadResponse.SerializeToString,
+            ),
+            'BatchSearch': grpc.unary_unary_rpc_method_handler(
+                    servicer.BatchSearch,
+                    request_deserializer=vectordb__pb2.VectorBatchSearchRequest.FromString,
+                    response_serializer=vectordb__pb2.VectorBatchSearchResponse.SerializeToString,
+            ),
+            'Scan': grpc.unary_stream_rpc_method_handler(
+                    servicer.Scan,
+                    request_deserializer=vectordb__pb2.VectorScanRequest.FromString,
+                    response_serializer=vectordb__pb2.VectorScanChunk.SerializeToString,
+            ),
+            'HybridSearch': grpc.unary_unary_rpc_method_handler(
+                    servicer.HybridSearch,
+                    request_deserializer=vectordb__pb2.HybridSearchRequest.FromString,
+                    response_serializer=vectordb__pb2.VectorSearchResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'vectordb.VectorDB', rpc_method_handlers)
@@ -232,3 +323,88 @@ class VectorDB(object):
             vectordb__pb2.VectorDeleteResponse.FromString,
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def StreamWrite(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_unary(request_iterator, target, '/vectordb.VectorDB/StreamWrite',
+            vectordb__pb2.VectorBatchWriteRequest.SerializeToString,
+            vectordb__pb2.VectorStreamWriteResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def BatchRead(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/vectordb.VectorDB/BatchRead',
+            vectordb__pb2.VectorBatchReadRequest.SerializeToString,
+            vectordb__pb2.VectorBatchReadResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def BatchSearch(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/vectordb.VectorDB/BatchSearch',
+            vectordb__pb2.VectorBatchSearchRequest.SerializeToString,
+            vectordb__pb2.VectorBatchSearchResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def Scan(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(request, target, '/vectordb.VectorDB/Scan',
+            vectordb__pb2.VectorScanRequest.SerializeToString,
+            vectordb__pb2.VectorScanChunk.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def HybridSearch(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/vectordb.VectorDB/HybridSearch',
+            vectordb__pb2.HybridSearchRequest.SerializeToString,
+            vectordb__pb2.VectorSearchResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)